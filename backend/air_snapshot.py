@@ -0,0 +1,154 @@
+"""
+Columnar air-picture snapshots for ODIN ATC Console.
+Converts a list of normalized aircraft into numpy arrays so that downstream
+stages (extrapolation, filtering, aggregation) can work on every track at once,
+and provides the slot registry those stages use for per-track state arrays.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+
+METERS_PER_DEG_LAT = 111320.0
+METERS_PER_NM = 1852.0
+METERS_TO_FEET = 3.28084
+MPS_TO_KNOTS = 1.94384
+
+
+@dataclass
+class AirSnapshot:
+    """
+    Column-oriented view of a single air-picture snapshot.
+
+    Missing numeric values are stored as NaN so that vectorized math can run
+    without per-aircraft branching.
+    """
+
+    timestamp: int
+    icao24: np.ndarray
+    callsign: np.ndarray
+    squawk: np.ndarray
+    latitude: np.ndarray
+    longitude: np.ndarray
+    altitude: np.ndarray
+    velocity: np.ndarray
+    true_track: np.ndarray
+    vertical_rate: np.ndarray
+    on_ground: np.ndarray
+    time_position: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.icao24.shape[0])
+
+
+def _float_or_nan(value: Optional[float]) -> float:
+    return float(value) if value is not None else np.nan
+
+
+def build_air_snapshot(aircraft: Iterable[Any], timestamp: int) -> AirSnapshot:
+    """
+    Build an AirSnapshot from normalized aircraft records.
+
+    Args:
+        aircraft: Iterable of objects exposing the Aircraft model attributes
+        timestamp: Snapshot time in epoch seconds
+
+    Returns:
+        AirSnapshot containing only aircraft with a known position
+    """
+    rows: List[Any] = [
+        ac for ac in aircraft
+        if ac.latitude is not None and ac.longitude is not None
+    ]
+
+    altitude = [
+        ac.baro_altitude if ac.baro_altitude is not None else ac.geo_altitude
+        for ac in rows
+    ]
+
+    return AirSnapshot(
+        timestamp=int(timestamp),
+        icao24=np.array([ac.icao24.lower() for ac in rows], dtype=object),
+        callsign=np.array([(ac.callsign or "").upper() for ac in rows], dtype=object),
+        squawk=np.array([ac.squawk or "" for ac in rows], dtype=object),
+        latitude=np.array([ac.latitude for ac in rows], dtype=np.float64),
+        longitude=np.array([ac.longitude for ac in rows], dtype=np.float64),
+        altitude=np.array([_float_or_nan(alt) for alt in altitude], dtype=np.float64),
+        velocity=np.array([_float_or_nan(ac.velocity) for ac in rows], dtype=np.float64),
+        true_track=np.array([_float_or_nan(ac.true_track) for ac in rows], dtype=np.float64),
+        vertical_rate=np.array([_float_or_nan(ac.vertical_rate) for ac in rows], dtype=np.float64),
+        on_ground=np.array([bool(ac.on_ground) for ac in rows], dtype=bool),
+        time_position=np.array(
+            [ac.time_position or ac.last_contact or timestamp for ac in rows],
+            dtype=np.float64,
+        ),
+    )
+
+
+class TrackSlots:
+    """
+    Stable mapping from icao24 to a row in per-track state arrays.
+
+    Owners keep their own numpy arrays sized to `capacity` and grow them when
+    `assign` reports a larger capacity. Released rows are reused.
+    """
+
+    def __init__(self, capacity: int = 64):
+        self.capacity = capacity
+        self._slots: Dict[str, int] = {}
+        self._free: List[int] = list(range(capacity - 1, -1, -1))
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, icao24: str) -> bool:
+        return icao24 in self._slots
+
+    def get(self, icao24: str) -> Optional[int]:
+        return self._slots.get(icao24)
+
+    def items(self) -> Iterator[Tuple[str, int]]:
+        return iter(list(self._slots.items()))
+
+    def assign(self, icao24: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Map each aircraft to its slot, allocating slots for unseen aircraft.
+
+        Returns:
+            Tuple of (slot indices, mask of newly allocated rows)
+        """
+        indices = np.empty(len(icao24), dtype=np.intp)
+        fresh = np.zeros(len(icao24), dtype=bool)
+        for row, icao in enumerate(icao24):
+            slot = self._slots.get(icao)
+            if slot is None:
+                if not self._free:
+                    self._free.extend(range(self.capacity * 2 - 1, self.capacity - 1, -1))
+                    self.capacity *= 2
+                slot = self._free.pop()
+                self._slots[icao] = slot
+                fresh[row] = True
+            indices[row] = slot
+        return indices, fresh
+
+    def release(self, icao24: Iterable[str]) -> None:
+        """Return the slots of the given aircraft to the free list."""
+        for icao in icao24:
+            slot = self._slots.pop(icao, None)
+            if slot is not None:
+                self._free.append(slot)
+
+    def clear(self) -> None:
+        self._slots.clear()
+        self._free = list(range(self.capacity - 1, -1, -1))
+
+
+def grow_rows(array: np.ndarray, capacity: int, fill: Any = 0) -> np.ndarray:
+    """Return `array` extended along its first axis to `capacity` rows."""
+    if array.shape[0] >= capacity:
+        return array
+    grown = np.full((capacity,) + array.shape[1:], fill, dtype=array.dtype)
+    grown[:array.shape[0]] = array
+    return grown
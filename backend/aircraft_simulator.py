@@ -10,6 +10,32 @@ from typing import List, Dict, Any, Optional
 from datetime import datetime, timezone
 
 
+# Bay Area airports with realistic approach/departure patterns
+BAY_AREA_AIRPORTS: Dict[str, Dict[str, Any]] = {
+    "KSFO": {
+        "lat": 37.6213, "lon": -122.3790,
+        "runways": {
+            "28L/28R": {"heading": 280, "approach_alt": 600, "departure_alt": 300},
+            "01L/01R": {"heading": 10, "approach_alt": 600, "departure_alt": 300}
+        }
+    },
+    "KOAK": {
+        "lat": 37.7214, "lon": -122.2208,
+        "runways": {
+            "30": {"heading": 300, "approach_alt": 500, "departure_alt": 300},
+            "12": {"heading": 120, "approach_alt": 500, "departure_alt": 300}
+        }
+    },
+    "KSJC": {
+        "lat": 37.3639, "lon": -121.9289,
+        "runways": {
+            "30L/30R": {"heading": 300, "approach_alt": 500, "departure_alt": 300},
+            "12L/12R": {"heading": 120, "approach_alt": 500, "departure_alt": 300}
+        }
+    }
+}
+
+
 class AircraftSimulator:
     """Simulates realistic aircraft movement in the Bay Area"""
 
@@ -34,30 +60,8 @@ class AircraftSimulator:
             "FFT", "N", "FDX", "UPS", "ABX"
         ]
 
-        # Bay Area airports with realistic approach/departure patterns
-        self.airports = {
-            "KSFO": {
-                "lat": 37.6213, "lon": -122.3790,
-                "runways": {
-                    "28L/28R": {"heading": 280, "approach_alt": 600, "departure_alt": 300},
-                    "01L/01R": {"heading": 10, "approach_alt": 600, "departure_alt": 300}
-                }
-            },
-            "KOAK": {
-                "lat": 37.7214, "lon": -122.2208,
-                "runways": {
-                    "30": {"heading": 300, "approach_alt": 500, "departure_alt": 300},
-                    "12": {"heading": 120, "approach_alt": 500, "departure_alt": 300}
-                }
-            },
-            "KSJC": {
-                "lat": 37.3639, "lon": -121.9289,
-                "runways": {
-                    "30L/30R": {"heading": 300, "approach_alt": 500, "departure_alt": 300},
-                    "12L/12R": {"heading": 120, "approach_alt": 500, "departure_alt": 300}
-                }
-            }
-        }
+        # Shared airport/runway table (also used by the arrival manager)
+        self.airports = BAY_AREA_AIRPORTS
 
         # Initialize aircraft with random positions and velocities
         self._initialize_aircraft()
@@ -0,0 +1,301 @@
+"""
+Streaming alert rule engine for ODIN ATC Console.
+Evaluates declarative rules (emergency squawks, abnormal vertical rates, ...)
+against every air-picture snapshot. Rules are compiled once into vectorized
+predicates over snapshot columns; per-aircraft trigger/clear counters provide
+hysteresis, and raised/cleared events are fanned out to subscriber queues.
+"""
+
+import asyncio
+import logging
+import operator
+import uuid
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from air_snapshot import AirSnapshot, TrackSlots, grow_rows, METERS_TO_FEET
+
+
+logger = logging.getLogger(__name__)
+
+Predicate = Callable[[AirSnapshot], np.ndarray]
+
+# Declarative rule set. A condition is either {"field", "op", "value"} or a
+# combinator {"all": [...]} / {"any": [...]} / {"not": {...}}. `clear` defaults
+# to the negation of `when`; trigger_after/clear_after count consecutive snapshots.
+DEFAULT_RULES: List[Dict[str, Any]] = [
+    {
+        "id": "squawk_7500",
+        "name": "Unlawful interference (7500)",
+        "severity": "critical",
+        "when": {"field": "squawk", "op": "eq", "value": "7500"},
+        "clear_after": 2,
+    },
+    {
+        "id": "squawk_7600",
+        "name": "Radio failure (7600)",
+        "severity": "warning",
+        "when": {"field": "squawk", "op": "eq", "value": "7600"},
+        "clear_after": 2,
+    },
+    {
+        "id": "squawk_7700",
+        "name": "General emergency (7700)",
+        "severity": "critical",
+        "when": {"field": "squawk", "op": "eq", "value": "7700"},
+        "clear_after": 2,
+    },
+    {
+        "id": "rapid_descent",
+        "name": "Rapid descent (>5000 fpm)",
+        "severity": "warning",
+        "when": {"all": [
+            {"field": "vertical_rate", "op": "lt", "value": -25.4},
+            {"field": "on_ground", "op": "eq", "value": False},
+        ]},
+        "clear": {"field": "vertical_rate", "op": "gt", "value": -15.0},
+        "trigger_after": 2,
+        "clear_after": 2,
+    },
+    {
+        "id": "excessive_climb",
+        "name": "Unusual climb rate (>6000 fpm)",
+        "severity": "advisory",
+        "when": {"field": "vertical_rate", "op": "gt", "value": 30.5},
+        "clear": {"field": "vertical_rate", "op": "lt", "value": 20.0},
+        "trigger_after": 2,
+        "clear_after": 2,
+    },
+    {
+        "id": "low_fast",
+        "name": "Low altitude at high speed",
+        "severity": "warning",
+        "when": {"all": [
+            {"field": "altitude", "op": "lt", "value": 300.0},
+            {"field": "velocity", "op": "gt", "value": 130.0},
+            {"field": "on_ground", "op": "eq", "value": False},
+        ]},
+        "trigger_after": 2,
+        "clear_after": 3,
+    },
+]
+
+RULE_FIELDS = {
+    "squawk", "callsign", "latitude", "longitude", "altitude",
+    "velocity", "true_track", "vertical_rate", "on_ground",
+}
+
+_COMPARISONS = {
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "lt": operator.lt,
+    "le": operator.le,
+    "gt": operator.gt,
+    "ge": operator.ge,
+}
+
+# Aircraft missing from the picture this long drop their rule state
+STATE_EXPIRY_SECONDS = 120
+RECENT_EVENT_LIMIT = 200
+SUBSCRIBER_QUEUE_SIZE = 256
+
+
+def compile_condition(condition: Dict[str, Any]) -> Predicate:
+    """Compile a declarative condition into a vectorized snapshot predicate."""
+    if "all" in condition:
+        parts = [compile_condition(part) for part in condition["all"]]
+        return lambda snap: np.logical_and.reduce([part(snap) for part in parts])
+    if "any" in condition:
+        parts = [compile_condition(part) for part in condition["any"]]
+        return lambda snap: np.logical_or.reduce([part(snap) for part in parts])
+    if "not" in condition:
+        inner = compile_condition(condition["not"])
+        return lambda snap: ~inner(snap)
+
+    field = condition.get("field")
+    op = condition.get("op")
+    value = condition.get("value")
+    if field not in RULE_FIELDS:
+        raise ValueError(f"Unknown rule field: {field}")
+
+    if op == "in":
+        values = list(value)
+        return lambda snap: np.isin(getattr(snap, field), values)
+
+    if op not in _COMPARISONS:
+        raise ValueError(f"Unknown rule operator: {op}")
+    compare = _COMPARISONS[op]
+
+    def predicate(snap: AirSnapshot) -> np.ndarray:
+        # NaN comparisons are False, so missing data never triggers a rule
+        with np.errstate(invalid="ignore"):
+            return np.asarray(compare(getattr(snap, field), value), dtype=bool)
+
+    return predicate
+
+
+class CompiledRule:
+    """A rule with its compiled trigger/clear predicates and hysteresis settings."""
+
+    def __init__(self, spec: Dict[str, Any]):
+        self.id = spec["id"]
+        self.name = spec.get("name", self.id)
+        self.severity = spec.get("severity", "warning")
+        self.trigger_after = max(1, int(spec.get("trigger_after", 1)))
+        self.clear_after = max(1, int(spec.get("clear_after", 1)))
+        self.when = compile_condition(spec["when"])
+        if "clear" in spec:
+            self.clear = compile_condition(spec["clear"])
+        else:
+            when = self.when
+            self.clear = lambda snap: ~when(snap)
+
+
+class AlertEngine:
+    """Evaluates compiled rules per snapshot and streams alert events."""
+
+    def __init__(self, rules: Optional[List[Dict[str, Any]]] = None):
+        self.rules = [CompiledRule(spec) for spec in (rules or DEFAULT_RULES)]
+        self._trigger_after = np.array([rule.trigger_after for rule in self.rules])
+        self._clear_after = np.array([rule.clear_after for rule in self.rules])
+        self._slots = TrackSlots()
+        capacity = self._slots.capacity
+        num_rules = len(self.rules)
+        self._trigger_count = np.zeros((capacity, num_rules), dtype=np.int32)
+        self._clear_count = np.zeros((capacity, num_rules), dtype=np.int32)
+        self._active = np.zeros((capacity, num_rules), dtype=bool)
+        self._last_seen = np.zeros(capacity, dtype=np.int64)
+
+        self._alerts: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._recent: Deque[Dict[str, Any]] = deque(maxlen=RECENT_EVENT_LIMIT)
+        self._subscribers: List[asyncio.Queue] = []
+
+    def _ensure_capacity(self) -> None:
+        capacity = self._slots.capacity
+        self._trigger_count = grow_rows(self._trigger_count, capacity)
+        self._clear_count = grow_rows(self._clear_count, capacity)
+        self._active = grow_rows(self._active, capacity, False)
+        self._last_seen = grow_rows(self._last_seen, capacity)
+
+    def evaluate(self, snapshot: AirSnapshot) -> List[Dict[str, Any]]:
+        """
+        Evaluate every rule against the snapshot and publish resulting events.
+
+        Returns:
+            List of raised/cleared events produced by this snapshot
+        """
+        events: List[Dict[str, Any]] = []
+
+        if len(snapshot):
+            slots, fresh = self._slots.assign(snapshot.icao24)
+            self._ensure_capacity()
+            self._trigger_count[slots[fresh]] = 0
+            self._clear_count[slots[fresh]] = 0
+            self._active[slots[fresh]] = False
+            self._last_seen[slots] = snapshot.timestamp
+
+            trigger = np.column_stack([rule.when(snapshot) for rule in self.rules])
+            clear = np.column_stack([rule.clear(snapshot) for rule in self.rules])
+
+            trigger_count = np.where(trigger, self._trigger_count[slots] + 1, 0)
+            clear_count = np.where(clear, self._clear_count[slots] + 1, 0)
+            was_active = self._active[slots]
+            is_active = np.where(
+                was_active, clear_count < self._clear_after, trigger_count >= self._trigger_after
+            )
+
+            self._trigger_count[slots] = trigger_count
+            self._clear_count[slots] = clear_count
+            self._active[slots] = is_active
+
+            for row, rule_index in zip(*np.nonzero(is_active & ~was_active)):
+                events.append(self._raise(snapshot, int(row), int(rule_index)))
+            for row, rule_index in zip(*np.nonzero(was_active & ~is_active)):
+                events.append(self._clear(snapshot.icao24[row], int(rule_index), snapshot.timestamp, "resolved"))
+
+        events.extend(self._expire(snapshot.timestamp))
+
+        for event in events:
+            self._publish(event)
+        return events
+
+    def _raise(self, snapshot: AirSnapshot, row: int, rule_index: int) -> Dict[str, Any]:
+        rule = self.rules[rule_index]
+        altitude = snapshot.altitude[row]
+        vertical_rate = snapshot.vertical_rate[row]
+        alert = {
+            "id": uuid.uuid4().hex,
+            "rule": rule.id,
+            "name": rule.name,
+            "severity": rule.severity,
+            "icao24": snapshot.icao24[row],
+            "callsign": snapshot.callsign[row] or None,
+            "squawk": snapshot.squawk[row] or None,
+            "latitude": float(snapshot.latitude[row]),
+            "longitude": float(snapshot.longitude[row]),
+            "altitude_ft": None if np.isnan(altitude) else int(altitude * METERS_TO_FEET),
+            "vertical_rate_fpm": None if np.isnan(vertical_rate) else int(vertical_rate * METERS_TO_FEET * 60),
+            "raised_at": snapshot.timestamp,
+        }
+        self._alerts[(alert["icao24"], rule.id)] = alert
+        logger.warning(f"Alert raised: {rule.name} for {alert['callsign'] or alert['icao24']}")
+        return {"type": "raised", "timestamp": snapshot.timestamp, "alert": alert}
+
+    def _clear(self, icao24: str, rule_index: int, timestamp: int, reason: str) -> Dict[str, Any]:
+        rule = self.rules[rule_index]
+        alert = self._alerts.pop((icao24, rule.id), None) or {"icao24": icao24, "rule": rule.id}
+        return {"type": "cleared", "timestamp": timestamp, "reason": reason, "alert": alert}
+
+    def _expire(self, now: int) -> List[Dict[str, Any]]:
+        """Drop state for aircraft that left the picture, clearing their alerts."""
+        events: List[Dict[str, Any]] = []
+        stale = [
+            (icao, slot) for icao, slot in self._slots.items()
+            if now - self._last_seen[slot] > STATE_EXPIRY_SECONDS
+        ]
+        for icao, slot in stale:
+            for rule_index in np.flatnonzero(self._active[slot]):
+                events.append(self._clear(icao, int(rule_index), now, "lost"))
+            self._active[slot] = False
+        self._slots.release(icao for icao, _ in stale)
+        return events
+
+    def _publish(self, event: Dict[str, Any]) -> None:
+        self._recent.append(event)
+        for queue in self._subscribers:
+            if queue.full():
+                # Slow consumer: drop its oldest event rather than block ingest
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+    def subscribe(self) -> asyncio.Queue:
+        """Register a subscriber queue that receives every future event."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers.append(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        if queue in self._subscribers:
+            self._subscribers.remove(queue)
+
+    def active_alerts(self) -> List[Dict[str, Any]]:
+        return list(self._alerts.values())
+
+    def recent_events(self) -> List[Dict[str, Any]]:
+        return list(self._recent)
+
+
+# Singleton instance
+_alert_engine_instance: Optional[AlertEngine] = None
+
+
+def get_alert_engine() -> AlertEngine:
+    """Get or create alert engine singleton instance"""
+    global _alert_engine_instance
+
+    if _alert_engine_instance is None:
+        _alert_engine_instance = AlertEngine()
+
+    return _alert_engine_instance
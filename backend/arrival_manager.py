@@ -0,0 +1,195 @@
+"""
+Runway arrival sequencing for ODIN ATC Console.
+Infers the landing runway of every inbound aircraft from its position and track
+relative to the Bay Area airport table, computes distance-to-threshold and ETA
+for the whole snapshot in one batch, and keeps a per-runway arrival sequence
+that tower consoles can read without recomputation.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from aircraft_simulator import BAY_AREA_AIRPORTS
+from air_snapshot import (
+    AirSnapshot,
+    METERS_PER_DEG_LAT,
+    METERS_PER_NM,
+    METERS_TO_FEET,
+    MPS_TO_KNOTS,
+)
+
+
+# Capture criteria for an aircraft established on a runway's extended centerline
+MAX_CAPTURE_DISTANCE_NM = 40.0
+MAX_TRACK_DEVIATION_DEG = 30.0
+MAX_BEARING_DEVIATION_DEG = 20.0
+MAX_CLIMB_RATE_MPS = 1.0
+MIN_APPROACH_SPEED_MPS = 25.0
+# Altitude ceiling along the approach: field altitude + generous glidepath allowance
+APPROACH_BASE_ALT_FT = 1500.0
+APPROACH_FT_PER_NM = 450.0
+
+
+def _angle_diff(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Absolute smallest difference between two headings in degrees."""
+    return np.abs((a - b + 180.0) % 360.0 - 180.0)
+
+
+class ArrivalManager:
+    """Maintains per-runway arrival sequences from successive snapshots."""
+
+    def __init__(self, airports: Optional[Dict[str, Dict[str, Any]]] = None):
+        if airports is None:
+            airports = BAY_AREA_AIRPORTS
+
+        codes: List[str] = []
+        runways: List[str] = []
+        lats: List[float] = []
+        lons: List[float] = []
+        headings: List[float] = []
+        for code, airport in airports.items():
+            for runway, config in airport["runways"].items():
+                codes.append(code)
+                runways.append(runway)
+                # Airport reference point stands in for the runway threshold
+                lats.append(airport["lat"])
+                lons.append(airport["lon"])
+                headings.append(config["heading"])
+
+        self._runway_airport = codes
+        self._runway_name = runways
+        self._runway_lat = np.array(lats)[np.newaxis, :]
+        self._runway_lon = np.array(lons)[np.newaxis, :]
+        self._runway_heading = np.array(headings, dtype=np.float64)[np.newaxis, :]
+
+        # Sequence per runway index, each entry keyed by icao24 for in-place updates
+        self._entries: List[Dict[str, Dict[str, Any]]] = [{} for _ in codes]
+        self._sequences: List[List[Dict[str, Any]]] = [[] for _ in codes]
+        self._timestamp: Optional[int] = None
+
+    @property
+    def timestamp(self) -> Optional[int]:
+        return self._timestamp
+
+    def update(self, snapshot: AirSnapshot) -> None:
+        """Assign runways and ETAs for the snapshot and refresh every sequence."""
+        self._timestamp = snapshot.timestamp
+        assignments = self._assign(snapshot)
+
+        seen: List[set] = [set() for _ in self._entries]
+        for row, runway, distance_m in assignments:
+            icao = snapshot.icao24[row]
+            speed = snapshot.velocity[row]
+            eta_seconds = distance_m / speed
+            altitude = snapshot.altitude[row]
+
+            entry = self._entries[runway].get(icao)
+            if entry is None:
+                entry = {"icao24": icao}
+                self._entries[runway][icao] = entry
+                self._sequences[runway].append(entry)
+            entry.update({
+                "callsign": snapshot.callsign[row] or None,
+                "airport": self._runway_airport[runway],
+                "runway": self._runway_name[runway],
+                "distance_nm": round(float(distance_m / METERS_PER_NM), 2),
+                "eta_seconds": round(float(eta_seconds), 1),
+                "eta": int(snapshot.timestamp + eta_seconds),
+                "altitude_ft": None if np.isnan(altitude) else int(altitude * METERS_TO_FEET),
+                "groundspeed_kts": int(speed * MPS_TO_KNOTS),
+            })
+            seen[runway].add(icao)
+
+        for runway, entries in enumerate(self._entries):
+            departed = [icao for icao in entries if icao not in seen[runway]]
+            if departed:
+                for icao in departed:
+                    del entries[icao]
+                self._sequences[runway] = [
+                    entry for entry in self._sequences[runway] if entry["icao24"] in entries
+                ]
+
+            # ETAs shift only slightly between snapshots, so the previous order is
+            # nearly sorted and Timsort restores it in close to linear time
+            sequence = self._sequences[runway]
+            sequence.sort(key=lambda entry: entry["eta_seconds"])
+            previous_eta = None
+            for position, entry in enumerate(sequence, start=1):
+                entry["sequence"] = position
+                entry["gap_seconds"] = (
+                    None if previous_eta is None else round(entry["eta_seconds"] - previous_eta, 1)
+                )
+                previous_eta = entry["eta_seconds"]
+
+    def _assign(self, snapshot: AirSnapshot) -> List[Tuple[int, int, float]]:
+        """Return (row, runway index, distance in meters) for every captured arrival."""
+        if len(snapshot) == 0:
+            return []
+
+        lat = snapshot.latitude[:, np.newaxis]
+        lon = snapshot.longitude[:, np.newaxis]
+        north_m = (self._runway_lat - lat) * METERS_PER_DEG_LAT
+        east_m = (self._runway_lon - lon) * METERS_PER_DEG_LAT * np.cos(np.radians(lat))
+        distance_m = np.hypot(east_m, north_m)
+        bearing = np.degrees(np.arctan2(east_m, north_m)) % 360.0
+
+        track = snapshot.true_track[:, np.newaxis]
+        track_dev = _angle_diff(track, self._runway_heading)
+        bearing_dev = _angle_diff(bearing, self._runway_heading)
+        distance_nm = distance_m / METERS_PER_NM
+        altitude_ft = snapshot.altitude[:, np.newaxis] * METERS_TO_FEET
+
+        with np.errstate(invalid="ignore"):
+            inbound = (
+                (~snapshot.on_ground)
+                & (snapshot.velocity > MIN_APPROACH_SPEED_MPS)
+                & ~(snapshot.vertical_rate > MAX_CLIMB_RATE_MPS)
+            )[:, np.newaxis]
+            captured = (
+                inbound
+                & (distance_nm <= MAX_CAPTURE_DISTANCE_NM)
+                & (track_dev <= MAX_TRACK_DEVIATION_DEG)
+                & (bearing_dev <= MAX_BEARING_DEVIATION_DEG)
+                & ~(altitude_ft > APPROACH_BASE_ALT_FT + APPROACH_FT_PER_NM * distance_nm)
+            )
+
+        # Best-aligned runway wins when more than one captures the aircraft
+        score = np.where(captured, track_dev + bearing_dev, np.inf)
+        best = np.argmin(score, axis=1)
+        rows = np.flatnonzero(np.isfinite(score[np.arange(len(best)), best]))
+
+        return [(int(row), int(best[row]), float(distance_m[row, best[row]])) for row in rows]
+
+    def get_sequences(self, airport: Optional[str] = None) -> Dict[str, Dict[str, List[Dict[str, Any]]]]:
+        """
+        Return arrival sequences grouped by airport and runway. The lists and
+        entries are copies; the live ones are updated in place every snapshot.
+
+        Args:
+            airport: Optional airport filter (ICAO "KSFO" or FAA "SFO")
+        """
+        result: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+        wanted = airport.upper() if airport else None
+        if wanted and len(wanted) == 3:
+            wanted = f"K{wanted}"
+        for runway, sequence in enumerate(self._sequences):
+            code = self._runway_airport[runway]
+            if wanted and code != wanted:
+                continue
+            result.setdefault(code, {})[self._runway_name[runway]] = [dict(entry) for entry in sequence]
+        return result
+
+
+# Singleton instance
+_arrival_manager_instance: Optional[ArrivalManager] = None
+
+
+def get_arrival_manager() -> ArrivalManager:
+    """Get or create arrival manager singleton instance"""
+    global _arrival_manager_instance
+
+    if _arrival_manager_instance is None:
+        _arrival_manager_instance = ArrivalManager()
+
+    return _arrival_manager_instance
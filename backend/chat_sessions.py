@@ -0,0 +1,297 @@
+"""
+Server-side ODIN Copilot chat sessions.
+
+Clients send a `session_id` instead of re-uploading their history. Each
+session keeps its recent messages verbatim plus a rolling summary: once the
+session passes a token threshold, older messages are folded into the summary
+(by the LLM, or extractively when it is unavailable) in the background, so
+prompts stay bounded across a whole shift. Sessions live in an in-memory LRU
+and can be persisted to Mongo.
+"""
+
+import asyncio
+import logging
+import os
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from copilot_context import CHARS_PER_TOKEN, estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_COMPACT_TOKENS = 1200
+DEFAULT_MAX_SESSIONS = 500
+DEFAULT_IDLE_HOURS = 12.0
+# Messages kept verbatim when older ones are folded into the summary
+KEEP_RECENT_MESSAGES = 4
+SUMMARY_MAX_TOKENS = 200
+# Client-side history accepted when a session is first opened
+SEED_HISTORY_LIMIT = 10
+SUMMARY_PROMPT = """Summarize this ATC copilot conversation for your own later reference.
+Keep callsigns, airports, runways, times, decisions and open questions. Plain text, at most 120 words."""
+
+CONSOLE_CONTEXT_MARKER = "[[Console Context]]"
+
+
+def user_text(message: str) -> str:
+    """The operator's own words, without the console context preface the UI adds."""
+    if message.startswith(CONSOLE_CONTEXT_MARKER) and "\n\nUser: " in message:
+        return message.split("\n\nUser: ", 1)[1].strip()
+    return message.strip()
+
+
+@dataclass
+class ChatSession:
+    id: str
+    created_at: float
+    updated_at: float
+    summary: str = ""
+    messages: List[Dict[str, str]] = field(default_factory=list)
+    # Messages folded into the summary so far
+    compacted_messages: int = 0
+
+    def tokens(self) -> int:
+        return estimate_tokens(self.summary) + sum(estimate_tokens(m["content"]) for m in self.messages)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ChatSession":
+        return cls(**{key: data[key] for key in cls.__dataclass_fields__ if key in data})
+
+
+class ChatSessionStore:
+    """In-memory LRU of chat sessions with rolling-summary compaction and optional Mongo persistence."""
+
+    def __init__(
+        self,
+        compact_tokens: int = DEFAULT_COMPACT_TOKENS,
+        max_sessions: int = DEFAULT_MAX_SESSIONS,
+        idle_seconds: float = DEFAULT_IDLE_HOURS * 3600,
+        collection=None
+    ):
+        """
+        Initialize chat session store.
+
+        Args:
+            compact_tokens: Session size (summary + messages) that triggers compaction
+            max_sessions: Sessions kept in memory, least recently used evicted first
+            idle_seconds: Sessions idle longer than this are dropped from memory
+            collection: Motor collection for persistence (memory only when None)
+        """
+        self.compact_tokens = compact_tokens
+        self.max_sessions = max_sessions
+        self.idle_seconds = idle_seconds
+        self.collection = collection
+        self._sessions: "OrderedDict[str, ChatSession]" = OrderedDict()
+        self._compacting: Dict[str, asyncio.Task] = {}
+        self.stats = {"opened": 0, "restored": 0, "compactions": 0, "llm_summaries": 0}
+
+    def persist_to(self, collection) -> None:
+        """Persist sessions to a Mongo collection (e.g. db.chat_sessions)."""
+        self.collection = collection
+
+    # ----- lookup -----
+
+    def _remember(self, session: ChatSession) -> None:
+        self._sessions[session.id] = session
+        self._sessions.move_to_end(session.id)
+        cutoff = time.time() - self.idle_seconds
+        while self._sessions:
+            oldest = next(iter(self._sessions.values()))
+            if len(self._sessions) <= self.max_sessions and oldest.updated_at >= cutoff:
+                break
+            self._sessions.popitem(last=False)
+
+    async def _load(self, session_id: str) -> Optional[ChatSession]:
+        if self.collection is None:
+            return None
+        try:
+            doc = await self.collection.find_one({"id": session_id}, {"_id": 0})
+        except Exception as e:
+            logger.warning(f"Could not load chat session {session_id}: {e}")
+            return None
+        return ChatSession.from_dict(doc) if doc else None
+
+    async def get(self, session_id: str) -> Optional[ChatSession]:
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = await self._load(session_id)
+            if session is not None:
+                self.stats["restored"] += 1
+                self._remember(session)
+        return session
+
+    async def open(self, session_id: Optional[str] = None, seed_history: Optional[List[Dict[str, str]]] = None) -> ChatSession:
+        """
+        Resume a session, or start one (under `session_id` when the client
+        already has an id the server no longer knows).
+
+        Args:
+            session_id: Existing session id (optional)
+            seed_history: Client-side history used only when starting a session
+        """
+        if session_id:
+            session = await self.get(session_id)
+            if session is not None:
+                self._sessions.move_to_end(session.id)
+                return session
+
+        now = time.time()
+        session = ChatSession(id=session_id or uuid.uuid4().hex, created_at=now, updated_at=now)
+        for message in (seed_history or [])[-SEED_HISTORY_LIMIT:]:
+            if message.get("role") in ("user", "assistant") and message.get("content"):
+                session.messages.append({"role": message["role"], "content": user_text(str(message["content"]))})
+        self.stats["opened"] += 1
+        self._remember(session)
+        return session
+
+    async def delete(self, session_id: str) -> bool:
+        found = self._sessions.pop(session_id, None) is not None
+        if self.collection is not None:
+            try:
+                result = await self.collection.delete_one({"id": session_id})
+                found = found or result.deleted_count > 0
+            except Exception as e:
+                logger.warning(f"Could not delete chat session {session_id}: {e}")
+        return found
+
+    # ----- prompt and recording -----
+
+    def prompt(self, session: ChatSession) -> Tuple[Optional[str], List[Dict[str, str]]]:
+        """
+        Rolling summary and the most recent messages that fit the compaction
+        threshold (a hard cap while a compaction is still running).
+        """
+        budget = self.compact_tokens - estimate_tokens(session.summary)
+        recent: List[Dict[str, str]] = []
+        for message in reversed(session.messages):
+            budget -= estimate_tokens(message["content"])
+            if budget < 0 and recent:
+                break
+            recent.append(message)
+        recent.reverse()
+        return session.summary or None, recent
+
+    async def record(self, session: ChatSession, user_message: str, reply: str) -> None:
+        """Append a completed exchange, persist it, and compact in the background if needed."""
+        session.messages.append({"role": "user", "content": user_text(user_message)})
+        session.messages.append({"role": "assistant", "content": reply})
+        session.updated_at = time.time()
+        self._remember(session)
+        await self._save(session)
+
+        if session.tokens() > self.compact_tokens and session.id not in self._compacting:
+            task = asyncio.create_task(self._compact_and_save(session))
+            self._compacting[session.id] = task
+            task.add_done_callback(lambda _: self._compacting.pop(session.id, None))
+
+    async def _save(self, session: ChatSession) -> None:
+        if self.collection is None:
+            return
+        try:
+            await self.collection.replace_one({"id": session.id}, session.to_dict(), upsert=True)
+        except Exception as e:
+            logger.warning(f"Could not persist chat session {session.id}: {e}")
+
+    # ----- compaction -----
+
+    async def _compact_and_save(self, session: ChatSession) -> None:
+        try:
+            await self.compact(session)
+            await self._save(session)
+        except Exception as e:
+            logger.error(f"Chat session compaction failed for {session.id}: {e}")
+
+    async def compact(self, session: ChatSession) -> None:
+        """Fold all but the most recent messages into the rolling summary."""
+        count = len(session.messages) - KEEP_RECENT_MESSAGES
+        if count <= 0:
+            return
+        older = session.messages[:count]
+        summary = await self._summarize_with_llm(session.summary, older)
+        if summary is None:
+            summary = self._summarize_extractive(session.summary, older)
+
+        # Messages recorded while summarizing stay after the folded ones
+        session.summary = summary
+        session.messages = session.messages[count:]
+        session.compacted_messages += count
+        self.stats["compactions"] += 1
+        logger.info(f"Compacted {count} messages of chat session {session.id} ({session.tokens()} tokens left)")
+
+    async def _summarize_with_llm(self, previous: str, messages: List[Dict[str, str]]) -> Optional[str]:
+        # Deferred: the client module imports the admission and cache services
+        from services.admission import PRIORITY_BACKGROUND
+        from services.openrouter_client import OpenRouterError, get_openrouter_client
+
+        client = get_openrouter_client()
+        if client is None:
+            return None
+        transcript = "\n".join(
+            f"{'Controller' if m['role'] == 'user' else 'Copilot'}: {m['content']}" for m in messages
+        )
+        prompt = f"Summary so far: {previous or '(none)'}\n\nNew conversation:\n{transcript}"
+        try:
+            result = await client.chat_completion(
+                [{"role": "system", "content": SUMMARY_PROMPT}, {"role": "user", "content": prompt}],
+                temperature=0.2,
+                max_tokens=SUMMARY_MAX_TOKENS,
+                use_cache=False,
+                priority=PRIORITY_BACKGROUND
+            )
+        except OpenRouterError as e:
+            logger.warning(f"LLM summary unavailable, using extractive summary: {e}")
+            return None
+        content = str(result["content"]).strip()
+        if not content:
+            return None
+        self.stats["llm_summaries"] += 1
+        return content
+
+    @staticmethod
+    def _summarize_extractive(previous: str, messages: List[Dict[str, str]]) -> str:
+        """First sentence of each message appended to the summary, keeping the newest text."""
+        notes = []
+        for message in messages:
+            first = message["content"].strip().split("\n", 1)[0].split(". ", 1)[0][:160]
+            notes.append(f"{'Controller' if message['role'] == 'user' else 'Copilot'}: {first}")
+        summary = "; ".join(filter(None, [previous, *notes]))
+        limit = SUMMARY_MAX_TOKENS * CHARS_PER_TOKEN
+        return summary if len(summary) <= limit else "..." + summary[-(limit - 3):]
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "sessions": len(self._sessions),
+            "compacting": len(self._compacting),
+            "persistent": self.collection is not None
+        }
+
+    async def aclose(self) -> None:
+        """Let running compactions finish (app shutdown)."""
+        if self._compacting:
+            await asyncio.gather(*self._compacting.values(), return_exceptions=True)
+
+
+# Singleton instance
+_session_store_instance: Optional[ChatSessionStore] = None
+
+
+def get_session_store() -> ChatSessionStore:
+    """Get or create chat session store singleton instance"""
+    global _session_store_instance
+
+    if _session_store_instance is None:
+        _session_store_instance = ChatSessionStore(
+            compact_tokens=int(os.environ.get("CHAT_SESSION_COMPACT_TOKENS", DEFAULT_COMPACT_TOKENS)),
+            max_sessions=int(os.environ.get("CHAT_SESSION_MAX", DEFAULT_MAX_SESSIONS)),
+            idle_seconds=float(os.environ.get("CHAT_SESSION_IDLE_HOURS", DEFAULT_IDLE_HOURS)) * 3600
+        )
+
+    return _session_store_instance
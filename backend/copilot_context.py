@@ -0,0 +1,317 @@
+"""
+Live air-picture context for ODIN Copilot prompts.
+
+Each ingest snapshot refreshes a set of ranked context lines (alerts, NOTAM
+conflicts, arrival sequences, nearby traffic, weather, active NOTAMs) with
+their token estimates. Lines are kept in priority order with a running token
+total, so fitting the context to a budget for a chat request is a bisect
+plus a join instead of re-summarizing the world.
+"""
+
+import os
+import re
+from bisect import bisect_right
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from aircraft_simulator import BAY_AREA_AIRPORTS
+from air_snapshot import AirSnapshot, METERS_PER_DEG_LAT, METERS_PER_NM, METERS_TO_FEET, MPS_TO_KNOTS
+from services.response_cache import LIVE_CONTEXT_MARKER
+
+
+DEFAULT_TOKEN_BUDGET = 600
+DEFAULT_HOME_AIRPORT = "KSFO"
+NEARBY_AIRCRAFT_LIMIT = 12
+ARRIVALS_PER_RUNWAY = 4
+NOTAM_LINE_LIMIT = 10
+# NOTAMs and weather change slowly; refresh them at most this often
+SLOW_SECTION_REFRESH_SECONDS = 60
+# Rough tokens-per-character ratio for English/ATC text
+CHARS_PER_TOKEN = 4
+# Budget held back for the header and section titles
+FRAMING_TOKENS = 30
+
+# Output order of sections; priorities decide what survives the budget
+SECTION_ORDER = ("alerts", "conflicts", "arrivals", "traffic", "weather", "notams")
+SECTION_TITLES = {
+    "alerts": "Alerts",
+    "conflicts": "NOTAM conflicts",
+    "arrivals": "Arrival sequences",
+    "traffic": "Traffic",
+    "weather": "Weather",
+    "notams": "Active NOTAMs",
+}
+# Base priority per section; lower ranks inside a section subtract from it
+SECTION_PRIORITY = {
+    "alerts": 1000.0,
+    "conflicts": 800.0,
+    "weather": 600.0,
+    "arrivals": 500.0,
+    "traffic": 400.0,
+    "notams": 300.0,
+}
+
+_LIVE_QUESTION_RE = re.compile(
+    r"\b(traffic|aircraft|inbound|outbound|arrivals?|departures?|sequence|weather|winds?|metar|taf|"
+    r"ceiling|visibility|altimeter|notams?|closed|closures?|alerts?|squawk|emergency|conflicts?|"
+    r"where|nearest|closest|how many|[KkSs]?(?:SFO|OAK|SJC)|"
+    r"[A-Z]{3}\d{1,4}[A-Z]?)\b",
+    re.IGNORECASE,
+)
+_RUNWAY_SUBJECTS = {"RWY", "TWY", "ILS", "AD", "APRON"}
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN)
+
+
+def needs_live_context(message: str) -> bool:
+    """Whether a question refers to live traffic, weather, NOTAMs or alerts."""
+    return _LIVE_QUESTION_RE.search(message) is not None
+
+
+class CopilotContextBuilder:
+    """Maintains ranked live-context lines and renders them under a token budget."""
+
+    def __init__(self, home_airport: str = DEFAULT_HOME_AIRPORT, token_budget: int = DEFAULT_TOKEN_BUDGET):
+        self.home_airport = home_airport
+        self.token_budget = token_budget
+        self._sections: Dict[str, List[Tuple[float, str]]] = {name: [] for name in SECTION_ORDER}
+        self._slow_refreshed_at: Optional[int] = None
+        self._timestamp: Optional[int] = None
+        # Flattened view, rebuilt once per update
+        self._ranked: List[Tuple[str, str]] = []
+        self._cumulative_tokens: List[int] = []
+        self._rendered: Dict[int, str] = {}
+
+    @property
+    def timestamp(self) -> Optional[int]:
+        return self._timestamp
+
+    # ----- per-snapshot refresh -----
+
+    def update(self, snapshot: AirSnapshot) -> None:
+        """Refresh sections from the snapshot and the pipeline stages that already ran."""
+        # Deferred: these singletons pull in the NOTAM engine and weather store
+        from alert_rules import get_alert_engine
+        from arrival_manager import get_arrival_manager
+        from notam_proximity import get_proximity_monitor
+
+        self._timestamp = snapshot.timestamp
+        self._sections["alerts"] = self._alert_lines(get_alert_engine().active_alerts())
+        self._sections["conflicts"] = self._conflict_lines(get_proximity_monitor().get_matches())
+        self._sections["arrivals"] = self._arrival_lines(get_arrival_manager().get_sequences())
+        self._sections["traffic"] = self._traffic_lines(snapshot)
+
+        if self._slow_refreshed_at is None or snapshot.timestamp - self._slow_refreshed_at >= SLOW_SECTION_REFRESH_SECONDS:
+            from metar_store import get_metar_store
+            from notam_engine import get_notam_engine
+
+            engine = get_notam_engine()
+            self._sections["weather"] = self._weather_lines(get_metar_store())
+            self._sections["notams"] = self._notam_lines(engine.active(at=snapshot.timestamp))
+            if engine.ready:
+                # Retried on the next snapshot while NOTAMs are still being indexed
+                self._slow_refreshed_at = snapshot.timestamp
+
+        self._rank()
+
+    def _rank(self) -> None:
+        ranked = sorted(
+            ((priority, section, line) for section, lines in self._sections.items() for priority, line in lines),
+            key=lambda item: -item[0],
+        )
+        self._ranked = [(section, line) for _, section, line in ranked]
+        total = 0
+        self._cumulative_tokens = []
+        for _, line in self._ranked:
+            total += estimate_tokens(line) + 1
+            self._cumulative_tokens.append(total)
+        self._rendered = {}
+
+    @staticmethod
+    def _ranked_lines(section: str, lines: List[str]) -> List[Tuple[float, str]]:
+        base = SECTION_PRIORITY[section]
+        return [(base - rank, line) for rank, line in enumerate(lines)]
+
+    def _alert_lines(self, alerts: List[Dict[str, Any]]) -> List[Tuple[float, str]]:
+        severity_rank = {"critical": 0, "warning": 1}
+        ordered = sorted(alerts, key=lambda alert: severity_rank.get(alert.get("severity"), 2))
+        lines = []
+        for alert in ordered:
+            who = alert.get("callsign") or alert.get("icao24")
+            altitude = f" at {alert['altitude_ft']} ft" if alert.get("altitude_ft") is not None else ""
+            squawk = f", squawk {alert['squawk']}" if alert.get("squawk") else ""
+            lines.append(f"{alert.get('severity', 'alert').upper()}: {alert.get('name')} - {who}{altitude}{squawk}")
+        return self._ranked_lines("alerts", lines)
+
+    def _conflict_lines(self, matches: List[Dict[str, Any]]) -> List[Tuple[float, str]]:
+        # One line per aircraft; those already inside an area rank first
+        by_aircraft: Dict[str, Dict[str, Any]] = {}
+        for match in matches:
+            who = match.get("callsign") or match.get("icao24")
+            entry = by_aircraft.setdefault(who, {"inside": [], "approaching": []})
+            area = f"{match.get('location') or ''} {match.get('number') or ''}".strip()
+            label = f"{area} ({match.get('subject') or 'area'})"
+            if match.get("status") == "inside":
+                entry["inside"].append(label)
+            else:
+                entry["approaching"].append((match.get("time_to_entry_seconds") or 0, label))
+
+        lines = []
+        for who, entry in sorted(by_aircraft.items(), key=lambda item: not item[1]["inside"]):
+            parts = []
+            if entry["inside"]:
+                parts.append("inside " + ", ".join(entry["inside"]))
+            for seconds, label in sorted(entry["approaching"]):
+                parts.append(f"entering {label} in {int(seconds)} s")
+            lines.append(f"{who} {'; '.join(parts)}")
+        return self._ranked_lines("conflicts", lines[:NOTAM_LINE_LIMIT])
+
+    def _arrival_lines(self, sequences: Dict[str, Dict[str, List[Dict[str, Any]]]]) -> List[Tuple[float, str]]:
+        lines = []
+        # Home airport first, then the others
+        for airport in sorted(sequences, key=lambda code: code != self.home_airport):
+            for runway, sequence in sequences[airport].items():
+                if not sequence:
+                    continue
+                entries = ", ".join(
+                    f"{entry.get('callsign') or entry['icao24']} {entry['distance_nm']:.0f}nm "
+                    f"ETA {int(entry['eta_seconds'] // 60)}m"
+                    for entry in sequence[:ARRIVALS_PER_RUNWAY]
+                )
+                more = f" (+{len(sequence) - ARRIVALS_PER_RUNWAY} more)" if len(sequence) > ARRIVALS_PER_RUNWAY else ""
+                lines.append(f"{airport} {runway}: {len(sequence)} inbound - {entries}{more}")
+        return self._ranked_lines("arrivals", lines)
+
+    def _traffic_lines(self, snapshot: AirSnapshot) -> List[Tuple[float, str]]:
+        count = len(snapshot)
+        if count == 0:
+            return self._ranked_lines("traffic", ["No traffic in the Bay Area picture"])
+
+        airborne = int(np.count_nonzero(~snapshot.on_ground))
+        lines = [f"{count} aircraft tracked, {airborne} airborne"]
+
+        home = BAY_AREA_AIRPORTS.get(self.home_airport)
+        if home is not None:
+            north = (snapshot.latitude - home["lat"]) * METERS_PER_DEG_LAT
+            east = (snapshot.longitude - home["lon"]) * METERS_PER_DEG_LAT * np.cos(np.radians(home["lat"]))
+            distance_nm = np.hypot(north, east) / METERS_PER_NM
+            bearing = (np.degrees(np.arctan2(east, north)) + 360.0) % 360.0
+            nearest = np.argsort(distance_nm)[:NEARBY_AIRCRAFT_LIMIT]
+            for row in nearest:
+                who = snapshot.callsign[row] or snapshot.icao24[row]
+                altitude = snapshot.altitude[row]
+                speed = snapshot.velocity[row]
+                parts = [f"{who} {distance_nm[row]:.0f}nm {int(bearing[row]):03d}deg from {self.home_airport}"]
+                parts.append("on ground" if snapshot.on_ground[row] else (
+                    f"{int(altitude * METERS_TO_FEET)} ft" if not np.isnan(altitude) else "alt unknown"
+                ))
+                if not np.isnan(speed):
+                    parts.append(f"{int(speed * MPS_TO_KNOTS)} kt")
+                if snapshot.squawk[row]:
+                    parts.append(f"sq {snapshot.squawk[row]}")
+                lines.append(", ".join(parts))
+        return self._ranked_lines("traffic", lines)
+
+    def _weather_lines(self, store) -> List[Tuple[float, str]]:
+        lines = []
+        stations = sorted(store.stations(), key=lambda code: code != self.home_airport)
+        for station in stations:
+            summary = store.summary(station)
+            if summary is None:
+                continue
+            # Any group can be missing from a METAR (e.g. "A////"); leave it out
+            parts = []
+            if summary["wind_speed_kt"] == 0:
+                parts.append("wind calm")
+            elif summary["wind_speed_kt"] is not None:
+                direction = summary["wind_dir_deg"] if summary["wind_dir_deg"] is not None else "VRB"
+                gust = f"G{summary['wind_gust_kt']}" if summary["wind_gust_kt"] else ""
+                parts.append(f"wind {direction}@{summary['wind_speed_kt']}{gust}kt")
+            if summary["visibility_sm"] is not None:
+                parts.append(f"vis {summary['visibility_sm']:g} sm")
+            if summary["ceiling_ft"] is not None:
+                parts.append(f"ceiling {summary['ceiling_ft']} ft")
+            parts.append(summary["condition"].lower())
+            if summary["altimeter_inhg"] is not None:
+                parts.append(f"altimeter {summary['altimeter_inhg']:.2f}")
+            if summary["category_tendency"] not in (None, "steady"):
+                parts.append(summary["category_tendency"])
+            lines.append(f"{station} {summary['flight_category'] or 'category unknown'}: " + ", ".join(parts))
+        return self._ranked_lines("weather", lines)
+
+    def _notam_lines(self, notams: List[Dict[str, Any]]) -> List[Tuple[float, str]]:
+        local = {code for airport in BAY_AREA_AIRPORTS for code in (airport, airport[1:])}
+        home = {self.home_airport, self.home_airport[1:]}
+
+        def rank(notam: Dict[str, Any]) -> Tuple[int, int]:
+            runway_related = bool(notam.get("runways")) or notam.get("subject") in _RUNWAY_SUBJECTS
+            return (0 if runway_related else 1, 0 if notam.get("location") in home else 1)
+
+        relevant = sorted((n for n in notams if n.get("location") in local), key=rank)
+        lines = []
+        if relevant:
+            lines.append(f"{len(relevant)} NOTAMs in effect at Bay Area airports")
+        for notam in relevant[:NOTAM_LINE_LIMIT]:
+            condition = " ".join(str(notam.get("condition", "")).split())
+            if len(condition) > 120:
+                condition = condition[:117] + "..."
+            lines.append(f"{notam.get('location')} {notam.get('number')}: {condition}")
+        return self._ranked_lines("notams", lines)
+
+    # ----- rendering -----
+
+    def render(self, token_budget: Optional[int] = None) -> Optional[str]:
+        """
+        Highest-priority lines that fit `token_budget`, grouped by section, or
+        None before the first snapshot. Results are memoized per budget until
+        the next update.
+        """
+        if self._timestamp is None:
+            return None
+        budget = token_budget or self.token_budget
+        rendered = self._rendered.get(budget)
+        if rendered is not None:
+            return rendered
+
+        as_of = datetime.fromtimestamp(self._timestamp, timezone.utc).strftime("%H%MZ")
+        header = f"{LIVE_CONTEXT_MARKER} Live air picture as of {as_of}:"
+        fit = bisect_right(self._cumulative_tokens, budget - FRAMING_TOKENS)
+
+        grouped: Dict[str, List[str]] = {}
+        for section, line in self._ranked[:fit]:
+            grouped.setdefault(section, []).append(line)
+
+        blocks = [header]
+        for section in SECTION_ORDER:
+            if section in grouped:
+                blocks.append(f"{SECTION_TITLES[section]}:\n" + "\n".join(f"- {line}" for line in grouped[section]))
+        rendered = "\n".join(blocks)
+        self._rendered[budget] = rendered
+        return rendered
+
+    def context_for(self, message: str, token_budget: Optional[int] = None) -> Optional[str]:
+        """Live context for a chat message, or None if the question does not need it."""
+        if not needs_live_context(message):
+            return None
+        return self.render(token_budget)
+
+
+# Singleton instance
+_context_builder_instance: Optional[CopilotContextBuilder] = None
+
+
+def get_context_builder() -> CopilotContextBuilder:
+    """Get or create copilot context builder singleton instance"""
+    global _context_builder_instance
+
+    if _context_builder_instance is None:
+        _context_builder_instance = CopilotContextBuilder(
+            home_airport=os.environ.get("COPILOT_HOME_AIRPORT", DEFAULT_HOME_AIRPORT).upper(),
+            token_budget=int(os.environ.get("COPILOT_CONTEXT_TOKENS", DEFAULT_TOKEN_BUDGET)),
+        )
+
+    return _context_builder_instance
@@ -0,0 +1,110 @@
+"""
+Dead-reckoning extrapolation for ODIN ATC Console.
+Projects the last air-picture snapshot forward in time so that clients can
+render smooth motion between upstream polls.
+"""
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from air_snapshot import AirSnapshot, METERS_PER_DEG_LAT, METERS_PER_NM
+
+
+# Uncertainty model: fixed position error plus velocity and acceleration growth
+BASE_POSITION_ERROR_M = 50.0
+VELOCITY_ERROR_MPS = 5.0
+MANEUVER_ACCEL_MPS2 = 1.5
+MAX_EXTRAPOLATION_SECONDS = 60.0
+
+
+class DeadReckoner:
+    """Extrapolates every track in the latest snapshot to an arbitrary timestamp."""
+
+    def __init__(self, max_horizon_seconds: float = MAX_EXTRAPOLATION_SECONDS):
+        self.max_horizon_seconds = max_horizon_seconds
+        self._snapshot: Optional[AirSnapshot] = None
+        self._north_mps: Optional[np.ndarray] = None
+        self._east_mps: Optional[np.ndarray] = None
+        self._up_mps: Optional[np.ndarray] = None
+
+    @property
+    def snapshot_time(self) -> Optional[int]:
+        return self._snapshot.timestamp if self._snapshot is not None else None
+
+    def update(self, snapshot: AirSnapshot) -> None:
+        """Store a new snapshot and precompute its velocity components."""
+        track_rad = np.radians(snapshot.true_track)
+        east = snapshot.velocity * np.sin(track_rad)
+        north = snapshot.velocity * np.cos(track_rad)
+        up = snapshot.vertical_rate
+
+        # Aircraft on the ground or without a velocity vector are held in place
+        moving = ~snapshot.on_ground
+        self._east_mps = np.where(moving, np.nan_to_num(east), 0.0)
+        self._north_mps = np.where(moving, np.nan_to_num(north), 0.0)
+        self._up_mps = np.where(moving, np.nan_to_num(up), 0.0)
+        self._snapshot = snapshot
+
+    def extrapolate(self, at_timestamp: float) -> List[Dict[str, Any]]:
+        """
+        Extrapolate every aircraft to the requested time.
+
+        Args:
+            at_timestamp: Target time in epoch seconds
+
+        Returns:
+            List of dicts with projected position, altitude and uncertainty radius
+        """
+        snapshot = self._snapshot
+        if snapshot is None or len(snapshot) == 0:
+            return []
+
+        dt = np.clip(at_timestamp - snapshot.time_position, 0.0, self.max_horizon_seconds)
+
+        meters_per_deg_lon = METERS_PER_DEG_LAT * np.cos(np.radians(snapshot.latitude))
+        latitude = snapshot.latitude + self._north_mps * dt / METERS_PER_DEG_LAT
+        longitude = snapshot.longitude + self._east_mps * dt / meters_per_deg_lon
+        altitude = snapshot.altitude + self._up_mps * dt
+
+        uncertainty_m = (
+            BASE_POSITION_ERROR_M
+            + VELOCITY_ERROR_MPS * dt
+            + 0.5 * MANEUVER_ACCEL_MPS2 * dt * dt
+        )
+        uncertainty_nm = uncertainty_m / METERS_PER_NM
+
+        return [
+            {
+                "icao24": icao,
+                "latitude": float(lat),
+                "longitude": float(lon),
+                "altitude": None if np.isnan(alt) else float(alt),
+                "true_track": None if np.isnan(track) else float(track),
+                "extrapolated_seconds": float(seconds),
+                "uncertainty_nm": float(radius),
+            }
+            for icao, lat, lon, alt, track, seconds, radius in zip(
+                snapshot.icao24,
+                latitude,
+                longitude,
+                altitude,
+                snapshot.true_track,
+                dt,
+                uncertainty_nm,
+            )
+        ]
+
+
+# Singleton instance
+_dead_reckoner_instance: Optional[DeadReckoner] = None
+
+
+def get_dead_reckoner() -> DeadReckoner:
+    """Get or create dead reckoner singleton instance"""
+    global _dead_reckoner_instance
+
+    if _dead_reckoner_instance is None:
+        _dead_reckoner_instance = DeadReckoner()
+
+    return _dead_reckoner_instance
@@ -0,0 +1,275 @@
+"""
+Local intent routing for ODIN Copilot.
+
+Structured questions with exact answers in memory ("how many inbound to SFO",
+"where is UAL123", "active NOTAMs at OAK", "weather at SJC") are matched by
+pattern and answered from the arrival manager, a per-snapshot callsign index,
+the NOTAM engine and the METAR store without an LLM round trip. Anything the
+router cannot resolve returns None and goes to OpenRouter as before.
+
+Only the operator's own words are matched; the airport of a focused tower
+facility in the console preface is used when the question names none.
+"""
+
+import logging
+import re
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from aircraft_simulator import BAY_AREA_AIRPORTS
+from air_snapshot import AirSnapshot, METERS_PER_DEG_LAT, METERS_PER_NM, METERS_TO_FEET, MPS_TO_KNOTS
+from chat_sessions import CONSOLE_CONTEXT_MARKER, user_text
+
+logger = logging.getLogger(__name__)
+
+
+NOTAM_ANSWER_LIMIT = 5
+ARRIVALS_PER_RUNWAY = 3
+
+_INBOUND_RE = re.compile(
+    r"\b(how many|number of|count|list|which|who(?:'s| is)?)\b.*\b(inbound|arriv\w*|landing|on approach)\b",
+    re.IGNORECASE,
+)
+_WHERE_RE = re.compile(
+    r"\b(?:where(?:'s| is)|locate|find|position of|status of)\s+(?:flight\s+|aircraft\s+)?"
+    r"(?P<ident>[A-Z]{2,3}\d{1,4}[A-Z]{0,2}|N\d{1,5}[A-Z]{0,2}|(?=[A-F]*\d)[0-9A-F]{6})\b",
+    re.IGNORECASE,
+)
+_NOTAM_RE = re.compile(r"\bnotams?\b", re.IGNORECASE)
+_WEATHER_RE = re.compile(
+    r"\b(weather|wx|metar|winds?|ceiling|visibility|altimeter|flight category|conditions)\b",
+    re.IGNORECASE,
+)
+# Questions that ask for reasoning rather than a lookup are left to the LLM
+_OPEN_ENDED_RE = re.compile(r"\b(why|should|explain|recommend|compare|what if|forecast|taf|trend)\b", re.IGNORECASE)
+_WORD_RE = re.compile(r"\b[A-Za-z]{3,4}\b")
+_FACILITY_ID_RE = re.compile(r"^Facility ID: (\S+)$", re.MULTILINE)
+
+
+def _compass_bearing(degrees: float) -> str:
+    return f"{int(round(degrees)) % 360:03d}"
+
+
+class IntentRouter:
+    """Answers structured copilot questions from in-memory state."""
+
+    def __init__(self):
+        self._snapshot: Optional[AirSnapshot] = None
+        # Upper-cased callsign and ICAO24 address -> snapshot row
+        self._index: Dict[str, int] = {}
+        self._intents: List[Callable[[str, List[str]], Optional[str]]] = [
+            self._where_is,
+            self._inbound,
+            self._notams,
+            self._weather,
+        ]
+        self.stats = {"routed": 0, "fallback": 0}
+
+    def update(self, snapshot: AirSnapshot) -> None:
+        """Rebuild the callsign index for a new snapshot."""
+        index: Dict[str, int] = {}
+        for row in range(len(snapshot)):
+            index[str(snapshot.icao24[row]).upper()] = row
+            callsign = str(snapshot.callsign[row] or "").strip().upper()
+            if callsign:
+                index[callsign] = row
+        self._index = index
+        self._snapshot = snapshot
+
+    def route(self, message: str) -> Optional[str]:
+        """Exact answer for a structured question, or None to fall back to the LLM."""
+        text = user_text(message)
+        if text and not _OPEN_ENDED_RE.search(text):
+            airports = self._airports_in(text) or self._focused_airport(message)
+            for intent in self._intents:
+                try:
+                    answer = intent(text, airports)
+                except Exception as e:
+                    # A broken lookup falls back to the LLM instead of failing the chat request
+                    logger.error(f"Intent {intent.__name__} failed: {e}")
+                    answer = None
+                if answer is not None:
+                    self.stats["routed"] += 1
+                    return answer
+        self.stats["fallback"] += 1
+        return None
+
+    def metrics(self) -> Dict[str, object]:
+        total = self.stats["routed"] + self.stats["fallback"]
+        return {**self.stats, "routed_rate": round(self.stats["routed"] / total, 3) if total else None}
+
+    # ----- helpers -----
+
+    @staticmethod
+    def _airports_in(text: str) -> List[str]:
+        """Bay Area airports mentioned as "SFO" or "KSFO", in order of mention."""
+        found = []
+        for word in _WORD_RE.findall(text.upper()):
+            code = word if len(word) == 4 else f"K{word}"
+            if code in BAY_AREA_AIRPORTS and code not in found:
+                found.append(code)
+        return found
+
+    @classmethod
+    def _focused_airport(cls, message: str) -> List[str]:
+        """Airport of the tower facility focused in the console preface, if any."""
+        if not message.startswith(CONSOLE_CONTEXT_MARKER):
+            return []
+        match = _FACILITY_ID_RE.search(message.split("\n\nUser: ", 1)[0])
+        return cls._airports_in(match.group(1)) if match else []
+
+    # ----- intents -----
+
+    def _where_is(self, text: str, airports: List[str]) -> Optional[str]:
+        match = _WHERE_RE.search(text)
+        if match is None:
+            return None
+        ident = match.group("ident").upper()
+        if ident in BAY_AREA_AIRPORTS or f"K{ident}" in BAY_AREA_AIRPORTS:
+            return None
+        snapshot = self._snapshot
+        if snapshot is None:
+            return None
+        row = self._index.get(ident)
+        if row is None:
+            return f"{ident} is not in the current air picture."
+
+        callsign = snapshot.callsign[row] or snapshot.icao24[row]
+        lat, lon = float(snapshot.latitude[row]), float(snapshot.longitude[row])
+
+        # Position relative to the nearest Bay Area airport
+        nearest_code, nearest_nm, nearest_bearing = None, None, None
+        for code, airport in BAY_AREA_AIRPORTS.items():
+            north = (lat - airport["lat"]) * METERS_PER_DEG_LAT
+            east = (lon - airport["lon"]) * METERS_PER_DEG_LAT * np.cos(np.radians(airport["lat"]))
+            distance_nm = float(np.hypot(north, east)) / METERS_PER_NM
+            if nearest_nm is None or distance_nm < nearest_nm:
+                nearest_code, nearest_nm = code, distance_nm
+                nearest_bearing = (np.degrees(np.arctan2(east, north)) + 360.0) % 360.0
+
+        parts = [f"{callsign} is {nearest_nm:.0f} NM {_compass_bearing(nearest_bearing)}° from {nearest_code}"]
+        if snapshot.on_ground[row]:
+            parts.append("on the ground")
+        else:
+            altitude, speed, track = snapshot.altitude[row], snapshot.velocity[row], snapshot.true_track[row]
+            if not np.isnan(altitude):
+                parts.append(f"at {int(altitude * METERS_TO_FEET):,} ft")
+            if not np.isnan(speed):
+                parts.append(f"{int(speed * MPS_TO_KNOTS)} kt")
+            if not np.isnan(track):
+                parts.append(f"tracking {_compass_bearing(track)}°")
+        if snapshot.squawk[row]:
+            parts.append(f"squawking {snapshot.squawk[row]}")
+        return ", ".join(parts) + "."
+
+    def _inbound(self, text: str, airports: List[str]) -> Optional[str]:
+        if not _INBOUND_RE.search(text):
+            return None
+        from arrival_manager import get_arrival_manager
+
+        if len(airports) > 1:
+            return None
+        sequences = get_arrival_manager().get_sequences(airports[0] if airports else None)
+
+        if airports:
+            runways = sequences.get(airports[0], {})
+            total = sum(len(sequence) for sequence in runways.values())
+            if total == 0:
+                return f"No aircraft are currently sequenced inbound to {airports[0]}."
+            details = []
+            for runway, sequence in runways.items():
+                if not sequence:
+                    continue
+                leaders = ", ".join(
+                    f"{entry.get('callsign') or entry['icao24']} ({entry['distance_nm']:.0f} NM, "
+                    f"ETA {max(1, round(entry['eta_seconds'] / 60))} min)"
+                    for entry in sequence[:ARRIVALS_PER_RUNWAY]
+                )
+                details.append(f"runway {runway}: {len(sequence)} - {leaders}")
+            verb = "is" if total == 1 else "are"
+            return f"{total} aircraft {verb} inbound to {airports[0]}; " + "; ".join(details) + "."
+
+        counts = {
+            code: sum(len(sequence) for sequence in runways.values())
+            for code, runways in sequences.items()
+        }
+        total = sum(counts.values())
+        if total == 0:
+            return "No aircraft are currently sequenced inbound to Bay Area airports."
+        breakdown = ", ".join(f"{code} {count}" for code, count in sorted(counts.items()) if count)
+        return f"{total} aircraft inbound to Bay Area airports: {breakdown}."
+
+    def _notams(self, text: str, airports: List[str]) -> Optional[str]:
+        if not _NOTAM_RE.search(text):
+            return None
+        if len(airports) != 1:
+            return None
+        from notam_engine import get_notam_engine
+
+        engine = get_notam_engine()
+        if not engine.ready:
+            # Still indexing at startup; an empty list would read as "no NOTAMs"
+            return None
+        code = airports[0]
+        notams = [n for n in engine.active() if n.get("location") in (code, code[1:])]
+        if not notams:
+            return f"No NOTAMs are currently active at {code}."
+
+        # Runway and movement-area NOTAMs first, then by subject
+        notams.sort(key=lambda n: (not n.get("runways"), str(n.get("subject") or "")))
+        lines = []
+        for notam in notams[:NOTAM_ANSWER_LIMIT]:
+            condition = " ".join(str(notam.get("condition", "")).split())
+            if len(condition) > 100:
+                condition = condition[:97] + "..."
+            lines.append(f"{notam.get('number')}: {condition}")
+        more = f" (first {NOTAM_ANSWER_LIMIT})" if len(notams) > NOTAM_ANSWER_LIMIT else ""
+        plural = "s" if len(notams) != 1 else ""
+        return f"{len(notams)} active NOTAM{plural} at {code}{more}:\n" + "\n".join(f"- {line}" for line in lines)
+
+    def _weather(self, text: str, airports: List[str]) -> Optional[str]:
+        if not _WEATHER_RE.search(text):
+            return None
+        from metar_store import get_metar_store
+
+        store = get_metar_store()
+        if len(airports) != 1:
+            return None
+        summary = store.summary(airports[0])
+        if summary is None:
+            return None
+
+        # Groups missing from the METAR (e.g. "A////") are left out
+        parts = []
+        if summary["wind_speed_kt"] == 0:
+            parts.append("wind calm")
+        elif summary["wind_speed_kt"] is not None:
+            direction = f"{summary['wind_dir_deg']:03d}°" if summary["wind_dir_deg"] is not None else "variable"
+            gust = f" gusting {summary['wind_gust_kt']}" if summary["wind_gust_kt"] else ""
+            parts.append(f"wind {direction} at {summary['wind_speed_kt']}{gust} kt")
+        if summary["visibility_sm"] is not None:
+            parts.append(f"visibility {summary['visibility_sm']:g} SM")
+        if summary["ceiling_ft"] is not None:
+            parts.append(f"ceiling {summary['ceiling_ft']:,} ft")
+        parts.append(summary["condition"].lower())
+        if summary["temp_c"] is not None:
+            parts.append(f"{summary['temp_c']}°C")
+        if summary["altimeter_inhg"] is not None:
+            parts.append(f"altimeter {summary['altimeter_inhg']:.2f}")
+        category = f"is {summary['flight_category']}" if summary["flight_category"] else "(category unknown)"
+        return f"{summary['station']} {category}: " + ", ".join(parts) + f".\n{summary['raw']}"
+
+
+# Singleton instance
+_intent_router_instance: Optional[IntentRouter] = None
+
+
+def get_intent_router() -> IntentRouter:
+    """Get or create intent router singleton instance"""
+    global _intent_router_instance
+
+    if _intent_router_instance is None:
+        _intent_router_instance = IntentRouter()
+
+    return _intent_router_instance
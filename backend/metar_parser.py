@@ -0,0 +1,415 @@
+"""
+METAR / TAF decoder for the ODIN backend.
+
+Decodes raw aviation weather reports into typed fields (wind, visibility,
+weather, clouds, temperature, altimeter) and derives ceiling and flight
+category. Each whitespace-separated token is classified by one compiled
+alternation, so decoding is a single pass over the report.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from fractions import Fraction
+from typing import Dict, List, Optional
+
+
+_CONDITION_RE = re.compile(
+    r"""
+    (?P<wind>(?P<wind_dir>\d{3}|VRB)(?P<wind_speed>\d{2,3})(?:G(?P<gust>\d{2,3}))?(?P<wind_unit>KT|MPS))
+    | (?P<wind_var>\d{3}V\d{3})
+    | (?P<vis_sm>(?P<vis_prefix>[MP])?(?P<vis_value>\d+|\d/\d{1,2})SM)
+    | (?P<vis_m>\d{4})
+    | (?P<cavok>CAVOK)
+    | (?P<sky_clear>CLR|SKC|NSC|NCD)
+    | (?P<cloud>(?P<cover>FEW|SCT|BKN|OVC|VV)(?P<base>\d{3}|///)(?P<cloud_type>CB|TCU)?)
+    | (?P<temp>(?P<temp_c>M?\d{2})/(?P<dew_c>M?\d{2})?)
+    | (?P<altimeter>(?P<alt_unit>[AQ])(?P<alt_value>\d{4}))
+    | (?P<wx>(?:[-+]|VC)?(?:MI|PR|BC|DR|BL|SH|TS|FZ)?(?:DZ|RA|SN|SG|IC|PL|GR|GS|UP|BR|FG|FU|VA|DU|SA|HZ|PY|PO|SQ|FC|SS|DS)*)
+    """,
+    re.VERBOSE,
+)
+
+_STATION_RE = re.compile(r"[A-Z][A-Z0-9]{3}")
+_TIME_RE = re.compile(r"(\d{2})(\d{2})(\d{2})Z")
+_PERIOD_RE = re.compile(r"(\d{2})(\d{2})/(\d{2})(\d{2})")
+_FROM_RE = re.compile(r"FM(\d{2})(\d{2})(\d{2})")
+_CHANGE_RE = re.compile(r"TEMPO|BECMG|PROB\d{2}")
+
+_WX_DESCRIPTIONS = {
+    "MI": "shallow", "PR": "partial", "BC": "patches of", "DR": "low drifting",
+    "BL": "blowing", "SH": "showers of", "TS": "thunderstorm", "FZ": "freezing",
+    "DZ": "drizzle", "RA": "rain", "SN": "snow", "SG": "snow grains", "IC": "ice crystals",
+    "PL": "ice pellets", "GR": "hail", "GS": "small hail", "UP": "unknown precipitation",
+    "BR": "mist", "FG": "fog", "FU": "smoke", "VA": "volcanic ash", "DU": "dust",
+    "SA": "sand", "HZ": "haze", "PY": "spray", "PO": "dust whirls", "SQ": "squalls",
+    "FC": "funnel cloud", "SS": "sandstorm", "DS": "duststorm",
+}
+_COVER_DESCRIPTIONS = {"FEW": "few", "SCT": "scattered", "BKN": "broken", "OVC": "overcast", "VV": "vertical visibility"}
+
+METERS_PER_SM = 1609.344
+MPS_TO_KNOTS = 1.94384
+HPA_PER_INHG = 33.8639
+
+FLIGHT_CATEGORIES = ("LIFR", "IFR", "MVFR", "VFR")
+
+
+@dataclass
+class CloudLayer:
+    cover: str
+    base_ft: Optional[int]
+    cloud_type: Optional[str] = None
+
+
+@dataclass
+class Conditions:
+    """Wind, visibility, weather and sky shared by METARs and TAF periods."""
+
+    wind_dir_deg: Optional[int] = None
+    wind_variable: bool = False
+    wind_speed_kt: Optional[int] = None
+    wind_gust_kt: Optional[int] = None
+    visibility_sm: Optional[float] = None
+    weather: List[str] = field(default_factory=list)
+    clouds: List[CloudLayer] = field(default_factory=list)
+
+    @property
+    def ceiling_ft(self) -> Optional[int]:
+        """Lowest broken, overcast or obscured layer."""
+        bases = [
+            layer.base_ft for layer in self.clouds
+            if layer.cover in ("BKN", "OVC", "VV") and layer.base_ft is not None
+        ]
+        return min(bases) if bases else None
+
+    @property
+    def flight_category(self) -> Optional[str]:
+        if self.visibility_sm is None and not self.clouds:
+            return None
+        ceiling = self.ceiling_ft
+        visibility = self.visibility_sm
+        if (ceiling is not None and ceiling < 500) or (visibility is not None and visibility < 1):
+            return "LIFR"
+        if (ceiling is not None and ceiling < 1000) or (visibility is not None and visibility < 3):
+            return "IFR"
+        if (ceiling is not None and ceiling <= 3000) or (visibility is not None and visibility <= 5):
+            return "MVFR"
+        return "VFR"
+
+    def conditions_dict(self) -> Dict[str, object]:
+        return {
+            "wind_dir_deg": self.wind_dir_deg,
+            "wind_variable": self.wind_variable,
+            "wind_speed_kt": self.wind_speed_kt,
+            "wind_gust_kt": self.wind_gust_kt,
+            "visibility_sm": self.visibility_sm,
+            "weather": list(self.weather),
+            "clouds": [
+                {"cover": layer.cover, "base_ft": layer.base_ft, "type": layer.cloud_type}
+                for layer in self.clouds
+            ],
+            "ceiling_ft": self.ceiling_ft,
+            "flight_category": self.flight_category,
+        }
+
+
+@dataclass
+class Metar(Conditions):
+    station: str = ""
+    observed_at: Optional[datetime] = None
+    report_type: str = "METAR"
+    auto: bool = False
+    temp_c: Optional[int] = None
+    dewpoint_c: Optional[int] = None
+    altimeter_inhg: Optional[float] = None
+    raw: str = ""
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "station": self.station,
+            "report_type": self.report_type,
+            "observed_at": self.observed_at.isoformat() if self.observed_at else None,
+            "auto": self.auto,
+            **self.conditions_dict(),
+            "temp_c": self.temp_c,
+            "dewpoint_c": self.dewpoint_c,
+            "altimeter_inhg": self.altimeter_inhg,
+            "raw": self.raw,
+        }
+
+
+@dataclass
+class TafPeriod(Conditions):
+    change: str = "BASE"
+    probability: Optional[int] = None
+    valid_from: Optional[datetime] = None
+    valid_to: Optional[datetime] = None
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "change": self.change,
+            "probability": self.probability,
+            "valid_from": self.valid_from.isoformat() if self.valid_from else None,
+            "valid_to": self.valid_to.isoformat() if self.valid_to else None,
+            **self.conditions_dict(),
+        }
+
+
+@dataclass
+class Taf:
+    station: str = ""
+    issued_at: Optional[datetime] = None
+    valid_from: Optional[datetime] = None
+    valid_to: Optional[datetime] = None
+    periods: List[TafPeriod] = field(default_factory=list)
+    raw: str = ""
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "station": self.station,
+            "issued_at": self.issued_at.isoformat() if self.issued_at else None,
+            "valid_from": self.valid_from.isoformat() if self.valid_from else None,
+            "valid_to": self.valid_to.isoformat() if self.valid_to else None,
+            "periods": [period.to_dict() for period in self.periods],
+            "raw": self.raw,
+        }
+
+
+def _resolve_day(day: int, hour: int, minute: int, reference: datetime) -> Optional[datetime]:
+    """
+    Place a day-of-month stamp in the month closest to `reference`. Reports
+    only carry DDHHMM, so a day after the reference day belongs to last month.
+    """
+    year, month = reference.year, reference.month
+    for _ in range(2):
+        try:
+            moment = datetime(year, month, day, tzinfo=timezone.utc) + timedelta(hours=hour, minutes=minute)
+        except ValueError:
+            moment = None
+        if moment is not None and moment <= reference + timedelta(days=1):
+            return moment
+        month -= 1
+        if month == 0:
+            year, month = year - 1, 12
+    return None
+
+
+def _visibility(match: re.Match, whole: Optional[int]) -> float:
+    value = match.group("vis_value")
+    visibility = float(Fraction(value)) if "/" in value else float(value)
+    if whole is not None:
+        visibility += whole
+    if match.group("vis_prefix") == "M":
+        # "Less than": report just under the value
+        visibility = max(0.0, visibility - 0.01)
+    return visibility
+
+
+def _decode_conditions(tokens: List[str], target: Conditions) -> Dict[str, object]:
+    """Decode condition tokens into `target`; returns temp/altimeter extras."""
+    extras: Dict[str, object] = {}
+    pending_whole: Optional[int] = None
+
+    for token in tokens:
+        if token.isdigit() and len(token) == 1:
+            # Whole part of a split visibility such as "1 1/2SM"
+            pending_whole = int(token)
+            continue
+        match = _CONDITION_RE.fullmatch(token)
+        if match is None or not token:
+            pending_whole = None
+            continue
+        kind = match.lastgroup
+        if kind == "wind":
+            speed = int(match.group("wind_speed"))
+            gust = match.group("gust")
+            factor = MPS_TO_KNOTS if match.group("wind_unit") == "MPS" else 1.0
+            target.wind_speed_kt = int(round(speed * factor))
+            target.wind_gust_kt = int(round(int(gust) * factor)) if gust else None
+            if match.group("wind_dir") == "VRB":
+                target.wind_variable = True
+            else:
+                target.wind_dir_deg = int(match.group("wind_dir"))
+        elif kind == "wind_var":
+            target.wind_variable = True
+        elif kind == "vis_sm":
+            target.visibility_sm = _visibility(match, pending_whole)
+        elif kind == "vis_m":
+            meters = int(token)
+            # 9999 means 10 km or more
+            target.visibility_sm = round((10000 if meters == 9999 else meters) / METERS_PER_SM, 2)
+        elif kind == "cavok":
+            target.visibility_sm = 6.2
+        elif kind == "cloud":
+            base = match.group("base")
+            target.clouds.append(CloudLayer(
+                cover=match.group("cover"),
+                base_ft=None if base == "///" else int(base) * 100,
+                cloud_type=match.group("cloud_type"),
+            ))
+        elif kind == "temp":
+            extras["temp_c"] = int(match.group("temp_c").replace("M", "-"))
+            dew = match.group("dew_c")
+            extras["dewpoint_c"] = int(dew.replace("M", "-")) if dew else None
+        elif kind == "altimeter":
+            value = int(match.group("alt_value"))
+            extras["altimeter_inhg"] = (
+                value / 100.0 if match.group("alt_unit") == "A" else round(value / HPA_PER_INHG, 2)
+            )
+        elif kind == "wx":
+            target.weather.append(token)
+        pending_whole = None
+
+    return extras
+
+
+def decode_metar(text: str, reference: Optional[datetime] = None) -> Optional[Metar]:
+    """
+    Decode a METAR/SPECI report. Remarks (after RMK) are ignored.
+
+    Returns:
+        Metar, or None if the report has no station and observation time
+    """
+    raw = " ".join(text.split())
+    body = raw.split(" RMK", 1)[0].rstrip("=")
+    tokens = body.split()
+    metar = Metar(raw=raw)
+
+    if tokens and tokens[0] in ("METAR", "SPECI"):
+        metar.report_type = tokens.pop(0)
+    if tokens and tokens[0] == "COR":
+        tokens.pop(0)
+    if len(tokens) < 2 or not _STATION_RE.fullmatch(tokens[0]):
+        return None
+    metar.station = tokens[0]
+    stamp = _TIME_RE.fullmatch(tokens[1])
+    if stamp is None:
+        return None
+    day, hour, minute = (int(part) for part in stamp.groups())
+    metar.observed_at = _resolve_day(day, hour, minute, reference or datetime.now(timezone.utc))
+    if metar.observed_at is None:
+        return None
+
+    rest = tokens[2:]
+    if rest and rest[0] in ("AUTO", "COR"):
+        metar.auto = rest[0] == "AUTO"
+        rest = rest[1:]
+
+    extras = _decode_conditions(rest, metar)
+    metar.temp_c = extras.get("temp_c")
+    metar.dewpoint_c = extras.get("dewpoint_c")
+    metar.altimeter_inhg = extras.get("altimeter_inhg")
+    return metar
+
+
+def decode_taf(text: str, reference: Optional[datetime] = None) -> Optional[Taf]:
+    """Decode a TAF into its base forecast and FM/TEMPO/BECMG/PROB change groups."""
+    raw = " ".join(text.split())
+    tokens = raw.rstrip("=").split()
+    taf = Taf(raw=raw)
+    reference = reference or datetime.now(timezone.utc)
+
+    if tokens and tokens[0] == "TAF":
+        tokens.pop(0)
+    while tokens and tokens[0] in ("AMD", "COR"):
+        tokens.pop(0)
+    if len(tokens) < 3 or not _STATION_RE.fullmatch(tokens[0]):
+        return None
+    taf.station = tokens[0]
+    stamp = _TIME_RE.fullmatch(tokens[1])
+    period = _PERIOD_RE.fullmatch(tokens[2])
+    if stamp is None or period is None:
+        return None
+    taf.issued_at = _resolve_day(*(int(part) for part in stamp.groups()), reference)
+    if taf.issued_at is None:
+        return None
+
+    def resolve(day: int, hour: int, minute: int = 0) -> Optional[datetime]:
+        # Validity stamps are relative to issuance and may run into next month
+        return _resolve_day(day, hour, minute, taf.issued_at + timedelta(days=2))
+
+    start_day, start_hour, end_day, end_hour = (int(part) for part in period.groups())
+    taf.valid_from = resolve(start_day, start_hour)
+    taf.valid_to = resolve(end_day, end_hour)
+
+    current = TafPeriod(valid_from=taf.valid_from, valid_to=taf.valid_to)
+    group_tokens: List[str] = []
+    groups: List[tuple] = []
+    index = 3
+    while index < len(tokens):
+        token = tokens[index]
+        from_match = _FROM_RE.fullmatch(token)
+        if from_match or _CHANGE_RE.fullmatch(token):
+            groups.append((current, group_tokens))
+            group_tokens = []
+            if from_match:
+                current = TafPeriod(change="FM", valid_from=resolve(*(int(part) for part in from_match.groups())))
+            else:
+                current = TafPeriod(change=token)
+                if token.startswith("PROB"):
+                    current.probability = int(token[4:])
+                    if index + 1 < len(tokens) and tokens[index + 1] == "TEMPO":
+                        current.change = "PROB TEMPO"
+                        index += 1
+                window = _PERIOD_RE.fullmatch(tokens[index + 1]) if index + 1 < len(tokens) else None
+                if window:
+                    day_from, hour_from, day_to, hour_to = (int(part) for part in window.groups())
+                    current.valid_from = resolve(day_from, hour_from)
+                    current.valid_to = resolve(day_to, hour_to)
+                    index += 1
+        else:
+            group_tokens.append(token)
+        index += 1
+    groups.append((current, group_tokens))
+
+    for forecast, group in groups:
+        _decode_conditions(group, forecast)
+        taf.periods.append(forecast)
+
+    # An FM group runs until the next FM group (or the end of the TAF)
+    from_periods = [p for p in taf.periods if p.change in ("BASE", "FM")]
+    for earlier, later in zip(from_periods, from_periods[1:]):
+        earlier.valid_to = later.valid_from
+    if from_periods:
+        from_periods[-1].valid_to = taf.valid_to
+
+    return taf
+
+
+def describe_weather(code: str) -> str:
+    """Plain-language reading of a present-weather group such as "-SHRA"."""
+    intensity = ""
+    if code.startswith("-"):
+        intensity, code = "light ", code[1:]
+    elif code.startswith("+"):
+        intensity, code = "heavy ", code[1:]
+    vicinity = code.startswith("VC")
+    if vicinity:
+        code = code[2:]
+    words = [_WX_DESCRIPTIONS.get(code[i:i + 2], code[i:i + 2]) for i in range(0, len(code), 2)]
+    text = intensity + " ".join(words)
+    return f"{text} in the vicinity" if vicinity else text
+
+
+def describe_cover(cover: str) -> str:
+    return _COVER_DESCRIPTIONS.get(cover, cover.lower())
+
+
+def split_reports(text: str) -> List[str]:
+    """
+    Split a bulletin into individual reports. A report starts with METAR,
+    SPECI or TAF, or on any unindented line; indented lines continue a TAF.
+    """
+    reports: List[str] = []
+    for line in text.splitlines():
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        continues = line[:1].isspace() or _FROM_RE.match(stripped) or _CHANGE_RE.match(stripped)
+        if reports and continues and reports[-1].startswith("TAF"):
+            reports[-1] += " " + stripped
+        else:
+            reports.append(stripped)
+    return reports
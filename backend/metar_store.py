@@ -0,0 +1,489 @@
+"""
+Local METAR / TAF store for the ODIN backend.
+
+Raw reports are read from local files (or a drop directory of *.txt files),
+decoded with `metar_parser`, and kept per station: the latest decoded METAR
+and TAF, plus a fixed-size ring buffer of numeric observations that trends
+(pressure tendency, wind and temperature change, category changes) are
+computed from without touching the raw text again.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import os
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from metar_parser import (
+    FLIGHT_CATEGORIES,
+    Metar,
+    Taf,
+    decode_metar,
+    decode_taf,
+    describe_cover,
+    describe_weather,
+    split_reports,
+)
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HISTORY = 72
+DEFAULT_POLL_SECONDS = 60.0
+# Made-up sample bulletin for benchmarks and local experiments; never served by default
+SAMPLE_BULLETIN = Path(__file__).parent / "data" / "metar_seed.txt"
+# Older observations are kept for trends but not reported as current weather
+MAX_OBSERVATION_AGE_HOURS = 2.0
+# Altimeter change over the trend window below which pressure is "steady"
+PRESSURE_STEADY_INHG = 0.02
+
+SERIES_FIELDS = (
+    "wind_dir_deg",
+    "wind_speed_kt",
+    "wind_gust_kt",
+    "visibility_sm",
+    "ceiling_ft",
+    "temp_c",
+    "dewpoint_c",
+    "altimeter_inhg",
+    "category",
+)
+_COLUMN = {name: index for index, name in enumerate(SERIES_FIELDS)}
+_DIGIT_WORDS = ("zero", "one", "two", "three", "four", "five", "six", "seven", "eight", "niner")
+
+
+def _spoken(number: Union[int, str]) -> str:
+    return " ".join(_DIGIT_WORDS[int(digit)] for digit in str(number) if digit.isdigit())
+
+
+def _spoken_height(feet: int) -> str:
+    """Heights are read as "one thousand two hundred", not digit by digit."""
+    thousands, hundreds = divmod(int(feet) // 100, 10)
+    words = []
+    if thousands:
+        words.append(f"{_spoken(thousands)} thousand")
+    if hundreds:
+        words.append(f"{_spoken(hundreds)} hundred")
+    return " ".join(words) or "zero"
+
+
+def _clean(value: float) -> Optional[float]:
+    return None if math.isnan(value) else round(float(value), 2)
+
+
+class StationSeries:
+    """Ring buffer of a station's decoded observations, oldest overwritten first."""
+
+    def __init__(self, station: str, capacity: int = DEFAULT_HISTORY):
+        self.station = station
+        self.capacity = capacity
+        self.times = np.full(capacity, np.nan)
+        self.values = np.full((capacity, len(SERIES_FIELDS)), np.nan)
+        self.latest: Optional[Metar] = None
+        self.taf: Optional[Taf] = None
+        self._head = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @staticmethod
+    def _row(metar: Metar) -> List[float]:
+        category = metar.flight_category
+        values = {
+            "category": FLIGHT_CATEGORIES.index(category) if category else None,
+            "ceiling_ft": metar.ceiling_ft,
+        }
+        return [
+            np.nan if (value := values.get(name, getattr(metar, name, None))) is None else value
+            for name in SERIES_FIELDS
+        ]
+
+    def append(self, metar: Metar) -> bool:
+        """
+        Record an observation. Reports are expected in time order: a report
+        for the latest time replaces it (a correction); older ones are ignored.
+        """
+        timestamp = metar.observed_at.timestamp()
+        if self.latest is not None:
+            latest = self.latest.observed_at.timestamp()
+            if timestamp < latest:
+                return False
+            if timestamp == latest:
+                if metar.raw == self.latest.raw:
+                    return False
+                slot = (self._head - 1) % self.capacity
+                self.values[slot] = self._row(metar)
+                self.latest = metar
+                return True
+
+        self.times[self._head] = timestamp
+        self.values[self._head] = self._row(metar)
+        self._head = (self._head + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+        self.latest = metar
+        return True
+
+    def window(self, since: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Observations at or after `since`, oldest first."""
+        order = (np.arange(self._count) + self._head - self._count) % self.capacity
+        times = self.times[order]
+        keep = times >= since
+        return times[keep], self.values[order][keep]
+
+
+class MetarStore:
+    """Per-station METAR history and latest TAF, fed from local report files."""
+
+    def __init__(
+        self,
+        sources: Iterable[Path] = (),
+        capacity: int = DEFAULT_HISTORY,
+        poll_seconds: float = DEFAULT_POLL_SECONDS,
+    ):
+        self.sources = [Path(source) for source in sources]
+        self.capacity = capacity
+        self.poll_seconds = poll_seconds
+        self._stations: Dict[str, StationSeries] = {}
+        self._signatures: Dict[Path, Tuple[int, int]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    # ----- ingest -----
+
+    @staticmethod
+    def decode(text: str, reference: Optional[datetime] = None) -> List[Union[Metar, Taf]]:
+        """Decode every report in a bulletin; undecodable reports are skipped."""
+        reference = reference or datetime.now(timezone.utc)
+        decoded: List[Union[Metar, Taf]] = []
+        for report in split_reports(text):
+            if report.startswith("TAF"):
+                result = decode_taf(report, reference)
+            else:
+                result = decode_metar(report, reference)
+            if result is None:
+                logger.debug(f"Skipping undecodable report: {report[:60]}")
+            else:
+                decoded.append(result)
+        return decoded
+
+    def apply(self, reports: Iterable[Union[Metar, Taf]]) -> Dict[str, int]:
+        """Add decoded reports to the store; METARs are applied oldest first."""
+        stats = {"metars": 0, "tafs": 0, "ignored": 0}
+        metars: List[Metar] = []
+        for report in reports:
+            if isinstance(report, Taf):
+                series = self._series(report.station)
+                if series.taf is None or report.issued_at >= series.taf.issued_at:
+                    series.taf = report
+                    stats["tafs"] += 1
+                else:
+                    stats["ignored"] += 1
+            else:
+                metars.append(report)
+
+        # Feeds commonly list newest first; the ring buffer wants time order
+        metars.sort(key=lambda metar: metar.observed_at)
+        for metar in metars:
+            if self._series(metar.station).append(metar):
+                stats["metars"] += 1
+            else:
+                stats["ignored"] += 1
+        return stats
+
+    def ingest_text(self, text: str) -> Dict[str, int]:
+        return self.apply(self.decode(text))
+
+    def ingest_file(self, path: Path) -> Dict[str, int]:
+        return self.ingest_text(Path(path).read_text(encoding="utf-8", errors="replace"))
+
+    def _series(self, station: str) -> StationSeries:
+        series = self._stations.get(station)
+        if series is None:
+            series = self._stations[station] = StationSeries(station, self.capacity)
+        return series
+
+    def _changed_files(self) -> List[Tuple[Path, Tuple[int, int]]]:
+        """
+        Source files (directories expand to their *.txt files) changed since
+        last read, with the signature to record once a file has been applied.
+        """
+        changed: List[Tuple[Path, Tuple[int, int]]] = []
+        for source in self.sources:
+            paths = sorted(source.glob("*.txt")) if source.is_dir() else [source]
+            for path in paths:
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                signature = (stat.st_mtime_ns, stat.st_size)
+                if self._signatures.get(path) != signature:
+                    changed.append((path, signature))
+        return changed
+
+    def load_sources(self) -> None:
+        """Synchronously read every changed source file (used for the initial load)."""
+        for path, signature in self._changed_files():
+            try:
+                self.ingest_file(path)
+            except OSError as exc:
+                logger.error(f"Failed to read METAR source {path}: {exc}")
+                continue
+            self._signatures[path] = signature
+
+    async def poll_once(self) -> Dict[str, int]:
+        """Decode changed source files in a worker thread and apply them on the loop."""
+        totals = {"metars": 0, "tafs": 0, "ignored": 0}
+        for path, signature in await asyncio.to_thread(self._changed_files):
+            try:
+                text = await asyncio.to_thread(path.read_text, encoding="utf-8", errors="replace")
+            except OSError as exc:
+                logger.error(f"Failed to read METAR source {path}: {exc}")
+                continue
+            reports = await asyncio.to_thread(self.decode, text)
+            for key, value in self.apply(reports).items():
+                totals[key] += value
+            # Recorded only now, so a file that failed part-way is read again next poll
+            self._signatures[path] = signature
+        if totals["metars"] or totals["tafs"]:
+            logger.info(f"METAR ingest: +{totals['metars']} METAR, +{totals['tafs']} TAF")
+        return totals
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.poll_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # noqa: BLE001
+                logger.error(f"METAR poll failed: {exc}")
+            await asyncio.sleep(self.poll_seconds)
+
+    def start(self) -> None:
+        if not self.sources:
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    # ----- queries -----
+
+    def resolve_station(self, station: str) -> Optional[str]:
+        """Match "KSFO" or "SFO" against stored stations."""
+        code = (station or "").strip().upper()
+        for candidate in (code, f"K{code}"):
+            if candidate in self._stations:
+                return candidate
+        return None
+
+    def stations(self) -> List[str]:
+        return sorted(code for code, series in self._stations.items() if series.latest is not None)
+
+    def current(self, station: str) -> Optional[Dict[str, object]]:
+        code = self.resolve_station(station)
+        latest = self._stations[code].latest if code else None
+        return latest.to_dict() if latest else None
+
+    def forecast(self, station: str) -> Optional[Dict[str, object]]:
+        code = self.resolve_station(station)
+        taf = self._stations[code].taf if code else None
+        return taf.to_dict() if taf else None
+
+    def trend(self, station: str, hours: float = 3.0) -> Optional[Dict[str, object]]:
+        """
+        Change over the last `hours` of observations, measured back from the
+        latest report: pressure tendency, temperature and wind change, worst
+        visibility/ceiling, and whether the flight category is improving.
+        """
+        code = self.resolve_station(station)
+        series = self._stations.get(code) if code else None
+        if series is None or series.latest is None:
+            return None
+
+        latest_time = series.latest.observed_at.timestamp()
+        times, values = series.window(latest_time - hours * 3600.0)
+
+        def column(name: str) -> np.ndarray:
+            return values[:, _COLUMN[name]]
+
+        def change(name: str) -> Optional[float]:
+            valid = column(name)[~np.isnan(column(name))]
+            return _clean(valid[-1] - valid[0]) if len(valid) >= 2 else None
+
+        def extreme(name: str, reducer) -> Optional[float]:
+            data = column(name)
+            return _clean(reducer(data)) if not np.isnan(data).all() else None
+
+        pressure_change = change("altimeter_inhg")
+        if pressure_change is None:
+            pressure = None
+        elif abs(pressure_change) < PRESSURE_STEADY_INHG:
+            pressure = "steady"
+        else:
+            pressure = "rising" if pressure_change > 0 else "falling"
+
+        categories = [FLIGHT_CATEGORIES[int(value)] for value in column("category") if not np.isnan(value)]
+        category_change = change("category")
+        if category_change is None or category_change == 0:
+            tendency = "steady"
+        else:
+            tendency = "improving" if category_change > 0 else "deteriorating"
+
+        return {
+            "station": code,
+            "hours": hours,
+            "observations": int(len(times)),
+            "from": datetime.fromtimestamp(times[0], timezone.utc).isoformat() if len(times) else None,
+            "to": series.latest.observed_at.isoformat(),
+            "altimeter_change_inhg": pressure_change,
+            "pressure_tendency": pressure,
+            "temp_change_c": change("temp_c"),
+            "wind_speed_change_kt": change("wind_speed_kt"),
+            "max_gust_kt": extreme("wind_gust_kt", np.nanmax),
+            "min_visibility_sm": extreme("visibility_sm", np.nanmin),
+            "min_ceiling_ft": extreme("ceiling_ft", np.nanmin),
+            "category_from": categories[0] if categories else None,
+            "category_to": categories[-1] if categories else None,
+            "category_tendency": tendency,
+            "series": {
+                "observed_at": [int(value) for value in times],
+                **{name: [_clean(value) for value in column(name)] for name in SERIES_FIELDS if name != "category"},
+                "category": [FLIGHT_CATEGORIES[int(v)] if not np.isnan(v) else None for v in column("category")],
+            },
+        }
+
+    def outlook(self, station: str, hours: float = 6.0) -> Optional[Dict[str, object]]:
+        """
+        Worst TAF flight category in the next `hours`, measured from the latest
+        observation so a stale feed is still self-consistent.
+        """
+        code = self.resolve_station(station)
+        series = self._stations.get(code) if code else None
+        if series is None or series.taf is None:
+            return None
+
+        start = series.latest.observed_at if series.latest else datetime.now(timezone.utc)
+        end = start + timedelta(hours=hours)
+        worst = None
+        for period in series.taf.periods:
+            if period.valid_from is None or period.valid_to is None:
+                continue
+            if period.valid_to <= start or period.valid_from >= end:
+                continue
+            category = period.flight_category
+            if category and (worst is None or FLIGHT_CATEGORIES.index(category) < FLIGHT_CATEGORIES.index(worst[0])):
+                worst = (category, period)
+        if worst is None:
+            return None
+        category, period = worst
+        return {"category": category, "change": period.change, "valid_from": period.valid_from.isoformat()}
+
+    def _current_metar(self, station: str) -> Tuple[Optional[str], Optional[Metar]]:
+        """Station code and latest METAR, if that METAR is recent enough to count as current."""
+        code = self.resolve_station(station)
+        metar = self._stations[code].latest if code else None
+        if metar is None:
+            return code, None
+        age = datetime.now(timezone.utc) - metar.observed_at
+        if age > timedelta(hours=MAX_OBSERVATION_AGE_HOURS):
+            return code, None
+        return code, metar
+
+    def summary(self, station: str) -> Optional[Dict[str, object]]:
+        """Compact current conditions for the AIR bar (None when the latest METAR is stale)."""
+        code, metar = self._current_metar(station)
+        if metar is None:
+            return None
+        trend = self.trend(code) or {}
+        if metar.weather:
+            condition = ", ".join(describe_weather(group) for group in metar.weather)
+        elif metar.clouds:
+            layer = max(metar.clouds, key=lambda layer: ("FEW", "SCT", "BKN", "OVC", "VV").index(layer.cover))
+            condition = describe_cover(layer.cover)
+        else:
+            condition = "clear"
+        return {
+            "station": code,
+            "observed_at": metar.observed_at.isoformat(),
+            "flight_category": metar.flight_category,
+            "condition": condition.capitalize(),
+            "temp_c": metar.temp_c,
+            "wind_dir_deg": metar.wind_dir_deg,
+            "wind_speed_kt": metar.wind_speed_kt,
+            "wind_gust_kt": metar.wind_gust_kt,
+            "visibility_sm": metar.visibility_sm,
+            "ceiling_ft": metar.ceiling_ft,
+            "altimeter_inhg": metar.altimeter_inhg,
+            "pressure_tendency": trend.get("pressure_tendency"),
+            "category_tendency": trend.get("category_tendency"),
+            "raw": metar.raw,
+        }
+
+    def briefing_sentence(self, station: str) -> Optional[str]:
+        """Spoken weather line for the shift briefing, or None without current data."""
+        code, metar = self._current_metar(station)
+        if metar is None:
+            return None
+
+        parts = [f"Weather is {metar.flight_category or 'not available'}"]
+        if metar.wind_speed_kt == 0:
+            parts.append("wind calm")
+        elif metar.wind_speed_kt is not None:
+            direction = "variable" if metar.wind_dir_deg is None else _spoken(f"{metar.wind_dir_deg:03d}")
+            wind = f"wind {direction} at {_spoken(metar.wind_speed_kt)}"
+            if metar.wind_gust_kt:
+                wind += f" gusting {_spoken(metar.wind_gust_kt)}"
+            parts.append(wind)
+        if metar.ceiling_ft is not None:
+            parts.append(f"ceiling {_spoken_height(metar.ceiling_ft)}")
+        if metar.weather:
+            parts.append(", ".join(describe_weather(group) for group in metar.weather))
+        if metar.altimeter_inhg is not None:
+            altimeter = f"altimeter {_spoken(f'{metar.altimeter_inhg:.2f}')}"
+            trend = self.trend(code) or {}
+            if trend.get("pressure_tendency") in ("rising", "falling"):
+                altimeter += f", {trend['pressure_tendency']}"
+            parts.append(altimeter)
+
+        sentence = ", ".join(parts) + ". "
+        outlook = self.outlook(code)
+        if outlook and outlook["category"] != metar.flight_category:
+            sentence += f"Forecast {outlook['category']} conditions within six hours. "
+        return sentence
+
+
+# Singleton instance
+_metar_store_instance: Optional[MetarStore] = None
+
+
+def get_metar_store() -> MetarStore:
+    """
+    Get or create METAR store singleton instance. Sources come from
+    METAR_SOURCES (comma-separated files or directories); the store stays
+    empty when it is unset.
+    """
+    global _metar_store_instance
+
+    if _metar_store_instance is None:
+        paths = [path.strip() for path in os.environ.get("METAR_SOURCES", "").split(",") if path.strip()]
+        _metar_store_instance = MetarStore(
+            [Path(path).expanduser() for path in paths],
+            capacity=int(os.environ.get("METAR_HISTORY", DEFAULT_HISTORY)),
+            poll_seconds=float(os.environ.get("METAR_POLL_SECONDS", DEFAULT_POLL_SECONDS)),
+        )
+        _metar_store_instance.load_sources()
+
+    return _metar_store_instance
@@ -0,0 +1,173 @@
+"""
+NOTAM catalog loading for the ODIN backend.
+
+Normalizing the seed file (uuid5 ids, condition parsing) is done once per
+source revision and cached in a compact binary file that later processes
+memory-map instead of re-parsing:
+
+    header   magic, format version, sha256 of the source, record count
+    offsets  (count + 1) little-endian uint64 byte offsets into the records
+    records  normalized NOTAMs as concatenated UTF-8 JSON documents
+
+Records are decoded on access, so opening a warm cache costs the same no
+matter how large the catalog is.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+from uuid import NAMESPACE_URL, uuid5
+
+from notam_parser import parse_condition
+
+
+logger = logging.getLogger(__name__)
+
+# Bump when normalize_notam output changes so stale caches are rebuilt
+CACHE_FORMAT_VERSION = 1
+_MAGIC = b"ODNC"
+_HEADER = struct.Struct("<4sI32sQ")
+_OFFSET = struct.Struct("<Q")
+
+
+def notam_key(item: Dict[str, str]) -> str:
+    """Identity key of a raw NOTAM record; its uuid5 is the NOTAM id."""
+    return f"{item.get('location','')}|{item.get('number','')}|{item.get('classification','')}|{item.get('condition','')}"
+
+
+def notam_id_for(item: Dict[str, str]) -> str:
+    return uuid5(NAMESPACE_URL, notam_key(item)).hex
+
+
+def normalize_notam(item: Dict[str, str], notam_id: Optional[str] = None) -> Dict[str, object]:
+    """Normalize a raw NOTAM record and extract its structured fields."""
+    condition = item.get("condition", "")
+    return {
+        "id": notam_id or notam_id_for(item),
+        "category": item.get("category", "Digital NOTAM"),
+        "location": item.get("location", "").upper(),
+        "number": item.get("number", "").upper(),
+        "classification": item.get("classification", "").title(),
+        "start": item.get("start", ""),
+        "end": item.get("end", ""),
+        "condition": condition,
+        **parse_condition(condition).to_fields(),
+    }
+
+
+def normalize_catalog(raw_items: List[Dict[str, str]]) -> List[Dict[str, object]]:
+    """Normalize raw seed records, keeping ids unique across duplicates."""
+    catalog: List[Dict[str, object]] = []
+    seen_ids: set[str] = set()
+
+    for item in raw_items:
+        notam_id = notam_id_for(item)
+
+        if notam_id in seen_ids:
+            # Ensure uniqueness by adding jitter to key if duplicate encountered
+            notam_id = uuid5(NAMESPACE_URL, notam_key(item) + f"|{len(seen_ids)}").hex
+        seen_ids.add(notam_id)
+
+        catalog.append(normalize_notam(item, notam_id))
+
+    return catalog
+
+
+class MappedCatalog(Sequence):
+    """Read-only sequence of NOTAM records decoded lazily from a mapped cache file."""
+
+    def __init__(self, path: Path):
+        with path.open("rb") as handle:
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, digest, count = _HEADER.unpack_from(self._map, 0)
+        if magic != _MAGIC or version != CACHE_FORMAT_VERSION:
+            self._map.close()
+            raise ValueError(f"{path} is not a version {CACHE_FORMAT_VERSION} NOTAM cache")
+        records_start = _HEADER.size + (count + 1) * _OFFSET.size
+        if len(self._map) < records_start or len(self._map) != records_start + _OFFSET.unpack_from(
+            self._map, records_start - _OFFSET.size
+        )[0]:
+            self._map.close()
+            raise ValueError(f"{path} is truncated")
+        self.source_digest: bytes = digest
+        self._count = count
+        self._offsets = memoryview(self._map)[_HEADER.size:records_start].cast("Q")
+        self._records_start = records_start
+
+    def __len__(self) -> int:
+        return self._count
+
+    def close(self) -> None:
+        self._offsets.release()
+        self._map.close()
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("NOTAM catalog index out of range")
+        start = self._records_start + self._offsets[index]
+        end = self._records_start + self._offsets[index + 1]
+        return json.loads(self._map[start:end])
+
+    def __iter__(self) -> Iterator[Dict[str, object]]:
+        for index in range(self._count):
+            yield self[index]
+
+
+def write_catalog_cache(path: Path, catalog: List[Dict[str, object]], source_digest: bytes) -> None:
+    """Write the binary cache atomically (temp file + rename)."""
+    records = [json.dumps(notam, separators=(",", ":")).encode("utf-8") for notam in catalog]
+    offsets = [0]
+    for record in records:
+        offsets.append(offsets[-1] + len(record))
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with temp_path.open("wb") as handle:
+        handle.write(_HEADER.pack(_MAGIC, CACHE_FORMAT_VERSION, source_digest, len(records)))
+        handle.write(struct.pack(f"<{len(offsets)}Q", *offsets))
+        handle.writelines(records)
+    os.replace(temp_path, path)
+
+
+def _cache_path_for(source: Path) -> Path:
+    cache_dir = os.environ.get("NOTAM_CACHE_DIR")
+    directory = Path(cache_dir) if cache_dir else source.parent / ".cache"
+    return directory / f"{source.stem}.bin"
+
+
+def load_catalog(source: Path, cache_path: Optional[Path] = None) -> Sequence:
+    """
+    Return the normalized catalog for `source`, served from the binary cache
+    when its recorded sha256 matches the source, else rebuilt and re-cached.
+    """
+    cache_path = cache_path or _cache_path_for(source)
+    raw_bytes = source.read_bytes()
+    digest = hashlib.sha256(raw_bytes).digest()
+
+    try:
+        cached = MappedCatalog(cache_path)
+        if cached.source_digest == digest:
+            return cached
+        cached.close()
+    except (OSError, ValueError, struct.error):
+        pass
+
+    catalog = normalize_catalog(json.loads(raw_bytes.decode("utf-8")))
+    try:
+        write_catalog_cache(cache_path, catalog, digest)
+        logger.info(f"Rebuilt NOTAM catalog cache at {cache_path} ({len(catalog)} records)")
+    except OSError as exc:
+        logger.warning(f"Could not write NOTAM catalog cache {cache_path}: {exc}")
+    return catalog
@@ -8,72 +8,119 @@ the frontend can poll for updates without relying on unavailable upstream APIs.
 from __future__ import annotations
 
 import asyncio
-import json
+import itertools
 import random
-from dataclasses import dataclass
+from collections import deque
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict, List, Optional
-from uuid import NAMESPACE_URL, uuid5
+from typing import Deque, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from notam_catalog import load_catalog
+from notam_index import NotamSearchIndex
+from notam_intervals import NotamIntervalIndex, effective_interval
+from notam_proximity import NotamAreaIndex
 
 
 DATA_PATH = Path(__file__).parent / "data" / "notams_seed.json"
 DEFAULT_TICK_SECONDS = 5.0
 DEFAULT_WINDOW_SIZE = 24
 INITIAL_BATCH = 12
+MAX_WAIT_SECONDS = 30.0
+# Change sets up to this size are applied to the live text index in one step
+# (a few milliseconds) next to a validity tree and area grid rebuilt off the
+# event loop; larger ones rebuild a fresh set of indexes there and swap it in.
+INCREMENTAL_APPLY_LIMIT = 100
 
 
-def _load_notam_catalog() -> List[Dict[str, str]]:
-    """Load and normalize the NOTAM seed data."""
-    raw_text = DATA_PATH.read_text(encoding="utf-8")
-    raw_items: List[Dict[str, str]] = json.loads(raw_text)
-
-    catalog: List[Dict[str, str]] = []
-    seen_ids: set[str] = set()
-
-    for item in raw_items:
-        key = f"{item.get('location','')}|{item.get('number','')}|{item.get('classification','')}|{item.get('condition','')}"
-        notam_id = uuid5(NAMESPACE_URL, key).hex
-
-        if notam_id in seen_ids:
-            # Ensure uniqueness by adding jitter to key if duplicate encountered
-            notam_id = uuid5(NAMESPACE_URL, key + f"|{len(seen_ids)}").hex
-        seen_ids.add(notam_id)
-
-        catalog.append(
-            {
-                "id": notam_id,
-                "category": item.get("category", "Digital NOTAM"),
-                "location": item.get("location", "").upper(),
-                "number": item.get("number", "").upper(),
-                "classification": item.get("classification", "").title(),
-                "start": item.get("start", ""),
-                "end": item.get("end", ""),
-                "condition": item.get("condition", ""),
-            }
-        )
+_catalog: Optional[Sequence] = None
 
-    return catalog
 
+def get_catalog() -> Sequence:
+    """Load the seed catalog on first use (from the binary cache when it is current)."""
+    global _catalog
+    if _catalog is None:
+        _catalog = load_catalog(DATA_PATH)
+    return _catalog
 
-CATALOG: List[Dict[str, str]] = _load_notam_catalog()
+
+def __getattr__(name: str):
+    # `CATALOG` used to be built at import time; keep it importable, but lazy.
+    if name == "CATALOG":
+        return get_catalog()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@dataclass
+class CatalogIndexes:
+    """Every lookup structure derived from the catalog, swapped as one unit."""
+
+    by_id: Dict[str, Dict[str, object]]
+    search: NotamSearchIndex
+    intervals: NotamIntervalIndex
+    areas: NotamAreaIndex
+
+    @classmethod
+    def build(cls, notams: Iterable[Dict[str, object]]) -> "CatalogIndexes":
+        indexes = cls({}, NotamSearchIndex(), NotamIntervalIndex(), NotamAreaIndex())
+        for notam in notams:
+            indexes.add(notam)
+        indexes.intervals.prepare()
+        indexes.areas.prepare()
+        return indexes
+
+    def add(self, notam: Dict[str, object]) -> None:
+        self.by_id[str(notam["id"])] = notam
+        self.search.add(notam)
+        self.intervals.add(notam)
+        self.areas.add(notam)
+
+    def remove(self, notam_id: str) -> None:
+        self.by_id.pop(notam_id, None)
+        self.search.remove(notam_id)
+        self.intervals.remove(notam_id)
+        self.areas.remove(notam_id)
+
+    def patched_geometry(
+        self, changes: Dict[str, Optional[Dict[str, object]]]
+    ) -> Tuple[NotamIntervalIndex, NotamAreaIndex]:
+        """Rebuilt copies of the interval tree and area grid with `changes` applied (worker thread)."""
+        intervals, areas = self.intervals.copy(), self.areas.copy()
+        for notam_id, notam in changes.items():
+            intervals.remove(notam_id)
+            areas.remove(notam_id)
+            if notam is not None:
+                intervals.add(notam)
+                areas.add(notam)
+        intervals.prepare()
+        areas.prepare()
+        return intervals, areas
+
+    def rebuilt(self, changes: Dict[str, Optional[Dict[str, object]]]) -> "CatalogIndexes":
+        """A fresh set of indexes over these records with `changes` applied (worker thread)."""
+        kept = (notam for notam_id, notam in self.by_id.items() if notam_id not in changes)
+        changed = (notam for notam in changes.values() if notam is not None)
+        return CatalogIndexes.build(itertools.chain(kept, changed))
 
 
 @dataclass
 class NotamEmission:
     """Represents an emitted NOTAM instance in the simulated feed."""
 
-    payload: Dict[str, str]
+    payload: Dict[str, object]
     emission: int
     received_at: datetime
+    _serialized: Optional[Dict[str, object]] = field(default=None, init=False, repr=False)
 
     def to_dict(self, latest_emission: int) -> Dict[str, object]:
-        return {
-            **self.payload,
-            "emission": self.emission,
-            "received_at": self.received_at.isoformat(),
-            "is_new": self.emission == latest_emission,
-        }
+        # The emission never changes once created, so serialize it only once.
+        if self._serialized is None:
+            self._serialized = {
+                **self.payload,
+                "emission": self.emission,
+                "received_at": self.received_at.isoformat(),
+            }
+        return {**self._serialized, "is_new": self.emission == latest_emission}
 
 
 class NotamEngine:
@@ -81,28 +128,45 @@ class NotamEngine:
 
     def __init__(
         self,
-        catalog: Optional[List[Dict[str, str]]] = None,
+        catalog: Optional[Sequence[Dict[str, object]]] = None,
         tick_seconds: float = DEFAULT_TICK_SECONDS,
         window_size: int = DEFAULT_WINDOW_SIZE,
         seed: int = 42,
     ) -> None:
         if catalog is None:
-            catalog = CATALOG
+            catalog = get_catalog()
 
         if not catalog:
             raise ValueError("NOTAM catalog is empty; cannot initialize engine.")
 
-        self._catalog = list(catalog)
+        # Kept as given: a mapped catalog decodes only the records that are emitted.
+        # Changes never rewrite it; they live in the overlay (id -> replacement,
+        # or None once cancelled) and in `_added` for new ids.
+        self._catalog: Sequence[Dict[str, object]] = catalog
+        self._overlay: Dict[str, Optional[Dict[str, object]]] = {}
+        self._added: List[Dict[str, object]] = []
         self._tick_seconds = tick_seconds
         self._window_size = max(5, window_size)
         self._lock = asyncio.Lock()
-        self._emissions: List[NotamEmission] = []
+        self._condition = asyncio.Condition(self._lock)
+        # Serializes catalog changes only; feed readers never wait on it
+        self._apply_lock = asyncio.Lock()
+        self._emissions: Deque[NotamEmission] = deque(maxlen=self._window_size)
         self._sequence = 0
         self._cursor = 0
         self._last_tick = datetime.now(timezone.utc)
 
+        # Built in a worker thread by warm(); building reads every record, so
+        # lookups made before it finishes get empty answers instead of waiting
+        self._indexes: Optional[CatalogIndexes] = None
+        self._warm_task: Optional[asyncio.Task] = None
+        self._empty_areas = NotamAreaIndex()
+
+        # Rotation order as positions in the catalog followed by `_added`, so the
+        # catalog itself is not copied
+        self._order = list(range(len(catalog)))
         rng = random.Random(seed)
-        rng.shuffle(self._catalog)
+        rng.shuffle(self._order)
 
         # Bootstrap the feed with an initial batch so the UI has content immediately.
         for _ in range(min(INITIAL_BATCH, len(self._catalog))):
@@ -119,6 +183,150 @@ class NotamEngine:
     def window_size(self) -> int:
         return self._window_size
 
+    @property
+    def ready(self) -> bool:
+        """Whether the search, validity and area indexes have been built."""
+        return self._indexes is not None
+
+    def _ready_indexes(self) -> Optional[CatalogIndexes]:
+        """The indexes, or None (starting the build) while they are not ready."""
+        if self._indexes is None:
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                # No event loop to stall (scripts, benchmarks): build right here
+                self._indexes = CatalogIndexes.build(self._catalog)
+            else:
+                self.warm()
+        return self._indexes
+
+    def warm(self) -> None:
+        """Start building the indexes in a worker thread (app startup)."""
+        if self._indexes is None and (self._warm_task is None or self._warm_task.done()):
+            self._warm_task = asyncio.create_task(self._warm())
+
+    async def _warm(self) -> None:
+        indexes = await asyncio.to_thread(CatalogIndexes.build, self._catalog)
+        if self._indexes is None:
+            self._indexes = indexes
+
+    async def wait_ready(self) -> None:
+        """Wait, without blocking the event loop, until the indexes are built."""
+        if self._indexes is None:
+            self.warm()
+            await asyncio.shield(self._warm_task)
+
+    @property
+    def area_index(self) -> NotamAreaIndex:
+        """NOTAM areas for proximity joins (empty until the indexes are ready)."""
+        indexes = self._ready_indexes()
+        return indexes.areas if indexes is not None else self._empty_areas
+
+    def get_notam(self, notam_id: str) -> Optional[Dict[str, object]]:
+        indexes = self._ready_indexes()
+        return indexes.by_id.get(notam_id) if indexes is not None else None
+
+    def is_active(self, notam_id: str, at: float) -> bool:
+        """Whether the NOTAM is in effect at `at` (epoch seconds); False until the indexes are ready."""
+        indexes = self._ready_indexes()
+        return indexes is not None and indexes.intervals.is_active(notam_id, at)
+
+    async def apply_changes(
+        self,
+        upserts: Iterable[Dict[str, object]] = (),
+        cancellations: Iterable[str] = (),
+    ) -> Dict[str, int]:
+        """
+        Insert/replace and cancel NOTAMs without restarting the engine.
+
+        Small change sets rebuild patched copies of the validity tree and area
+        grid in a worker thread, then update the text index and swap the copies
+        in without yielding to the event loop. Larger ones rebuild a complete
+        set of indexes in a worker thread while readers keep using the current
+        set, then swap it in with a single assignment. Either way readers never
+        see part of a batch, and never find an index left to rebuild.
+
+        Returns:
+            Counts of inserted, updated, unchanged and cancelled NOTAMs
+        """
+        # Changes are merged against the indexes, so the initial build must finish first
+        await self.wait_ready()
+        async with self._apply_lock:
+            return await self._apply_changes(upserts, cancellations)
+
+    async def _apply_changes(
+        self,
+        upserts: Iterable[Dict[str, object]],
+        cancellations: Iterable[str],
+    ) -> Dict[str, int]:
+        current = self._indexes
+        changes: Dict[str, Optional[Dict[str, object]]] = {}
+        stats = {"inserted": 0, "updated": 0, "unchanged": 0, "cancelled": 0}
+
+        for notam in upserts:
+            notam_id = str(notam["id"])
+            existing = changes.get(notam_id, current.by_id.get(notam_id))
+            if existing == notam:
+                stats["unchanged"] += 1
+                continue
+            stats["updated" if existing is not None else "inserted"] += 1
+            changes[notam_id] = notam
+        for notam_id in cancellations:
+            if changes.get(notam_id, current.by_id.get(notam_id)) is not None:
+                stats["cancelled"] += 1
+                changes[notam_id] = None
+
+        if not changes:
+            return stats
+
+        # Replacements and cancellations keep their place in the rotation (a
+        # cancelled entry is skipped when reached); new ids are appended to it
+        inserts = {
+            notam_id: notam for notam_id, notam in changes.items()
+            if notam is not None and notam_id not in self._overlay and notam_id not in current.by_id
+        }
+        if len(changes) > INCREMENTAL_APPLY_LIMIT:
+            self._indexes = await asyncio.to_thread(current.rebuilt, changes)
+        else:
+            intervals, areas = await asyncio.to_thread(current.patched_geometry, changes)
+            for notam_id, notam in changes.items():
+                current.by_id.pop(notam_id, None)
+                current.search.remove(notam_id)
+                if notam is not None:
+                    current.by_id[notam_id] = notam
+                    current.search.add(notam)
+            current.intervals = intervals
+            current.areas = areas
+
+        self._overlay.update(
+            (notam_id, notam) for notam_id, notam in changes.items() if notam_id not in inserts
+        )
+        for notam in inserts.values():
+            self._order.append(len(self._catalog) + len(self._added))
+            self._added.append(notam)
+        cancelled = {notam_id for notam_id, notam in changes.items() if notam is None}
+        if cancelled:
+            self._emissions = deque(
+                (emission for emission in self._emissions if emission.payload["id"] not in cancelled),
+                maxlen=self._window_size,
+            )
+        # Long-poll waiters re-check the cadence (the catalog may have been empty)
+        async with self._condition:
+            self._condition.notify_all()
+        return stats
+
+    def _record(self, position: int) -> Optional[Dict[str, object]]:
+        """Current version of the record at a rotation position (None once cancelled)."""
+        if position < len(self._catalog):
+            notam = self._catalog[position]
+        else:
+            notam = self._added[position - len(self._catalog)]
+        return self._overlay.get(str(notam["id"]), notam)
+
+    def _catalog_size(self) -> int:
+        indexes = self._indexes
+        return len(indexes.by_id) if indexes is not None else len(self._catalog) + len(self._added)
+
     def _emit_next(self, *, force: bool = False) -> None:
         """Activate the next NOTAM in the catalog and update the rolling window."""
         now = datetime.now(timezone.utc)
@@ -126,34 +334,132 @@ class NotamEngine:
         if not force and (now - self._last_tick).total_seconds() < self._tick_seconds:
             return
 
-        base = self._catalog[self._cursor]
-        self._cursor = (self._cursor + 1) % len(self._catalog)
+        if not self._catalog_size():
+            return
+
+        base = None
+        while base is None:
+            base = self._record(self._order[self._cursor])
+            self._cursor = (self._cursor + 1) % len(self._order)
 
         self._sequence += 1
         emission = NotamEmission(payload=dict(base), emission=self._sequence, received_at=now)
-        self._emissions.insert(0, emission)
-
-        if len(self._emissions) > self._window_size:
-            self._emissions.pop()
+        # Newest first; the bounded deque drops the oldest emission.
+        self._emissions.appendleft(emission)
 
         self._last_tick = now
 
-    async def get_feed(self) -> Dict[str, object]:
-        """Return the latest NOTAM feed snapshot."""
-        async with self._lock:
-            self._emit_next()
+    def _seconds_until_tick(self) -> float:
+        elapsed = (datetime.now(timezone.utc) - self._last_tick).total_seconds()
+        return max(0.0, self._tick_seconds - elapsed)
+
+    def _emit_due(self) -> None:
+        """Emit the next NOTAM if the cadence allows and wake long-poll waiters."""
+        sequence = self._sequence
+        self._emit_next()
+        if self._sequence != sequence:
+            self._condition.notify_all()
+
+    async def get_feed(
+        self,
+        since: Optional[int] = None,
+        wait_seconds: float = 0.0,
+        active_only: bool = False,
+    ) -> Dict[str, object]:
+        """
+        Return the latest NOTAM feed snapshot.
+
+        When `since` is given only emissions newer than that sequence are
+        returned. With `wait_seconds` > 0 and nothing new yet, the call blocks
+        until the next emission or the timeout, whichever comes first.
+        `active_only` drops NOTAMs whose effective interval has ended.
+        """
+        async with self._condition:
+            self._emit_due()
+            # A cursor ahead of this engine (e.g. from before a restart) is a reset
+            if since is not None and since > self._sequence:
+                since = None
+
+            if since is not None and wait_seconds > 0:
+                loop = asyncio.get_running_loop()
+                deadline = loop.time() + min(wait_seconds, MAX_WAIT_SECONDS)
+                while self._sequence <= since:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    # With nothing left to emit, only apply_changes can wake us
+                    timeout = min(remaining, self._seconds_until_tick()) if self._catalog_size() else remaining
+                    try:
+                        await asyncio.wait_for(self._condition.wait(), timeout=timeout)
+                    except asyncio.TimeoutError:
+                        pass
+                    self._emit_due()
+
             latest_emission = self._sequence
-            notams = [emission.to_dict(latest_emission) for emission in self._emissions]
+            oldest_emission = self._emissions[-1].emission if self._emissions else latest_emission
+            # A cursor older than the window cannot be served as a delta.
+            is_delta = since is not None and since >= oldest_emission - 1
+
+            now = datetime.now(timezone.utc).timestamp()
+            notams = []
+            for emission in self._emissions:
+                if is_delta and emission.emission <= since:
+                    break
+                # Read from the record itself so the feed never waits on the indexes
+                if active_only and not effective_interval(emission.payload).contains(now):
+                    continue
+                notams.append(emission.to_dict(latest_emission))
 
             return {
                 "notams": notams,
                 "sequence": latest_emission,
+                "is_delta": is_delta,
                 "last_updated": self._last_tick.isoformat(),
                 "cadence_seconds": self._tick_seconds,
-                "total_catalog": len(self._catalog),
+                "total_catalog": self._catalog_size(),
                 "window_size": self._window_size,
             }
 
+    def search(
+        self,
+        query: str = "",
+        location: Optional[str] = None,
+        classification: Optional[str] = None,
+        category: Optional[str] = None,
+        limit: int = 20,
+    ) -> Dict[str, object]:
+        """
+        Full-text and faceted search over the whole catalog (an empty result
+        with `indexing: true` until the indexes are ready).
+        """
+        indexes = self._ready_indexes()
+        if indexes is None:
+            return {"results": [], "total": 0, "facets": {}, "indexing": True}
+        return indexes.search.search(
+            query,
+            location=location,
+            classification=classification,
+            category=category,
+            limit=limit,
+        )
+
+    def active(self, at: Optional[float] = None, until: Optional[float] = None) -> List[Dict[str, object]]:
+        """
+        NOTAMs in effect at `at` (epoch seconds, defaults to now), or at any
+        point of [at, until] when `until` is given. Empty until the indexes
+        are ready.
+        """
+        if at is None:
+            at = datetime.now(timezone.utc).timestamp()
+        indexes = self._ready_indexes()
+        if indexes is None:
+            return []
+        if until is None:
+            ids = indexes.intervals.active_at(at)
+        else:
+            ids = indexes.intervals.active_during(at, until)
+        return [indexes.by_id[notam_id] for notam_id in ids]
+
     def reset(self) -> None:
         """Reset the engine and rebuild the rolling window."""
         self._emissions.clear()
@@ -161,7 +467,7 @@ class NotamEngine:
         self._cursor = 0
         self._last_tick = datetime.now(timezone.utc)
 
-        for _ in range(min(INITIAL_BATCH, len(self._catalog))):
+        for _ in range(min(INITIAL_BATCH, self._catalog_size())):
             self._emit_next(force=True)
 
         self._last_tick -= timedelta(seconds=self._tick_seconds * 0.6)
@@ -0,0 +1,265 @@
+"""
+In-memory NOTAM search index for the ODIN backend.
+
+Maintains an inverted index over NOTAM condition text (BM25 ranking) plus facet
+indexes on location, classification and category. Documents are added and
+removed incrementally as the catalog changes; queries are scored, ranked and
+faceted with numpy over per-document arrays rather than per posting in Python.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+
+FACETS = ("location", "classification", "category")
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+LOCATION_MATCH_BOOST = 1.5
+INITIAL_CAPACITY = 1024
+
+_TOKEN_RE = re.compile(r"[A-Z0-9]+")
+
+# Plain-language query words mapped onto the contractions NOTAMs use
+QUERY_ALIASES = {
+    "CLOSED": "CLSD", "CLOSURE": "CLSD", "CLOSURES": "CLSD", "CLOSE": "CLSD",
+    "RUNWAY": "RWY", "RUNWAYS": "RWY", "RWYS": "RWY",
+    "TAXIWAY": "TWY", "TAXIWAYS": "TWY", "TWYS": "TWY",
+    "OBSTACLE": "OBST", "OBSTACLES": "OBST", "OBSTRUCTION": "OBST",
+    "CRANES": "CRANE", "TOWERS": "TOWER",
+    "LIGHT": "LGT", "LIGHTS": "LGT", "LIGHTING": "LGT", "LIGHTED": "LGTD",
+    "APPROACH": "APCH", "DRONE": "UAS", "DRONES": "UAS",
+}
+STOPWORDS = {"A", "AN", "AND", "AT", "FOR", "IN", "NEAR", "OF", "ON", "THE", "TO", "WITH", "ANY", "ALL"}
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into upper-case alphanumeric tokens."""
+    return _TOKEN_RE.findall(text.upper())
+
+
+def _normalize_location(code: str) -> str:
+    code = code.upper()
+    return code[1:] if len(code) == 4 and code.startswith("K") else code
+
+
+class NotamSearchIndex:
+    """
+    Inverted text index plus facet indexes over NOTAM records.
+
+    Each document holds an integer slot (reused after removal). Document
+    lengths and facet value codes are kept per slot in numpy arrays, and a
+    term's postings are packed into slot/frequency arrays the first time a
+    query needs them after they change.
+    """
+
+    def __init__(self) -> None:
+        # term -> slot -> term frequency
+        self._postings: Dict[str, Dict[int, int]] = defaultdict(dict)
+        self._packed: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._doc_tokens: Dict[int, Counter] = {}
+        self._total_length = 0
+        self._docs: Dict[str, Dict[str, object]] = {}
+        self._slots: Dict[str, int] = {}
+        self._ids: List[Optional[str]] = []
+        self._free: List[int] = []
+        self._lengths = np.zeros(INITIAL_CAPACITY)
+        self._live = np.zeros(INITIAL_CAPACITY, dtype=bool)
+        # Facet values are coded as small integers, in order of first appearance
+        self._facet_codes = {name: np.zeros(INITIAL_CAPACITY, dtype=np.int32) for name in FACETS}
+        self._facet_values: Dict[str, List[str]] = {name: [] for name in FACETS}
+        self._facet_lookup: Dict[str, Dict[str, int]] = {name: {} for name in FACETS}
+        self._facet_counts: Dict[str, Counter] = {name: Counter() for name in FACETS}
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def __contains__(self, notam_id: str) -> bool:
+        return notam_id in self._docs
+
+    def _allocate(self) -> int:
+        if self._free:
+            return self._free.pop()
+        slot = len(self._ids)
+        self._ids.append(None)
+        if slot == len(self._lengths):
+            capacity = 2 * len(self._lengths)
+            self._lengths = np.resize(self._lengths, capacity)
+            self._live = np.resize(self._live, capacity)
+            self._live[slot:] = False
+            for name in FACETS:
+                self._facet_codes[name] = np.resize(self._facet_codes[name], capacity)
+        return slot
+
+    def add(self, notam: Dict[str, object]) -> None:
+        """Index a NOTAM, replacing any previous version with the same id."""
+        notam_id = str(notam["id"])
+        if notam_id in self._docs:
+            self.remove(notam_id)
+        slot = self._allocate()
+
+        text = " ".join(str(notam.get(name, "")) for name in ("condition", "number", "classification"))
+        counts = Counter(tokenize(text))
+        for token, count in counts.items():
+            self._postings[token][slot] = count
+            self._packed.pop(token, None)
+        self._doc_tokens[slot] = counts
+        length = sum(counts.values())
+        self._lengths[slot] = length
+        self._total_length += length
+        self._live[slot] = True
+
+        for name in FACETS:
+            value = self._facet_value(name, notam)
+            lookup = self._facet_lookup[name]
+            code = lookup.get(value)
+            if code is None:
+                code = lookup[value] = len(self._facet_values[name])
+                self._facet_values[name].append(value)
+            self._facet_codes[name][slot] = code
+            self._facet_counts[name][value] += 1
+
+        self._slots[notam_id] = slot
+        self._ids[slot] = notam_id
+        self._docs[notam_id] = notam
+
+    def add_many(self, notams: Iterable[Dict[str, object]]) -> None:
+        for notam in notams:
+            self.add(notam)
+
+    def remove(self, notam_id: str) -> None:
+        """Drop a NOTAM from every index."""
+        notam = self._docs.pop(notam_id, None)
+        if notam is None:
+            return
+        slot = self._slots.pop(notam_id)
+
+        for token in self._doc_tokens.pop(slot):
+            postings = self._postings[token]
+            postings.pop(slot, None)
+            self._packed.pop(token, None)
+            if not postings:
+                del self._postings[token]
+        self._total_length -= int(self._lengths[slot])
+        self._live[slot] = False
+        self._ids[slot] = None
+        self._free.append(slot)
+
+        for name in FACETS:
+            counts = self._facet_counts[name]
+            value = self._facet_value(name, notam)
+            counts[value] -= 1
+            if counts[value] <= 0:
+                del counts[value]
+
+    @staticmethod
+    def _facet_value(name: str, notam: Dict[str, object]) -> str:
+        value = str(notam.get(name, "")).upper()
+        return _normalize_location(value) if name == "location" else value
+
+    def _term_postings(self, term: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """(slots, term frequencies) for a term, packed on first use after a change."""
+        packed = self._packed.get(term)
+        if packed is None:
+            postings = self._postings.get(term)
+            if not postings:
+                return None
+            packed = (
+                np.fromiter(postings.keys(), dtype=np.int64, count=len(postings)),
+                np.fromiter(postings.values(), dtype=np.float64, count=len(postings)),
+            )
+            self._packed[term] = packed
+        return packed
+
+    def _query_terms(self, query: str) -> Tuple[List[str], Set[str]]:
+        """Return (text terms, location codes mentioned in the query)."""
+        terms: List[str] = []
+        locations: Set[str] = set()
+        known_locations = self._facet_counts["location"]
+        for token in tokenize(query):
+            if token in STOPWORDS:
+                continue
+            location = _normalize_location(token)
+            if location in known_locations:
+                locations.add(location)
+            terms.append(QUERY_ALIASES.get(token, token))
+        return terms, locations
+
+    def search(
+        self,
+        query: str = "",
+        location: Optional[str] = None,
+        classification: Optional[str] = None,
+        category: Optional[str] = None,
+        limit: int = 20,
+    ) -> Dict[str, object]:
+        """
+        Rank NOTAMs matching the query text within the selected facets.
+
+        Returns:
+            Dict with ranked `results` (NOTAM plus `score`), `total` matches and
+            per-facet counts over the matching set
+        """
+        size = len(self._ids)
+        selected = self._live[:size].copy()
+        for name, value in (("location", location), ("classification", classification), ("category", category)):
+            if not value:
+                continue
+            key = _normalize_location(value) if name == "location" else value.upper()
+            code = self._facet_lookup[name].get(key)
+            if code is None:
+                selected[:] = False
+            else:
+                selected &= self._facet_codes[name][:size] == code
+
+        terms, query_locations = self._query_terms(query or "")
+        scores = np.zeros(size)
+
+        if terms:
+            doc_count = len(self._docs) or 1
+            avg_length = self._total_length / doc_count
+            matched = np.zeros(size, dtype=bool)
+            for term in terms:
+                packed = self._term_postings(term)
+                if packed is None:
+                    continue
+                slots, tf = packed
+                idf = math.log(1 + (doc_count - len(slots) + 0.5) / (len(slots) + 0.5))
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self._lengths[slots] / avg_length)
+                scores[slots] += idf * tf * (BM25_K1 + 1) / (tf + norm)
+                matched[slots] = True
+            selected &= matched
+
+            # "crane near SFO": a location in the query boosts NOTAMs filed there
+            for code in query_locations:
+                filed_there = self._facet_codes["location"][:size] == self._facet_lookup["location"][code]
+                scores[selected & filed_there] += LOCATION_MATCH_BOOST
+
+        hits = np.flatnonzero(selected)
+        limit = max(0, limit)
+        top = hits
+        if limit < len(hits):
+            top = hits[np.argpartition(-scores[hits], limit - 1)[:limit]] if limit else hits[:0]
+        # Highest score first, earlier slots first among ties
+        top = top[np.lexsort((top, -scores[top]))]
+
+        facets: Dict[str, Dict[str, int]] = {}
+        for name in FACETS:
+            counts = np.bincount(self._facet_codes[name][hits])
+            values = self._facet_values[name]
+            facets[name] = {values[code]: int(counts[code]) for code in np.flatnonzero(counts)}
+
+        return {
+            "results": [
+                {**self._docs[self._ids[slot]], "score": round(float(scores[slot]), 4)}
+                for slot in top
+            ],
+            "total": len(hits),
+            "facets": facets,
+        }
@@ -0,0 +1,430 @@
+"""
+Streaming NOTAM ingest for the ODIN backend.
+
+Sources stream raw NOTAM records in bounded batches from a JSON snapshot file,
+an append-only JSONL file or a drop-box directory. Records are normalized and
+keyed with the same uuid5 ids as the seed catalog, and applied to the engine
+as incremental inserts and cancellations by a background task.
+
+A record is a raw NOTAM object as in `data/notams_seed.json`. A record with
+`"action": "cancel"` removes the NOTAM named by its `id` or, failing that, by
+the same location/number/classification/condition key used to derive ids.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import re
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from notam_catalog import normalize_notam, notam_id_for
+from notam_engine import NotamEngine, get_notam_engine
+
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 5000
+# Batches are coalesced up to this many changes before being applied, so a
+# large load costs a few index rebuilds rather than one per batch
+MAX_PENDING_CHANGES = 50000
+DEFAULT_POLL_SECONDS = 5.0
+# JSON files are read and decoded this many characters at a time
+READ_CHUNK_SIZE = 1 << 16
+PROCESSED_DIR_NAME = "processed"
+FAILED_DIR_NAME = "failed"
+
+_NUMBER_TAIL_RE = re.compile(r"[0-9.eE+-]*")
+
+
+class NotamBatch:
+    """
+    Normalized changes read from a source, keyed by NOTAM id. A later record
+    for the same id replaces an earlier one, so an insert followed by a
+    cancellation (or the reverse) resolves to whichever came last.
+    """
+
+    def __init__(self) -> None:
+        self.changes: Dict[str, Optional[Dict[str, object]]] = {}
+
+    def __len__(self) -> int:
+        return len(self.changes)
+
+    @property
+    def upserts(self) -> List[Dict[str, object]]:
+        return [notam for notam in self.changes.values() if notam is not None]
+
+    @property
+    def cancellations(self) -> List[str]:
+        return [notam_id for notam_id, notam in self.changes.items() if notam is None]
+
+    def add(self, record: Dict[str, object]) -> None:
+        if str(record.get("action", "")).lower() == "cancel":
+            self.changes[str(record.get("id") or notam_id_for(record))] = None
+        elif record.get("condition"):
+            notam = normalize_notam(record)
+            self.changes[str(notam["id"])] = notam
+        else:
+            logger.warning(f"Skipping NOTAM record without a condition: {str(record)[:80]}")
+
+    def merge(self, other: "NotamBatch") -> None:
+        for notam_id, notam in other.changes.items():
+            # Re-insert so the merged order follows arrival order
+            self.changes.pop(notam_id, None)
+            self.changes[notam_id] = notam
+
+
+def _batches(records: Iterable[Dict[str, object]], size: int = BATCH_SIZE) -> Iterator[NotamBatch]:
+    """Group records into batches of at most `size`, skipping malformed ones."""
+    iterator = iter(records)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        batch = NotamBatch()
+        for record in chunk:
+            if isinstance(record, dict):
+                batch.add(record)
+        yield batch
+
+
+def _iter_jsonl(handle) -> Iterator[Dict[str, object]]:
+    for line_number, line in enumerate(handle, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError:
+            logger.warning(f"Skipping malformed NOTAM record at {getattr(handle, 'name', '?')}:{line_number}")
+
+
+class _JsonReader:
+    """
+    Incremental reader over a file holding one JSON document: values are
+    decoded one at a time from a sliding buffer, so a large array is never
+    held in memory whole.
+    """
+
+    _decoder = json.JSONDecoder()
+
+    def __init__(self, handle, chunk_size: int = READ_CHUNK_SIZE):
+        self._handle = handle
+        self._chunk_size = chunk_size
+        self._buffer = ""
+        self._pos = 0
+
+    def _fill(self) -> bool:
+        chunk = self._handle.read(self._chunk_size)
+        if not chunk:
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character, or "" at end of file."""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in " \t\r\n":
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, chars: str) -> str:
+        """Consume the next character, which must be one of `chars`."""
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError(f"Expected one of {chars!r} in JSON file, found {char!r}")
+        self._pos += 1
+        return char
+
+    def value(self) -> object:
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                # Incomplete value: read more, or give up at end of file
+                if not self._fill():
+                    raise
+                continue
+            # A number running to the end of the buffer may continue in the next chunk
+            if _NUMBER_TAIL_RE.match(self._buffer, end).end() == len(self._buffer) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def array(self) -> Iterator[object]:
+        self.expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.expect(",]") == "]":
+                return
+
+
+def _iter_json(handle) -> Iterator[Dict[str, object]]:
+    """Stream records from a JSON array, a {"notams": [...]} object or a single record."""
+    reader = _JsonReader(handle)
+    if reader.peek() == "[":
+        yield from reader.array()
+        return
+
+    reader.expect("{")
+    record: Dict[str, object] = {}
+    streamed = False
+    if reader.peek() == "}":
+        reader.expect("}")
+    else:
+        while True:
+            key = reader.value()
+            reader.expect(":")
+            if key == "notams" and reader.peek() == "[":
+                streamed = True
+                yield from reader.array()
+            else:
+                record[str(key)] = reader.value()
+            if reader.expect(",}") == "}":
+                break
+    if not streamed:
+        yield record
+
+
+def _iter_file(path: Path) -> Iterator[Dict[str, object]]:
+    """Stream records from a .jsonl file or a .json array/object file."""
+    with path.open("r", encoding="utf-8") as handle:
+        if path.suffix == ".jsonl":
+            yield from _iter_jsonl(handle)
+        else:
+            yield from _iter_json(handle)
+
+
+class NotamSource:
+    """Base class: `poll` yields the batches that arrived since the last poll."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    @property
+    def name(self) -> str:
+        return f"{type(self).__name__}({self.path})"
+
+    def poll(self) -> Iterator[NotamBatch]:
+        raise NotImplementedError
+
+
+class JsonSnapshotSource(NotamSource):
+    """
+    A file holding the complete NOTAM set (seed format or JSONL, streamed in
+    batches either way). Whenever it changes, its records are upserted and
+    NOTAMs it previously supplied but no longer lists are cancelled; a file
+    that fails to parse part-way leaves the previous set in place and is read
+    again on the next poll.
+    """
+
+    def __init__(self, path: Path):
+        super().__init__(path)
+        self._signature: Optional[Tuple[int, int]] = None
+        self._ids: Set[str] = set()
+
+    def poll(self) -> Iterator[NotamBatch]:
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature == self._signature:
+            return
+
+        seen: Set[str] = set()
+        for batch in _batches(_iter_file(self.path)):
+            seen.update(str(notam["id"]) for notam in batch.upserts)
+            yield batch
+
+        removed = NotamBatch()
+        removed.changes = dict.fromkeys(self._ids - seen)
+        if removed:
+            yield removed
+        self._ids = seen
+        self._signature = signature
+
+
+class JsonlTailSource(NotamSource):
+    """
+    An append-only JSONL stream, read incrementally from the last offset.
+    Truncation or replacement of the file restarts from the beginning.
+    """
+
+    def __init__(self, path: Path):
+        super().__init__(path)
+        self._inode: Optional[int] = None
+        self._offset = 0
+
+    def _read_lines(self) -> Iterator[Dict[str, object]]:
+        with self.path.open("r", encoding="utf-8") as handle:
+            handle.seek(self._offset)
+            while True:
+                line = handle.readline()
+                if not line.endswith("\n"):
+                    # Partial trailing line: the writer has not finished it yet
+                    break
+                self._offset = handle.tell()
+                yield from _iter_jsonl([line])
+
+    def poll(self) -> Iterator[NotamBatch]:
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return
+        if stat.st_ino != self._inode or stat.st_size < self._offset:
+            self._inode = stat.st_ino
+            self._offset = 0
+        if stat.st_size == self._offset:
+            return
+        yield from _batches(self._read_lines())
+
+
+class DropboxSource(NotamSource):
+    """
+    A directory where *.json / *.jsonl files are dropped. Each file is applied
+    once, in name order, then moved into `processed/` (or `failed/` if it could
+    not be read).
+    """
+
+    def poll(self) -> Iterator[NotamBatch]:
+        if not self.path.is_dir():
+            return
+        for file_path in sorted(self.path.iterdir()):
+            if not file_path.is_file() or file_path.suffix not in (".json", ".jsonl"):
+                continue
+            target = self.path / PROCESSED_DIR_NAME
+            try:
+                yield from _batches(_iter_file(file_path))
+            except (OSError, ValueError) as exc:
+                logger.error(f"Failed to ingest NOTAM file {file_path}: {exc}")
+                target = self.path / FAILED_DIR_NAME
+            target.mkdir(exist_ok=True)
+            file_path.replace(target / file_path.name)
+
+
+def source_for_path(path: str) -> NotamSource:
+    """
+    Pick the source type from a path: a directory is a drop-box, `.jsonl` an
+    append-only stream and anything else a snapshot. A `snapshot:` prefix
+    treats a `.jsonl` file as a snapshot instead.
+    """
+    snapshot = path.startswith("snapshot:")
+    resolved = Path(path[len("snapshot:"):] if snapshot else path).expanduser()
+    if resolved.is_dir():
+        return DropboxSource(resolved)
+    if resolved.suffix == ".jsonl" and not snapshot:
+        return JsonlTailSource(resolved)
+    return JsonSnapshotSource(resolved)
+
+
+class NotamIngestor:
+    """Polls sources in the background and applies their batches to the engine."""
+
+    def __init__(
+        self,
+        engine: NotamEngine,
+        sources: List[NotamSource],
+        poll_seconds: float = DEFAULT_POLL_SECONDS,
+    ):
+        self.engine = engine
+        self.sources = sources
+        self.poll_seconds = poll_seconds
+        self._task: Optional[asyncio.Task] = None
+
+    async def poll_once(self) -> Dict[str, int]:
+        """
+        Drain every source once. Files are read and normalized in a worker
+        thread one batch at a time; batches are coalesced up to
+        MAX_PENDING_CHANGES before being applied to the engine.
+        """
+        totals = {"inserted": 0, "updated": 0, "unchanged": 0, "cancelled": 0}
+
+        async def flush(pending: NotamBatch) -> None:
+            if pending:
+                stats = await self.engine.apply_changes(pending.upserts, pending.cancellations)
+                for key, value in stats.items():
+                    totals[key] += value
+
+        for source in self.sources:
+            batches = source.poll()
+            pending = NotamBatch()
+            while True:
+                try:
+                    batch = await asyncio.to_thread(next, batches, None)
+                except (OSError, ValueError) as exc:
+                    logger.error(f"NOTAM source {source.name} failed: {exc}")
+                    break
+                if batch is None:
+                    break
+                pending.merge(batch)
+                if len(pending) >= MAX_PENDING_CHANGES:
+                    await flush(pending)
+                    pending = NotamBatch()
+            await flush(pending)
+
+        if totals["inserted"] or totals["updated"] or totals["cancelled"]:
+            logger.info(
+                f"NOTAM ingest: +{totals['inserted']} ~{totals['updated']} -{totals['cancelled']}"
+            )
+        return totals
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.poll_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # noqa: BLE001
+                logger.error(f"NOTAM ingest poll failed: {exc}")
+            await asyncio.sleep(self.poll_seconds)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Singleton instance
+_ingestor_instance: Optional[NotamIngestor] = None
+
+
+def get_notam_ingestor() -> Optional[NotamIngestor]:
+    """
+    Get or create the ingestor singleton from NOTAM_SOURCES (comma-separated
+    paths). Returns None when no sources are configured.
+    """
+    global _ingestor_instance
+
+    if _ingestor_instance is None:
+        paths = [path.strip() for path in os.environ.get("NOTAM_SOURCES", "").split(",") if path.strip()]
+        if not paths:
+            return None
+
+        _ingestor_instance = NotamIngestor(
+            get_notam_engine(),
+            [source_for_path(path) for path in paths],
+            poll_seconds=float(os.environ.get("NOTAM_POLL_SECONDS", DEFAULT_POLL_SECONDS)),
+        )
+
+    return _ingestor_instance
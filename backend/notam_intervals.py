@@ -0,0 +1,212 @@
+"""
+NOTAM effective-time index for the ODIN backend.
+
+Parses the catalog's `start` / `end` strings ("08/21/2025 1704", "PERM",
+"08/21/2027 1704EST") into epoch intervals once, and keeps them in a centered
+interval tree so "active at T" and "active during [T1, T2]" are answered in
+O(log n + k) instead of scanning the catalog.
+"""
+
+from __future__ import annotations
+
+import calendar
+import math
+import re
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+
+PERMANENT = math.inf
+_STAMP_RE = re.compile(r"(\d{1,2})/(\d{1,2})/(\d{4}) (\d{2})(\d{2})$")
+
+
+def parse_effective_time(value: str) -> Tuple[Optional[float], bool]:
+    """
+    Parse a NOTAM start/end string.
+
+    Returns:
+        Tuple of (epoch seconds, estimated flag). PERM maps to +inf; blank or
+        unparseable values return None.
+    """
+    text = (value or "").strip().upper()
+    if not text:
+        return None, False
+    if text == "PERM":
+        return PERMANENT, False
+
+    estimated = text.endswith("EST")
+    if estimated:
+        text = text[:-3].rstrip()
+
+    # Hand-rolled instead of strptime, which dominates bulk catalog loads
+    match = _STAMP_RE.match(text)
+    if match is None:
+        return None, estimated
+    month, day, year, hour, minute = (int(part) for part in match.groups())
+    if not (1 <= month <= 12 and 1 <= day <= calendar.monthrange(year, month)[1]
+            and hour <= 24 and minute < 60):
+        return None, estimated
+    # timegm normalizes hour 24 to midnight of the next day
+    return float(calendar.timegm((year, month, day, hour, minute, 0))), estimated
+
+
+@dataclass(frozen=True)
+class EffectiveInterval:
+    """Closed effective interval of a NOTAM in epoch seconds."""
+
+    start: float
+    end: float
+    end_estimated: bool = False
+
+    def contains(self, timestamp: float) -> bool:
+        return self.start <= timestamp <= self.end
+
+
+def effective_interval(notam: Dict[str, object]) -> EffectiveInterval:
+    """A NOTAM's effective interval; unknown bounds are open-ended."""
+    start, _ = parse_effective_time(str(notam.get("start", "")))
+    end, estimated = parse_effective_time(str(notam.get("end", "")))
+    start = -math.inf if start is None else start
+    end = PERMANENT if end is None else end
+    # A record ending before it starts is clamped to its start instant
+    return EffectiveInterval(start=start, end=max(start, end), end_estimated=estimated)
+
+
+class _Node:
+    """Centered interval tree node: intervals spanning `center`, sorted both ways."""
+
+    __slots__ = ("center", "starts", "by_start", "neg_ends", "by_end", "left", "right")
+
+    def __init__(self, center: float, spanning: List[Tuple[float, float, str]]):
+        self.center = center
+        ordered = sorted(spanning, key=lambda item: item[0])
+        self.starts = [item[0] for item in ordered]
+        self.by_start = [item[2] for item in ordered]
+        # Ends are stored negated so bisect can walk them in descending order
+        ordered = sorted(spanning, key=lambda item: -item[1])
+        self.neg_ends = [-item[1] for item in ordered]
+        self.by_end = [item[2] for item in ordered]
+        self.left: Optional[_Node] = None
+        self.right: Optional[_Node] = None
+
+
+def _build(items: List[Tuple[float, float, str]]) -> Optional[_Node]:
+    if not items:
+        return None
+
+    endpoints = sorted(value for start, end, _ in items for value in (start, end) if math.isfinite(value))
+    center = endpoints[len(endpoints) // 2] if endpoints else 0.0
+
+    left: List[Tuple[float, float, str]] = []
+    right: List[Tuple[float, float, str]] = []
+    spanning: List[Tuple[float, float, str]] = []
+    for item in items:
+        if item[1] < item[0]:
+            # Empty interval: contains no timestamp, and could never be split off
+            continue
+        if item[1] < center:
+            left.append(item)
+        elif item[0] > center:
+            right.append(item)
+        else:
+            spanning.append(item)
+
+    node = _Node(center, spanning)
+    node.left = _build(left)
+    node.right = _build(right)
+    return node
+
+
+class NotamIntervalIndex:
+    """
+    Interval tree over NOTAM effective times.
+
+    Adds and removes are O(1) and mark the tree dirty; it is rebuilt on the
+    next query, so bursts of catalog changes cost a single rebuild.
+    """
+
+    def __init__(self) -> None:
+        self._intervals: Dict[str, EffectiveInterval] = {}
+        self._root: Optional[_Node] = None
+        self._dirty = False
+
+    def __len__(self) -> int:
+        return len(self._intervals)
+
+    def add(self, notam: Dict[str, object]) -> EffectiveInterval:
+        """Index a NOTAM by its `start` / `end` strings, replacing any previous entry."""
+        interval = effective_interval(notam)
+        self._intervals[str(notam["id"])] = interval
+        self._dirty = True
+        return interval
+
+    def remove(self, notam_id: str) -> None:
+        if self._intervals.pop(notam_id, None) is not None:
+            self._dirty = True
+
+    def get(self, notam_id: str) -> Optional[EffectiveInterval]:
+        return self._intervals.get(notam_id)
+
+    def copy(self) -> "NotamIntervalIndex":
+        """Independent copy that shares the built tree until either side changes."""
+        clone = NotamIntervalIndex()
+        clone._intervals = dict(self._intervals)
+        clone._root = self._root
+        clone._dirty = self._dirty
+        return clone
+
+    def is_active(self, notam_id: str, timestamp: float) -> bool:
+        """O(1) check for a single NOTAM; unknown ids count as active."""
+        interval = self._intervals.get(notam_id)
+        return interval is None or interval.contains(timestamp)
+
+    def prepare(self) -> None:
+        """Rebuild the tree now if it is dirty, e.g. from a worker thread."""
+        self._tree()
+
+    def _tree(self) -> Optional[_Node]:
+        if self._dirty:
+            self._root = _build([
+                (interval.start, interval.end, notam_id)
+                for notam_id, interval in self._intervals.items()
+            ])
+            self._dirty = False
+        return self._root
+
+    def active_at(self, timestamp: float) -> List[str]:
+        """Ids of NOTAMs in effect at `timestamp`."""
+        result: List[str] = []
+        node = self._tree()
+        while node is not None:
+            if timestamp < node.center:
+                result.extend(node.by_start[:bisect_right(node.starts, timestamp)])
+                node = node.left
+            else:
+                result.extend(node.by_end[:bisect_right(node.neg_ends, -timestamp)])
+                node = node.right
+        return result
+
+    def active_during(self, start: float, end: float) -> List[str]:
+        """Ids of NOTAMs in effect at any point of [start, end]."""
+        if end < start:
+            start, end = end, start
+
+        result: List[str] = []
+        stack = [self._tree()]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            if end < node.center:
+                result.extend(node.by_start[:bisect_right(node.starts, end)])
+                stack.append(node.left)
+            elif start > node.center:
+                result.extend(node.by_end[:bisect_right(node.neg_ends, -start)])
+                stack.append(node.right)
+            else:
+                # Every interval here spans the center, which lies inside the window
+                result.extend(node.by_start)
+                stack.append(node.left)
+                stack.append(node.right)
+        return result
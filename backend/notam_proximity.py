@@ -0,0 +1,412 @@
+"""
+Spatial NOTAM-to-aircraft proximity matching for ODIN ATC Console.
+Turns NOTAMs into circular areas (parsed coordinates and radii, falling back to
+airport reference points for aerodrome NOTAMs), buckets them in a uniform
+grid, and joins each air-picture snapshot against that grid in one batch to
+flag aircraft inside or projected to enter a NOTAM area.
+"""
+
+import copy
+import math
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from aircraft_simulator import BAY_AREA_AIRPORTS
+from air_snapshot import AirSnapshot, METERS_PER_DEG_LAT, METERS_PER_NM, METERS_TO_FEET
+from atc_facilities import ATC_FACILITIES
+
+
+# Point obstructions without a published radius get a small protection circle;
+# aerodrome NOTAMs with no coordinates at all cover the airport's tower radius.
+OBSTACLE_RADIUS_NM = 0.5
+DEFAULT_AIRPORT_RADIUS_NM = 5.0
+# Only these subjects fall back to the airport circle; procedure, navaid and
+# administrative NOTAMs without geometry are not located
+AIRPORT_AREA_SUBJECTS = {"RWY", "TWY", "AD", "APRON"}
+# Vertical extent above a charted obstacle top that still counts as a conflict
+OBSTACLE_CLEARANCE_FT = 1000.0
+# Airport-wide NOTAMs without a vertical limit are bounded like Class D airspace
+AIRPORT_AREA_CEILING_AGL_FT = 2500.0
+
+GRID_CELL_NM = 5.0
+APPROACH_LOOKAHEAD_SECONDS = 120.0
+
+
+def _reference_points() -> Dict[str, Dict[str, float]]:
+    """Airport reference points keyed by both ICAO (KSFO) and FAA (SFO) codes."""
+    points: Dict[str, Dict[str, float]] = {}
+    for facility in ATC_FACILITIES:
+        if facility["type"] != "tower":
+            continue
+        points[facility["id"]] = {
+            "lat": facility["lat"],
+            "lon": facility["lon"],
+            "radius_nm": float(facility["coverage_nm"]),
+            "elevation_ft": float(facility["elevation_ft"]),
+        }
+    for code, airport in BAY_AREA_AIRPORTS.items():
+        points.setdefault(code, {
+            "lat": airport["lat"],
+            "lon": airport["lon"],
+            "radius_nm": DEFAULT_AIRPORT_RADIUS_NM,
+            "elevation_ft": 0.0,
+        })
+    for code in list(points):
+        if len(code) == 4 and code.startswith("K"):
+            points.setdefault(code[1:], points[code])
+    return points
+
+
+@dataclass
+class NotamArea:
+    """Circular horizontal extent and vertical band of a NOTAM."""
+
+    notam_id: str
+    latitude: float
+    longitude: float
+    radius_nm: float
+    floor_ft: float
+    ceiling_ft: float
+    source: str
+
+
+def notam_area(notam: Dict[str, Any], references: Dict[str, Dict[str, float]]) -> Optional[NotamArea]:
+    """
+    Derive the area covered by a NOTAM, or None if it cannot be located.
+
+    Position comes from parsed coordinates, else an offset from a reference
+    airport ("1.2NM NNW SFO"), else, for runway, taxiway, apron and aerodrome
+    NOTAMs, the reference point of its location code.
+    """
+    reference = references.get(str(notam.get("location", "")).upper())
+    latitude = notam.get("latitude")
+    longitude = notam.get("longitude")
+    source = "coordinates"
+
+    if latitude is None or longitude is None:
+        offset_reference = references.get(str(notam.get("offset_reference") or "").upper())
+        offset_nm = notam.get("offset_nm")
+        bearing = notam.get("offset_bearing")
+        if offset_reference and offset_nm is not None and bearing is not None:
+            angle = math.radians(bearing)
+            distance_m = offset_nm * METERS_PER_NM
+            latitude = offset_reference["lat"] + distance_m * math.cos(angle) / METERS_PER_DEG_LAT
+            longitude = offset_reference["lon"] + distance_m * math.sin(angle) / (
+                METERS_PER_DEG_LAT * math.cos(math.radians(offset_reference["lat"]))
+            )
+            source = "offset"
+        elif reference and notam.get("subject") in AIRPORT_AREA_SUBJECTS:
+            latitude = reference["lat"]
+            longitude = reference["lon"]
+            source = "airport"
+        else:
+            return None
+
+    radius_nm = notam.get("radius_nm")
+    if radius_nm is None:
+        if source == "airport":
+            radius_nm = reference["radius_nm"]
+        else:
+            radius_nm = OBSTACLE_RADIUS_NM
+
+    elevation_ft = reference["elevation_ft"] if reference else 0.0
+    floor_ft = float(notam.get("lower_ft") or 0.0)
+    if notam.get("upper_ft") is not None:
+        ceiling_ft = float(notam["upper_ft"]) + (elevation_ft if notam.get("upper_is_agl") else 0.0)
+    elif notam.get("height_msl_ft") is not None:
+        ceiling_ft = float(notam["height_msl_ft"]) + OBSTACLE_CLEARANCE_FT
+    elif source == "airport":
+        ceiling_ft = elevation_ft + AIRPORT_AREA_CEILING_AGL_FT
+    else:
+        ceiling_ft = math.inf
+
+    return NotamArea(
+        notam_id=str(notam["id"]),
+        latitude=float(latitude),
+        longitude=float(longitude),
+        radius_nm=float(radius_nm),
+        floor_ft=floor_ft,
+        ceiling_ft=ceiling_ft,
+        source=source,
+    )
+
+
+class NotamAreaIndex:
+    """
+    Uniform grid over NOTAM areas in a local equirectangular projection.
+
+    Each area is registered in every cell its circle overlaps; the grid is kept
+    as sorted cell keys with CSR offsets so a whole snapshot can be looked up
+    with `np.searchsorted`. Adds and removes mark the grid dirty and it is
+    rebuilt on the next join.
+    """
+
+    def __init__(
+        self,
+        reference_lat: float = 37.6,
+        reference_lon: float = -122.2,
+        cell_nm: float = GRID_CELL_NM,
+    ):
+        self._references = _reference_points()
+        self._lat0 = reference_lat
+        self._lon0 = reference_lon
+        self._cos_lat0 = math.cos(math.radians(reference_lat))
+        self._cell_m = cell_nm * METERS_PER_NM
+        self._areas: Dict[str, NotamArea] = {}
+        self._dirty = True
+
+        self._ids: List[str] = []
+        self._x = np.empty(0)
+        self._y = np.empty(0)
+        self._radius_m = np.empty(0)
+        self._floor_ft = np.empty(0)
+        self._ceiling_ft = np.empty(0)
+        self._cell_keys = np.empty(0, dtype=np.int64)
+        self._cell_offsets = np.zeros(1, dtype=np.int64)
+        self._cell_members = np.empty(0, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self._areas)
+
+    def add(self, notam: Dict[str, Any]) -> Optional[NotamArea]:
+        """Index a NOTAM's area, replacing any previous entry. Returns None if it has no location."""
+        notam_id = str(notam["id"])
+        area = notam_area(notam, self._references)
+        if area is None:
+            self.remove(notam_id)
+            return None
+        self._areas[notam_id] = area
+        self._dirty = True
+        return area
+
+    def remove(self, notam_id: str) -> None:
+        if self._areas.pop(notam_id, None) is not None:
+            self._dirty = True
+
+    def get(self, notam_id: str) -> Optional[NotamArea]:
+        return self._areas.get(notam_id)
+
+    def copy(self) -> "NotamAreaIndex":
+        """Independent copy that shares the built grid until either side changes."""
+        clone = copy.copy(self)
+        clone._areas = dict(self._areas)
+        return clone
+
+    def _project(self, latitude: np.ndarray, longitude: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        x = (longitude - self._lon0) * METERS_PER_DEG_LAT * self._cos_lat0
+        y = (latitude - self._lat0) * METERS_PER_DEG_LAT
+        return x, y
+
+    @staticmethod
+    def _cell_key(cx: np.ndarray, cy: np.ndarray) -> np.ndarray:
+        # Cell coordinates stay far below 2**31 for any regional picture
+        return (cx.astype(np.int64) << 32) + (cy.astype(np.int64) & 0xFFFFFFFF)
+
+    def prepare(self) -> None:
+        """Rebuild the grid now if it is dirty, e.g. from a worker thread."""
+        if self._dirty:
+            self._rebuild()
+
+    def _rebuild(self) -> None:
+        areas = list(self._areas.values())
+        self._ids = [area.notam_id for area in areas]
+        self._x, self._y = self._project(
+            np.array([area.latitude for area in areas], dtype=np.float64),
+            np.array([area.longitude for area in areas], dtype=np.float64),
+        )
+        self._radius_m = np.array([area.radius_nm for area in areas], dtype=np.float64) * METERS_PER_NM
+        self._floor_ft = np.array([area.floor_ft for area in areas], dtype=np.float64)
+        self._ceiling_ft = np.array([area.ceiling_ft for area in areas], dtype=np.float64)
+
+        members, keys = self._cover(
+            self._x - self._radius_m, self._y - self._radius_m,
+            self._x + self._radius_m, self._y + self._radius_m,
+        )
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+        self._cell_members = members[order]
+        self._cell_keys, starts = np.unique(keys, return_index=True)
+        self._cell_offsets = np.append(starts, len(keys)).astype(np.int64)
+        self._dirty = False
+
+    def _cover(
+        self, x0: np.ndarray, y0: np.ndarray, x1: np.ndarray, y1: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Expand per-row bounding boxes into (row, cell key) pairs."""
+        cx0 = np.floor(x0 / self._cell_m).astype(np.int64)
+        cy0 = np.floor(y0 / self._cell_m).astype(np.int64)
+        nx = np.floor(x1 / self._cell_m).astype(np.int64) - cx0 + 1
+        ny = np.floor(y1 / self._cell_m).astype(np.int64) - cy0 + 1
+        counts = nx * ny
+
+        rows = np.repeat(np.arange(len(counts)), counts)
+        # Position of each pair within its row's box, unravelled into (dx, dy)
+        local = np.arange(int(counts.sum())) - np.repeat(np.cumsum(counts) - counts, counts)
+        dx = local // ny[rows]
+        dy = local % ny[rows]
+        return rows, self._cell_key(cx0[rows] + dx, cy0[rows] + dy)
+
+    def join(
+        self, snapshot: AirSnapshot, lookahead_seconds: float = APPROACH_LOOKAHEAD_SECONDS
+    ) -> List[Dict[str, Any]]:
+        """
+        Match every aircraft against the indexed areas.
+
+        Candidates come from the grid cells covered by each aircraft's path over
+        the lookahead; only those pairs get the exact closest-approach test.
+
+        Returns:
+            One match per (aircraft, NOTAM) with status `inside` or `approaching`
+        """
+        self.prepare()
+        if not len(snapshot) or not self._ids:
+            return []
+
+        x, y = self._project(snapshot.latitude, snapshot.longitude)
+        track = np.radians(np.nan_to_num(snapshot.true_track))
+        speed = np.where(snapshot.on_ground, 0.0, np.nan_to_num(snapshot.velocity))
+        vx = speed * np.sin(track)
+        vy = speed * np.cos(track)
+        end_x = x + vx * lookahead_seconds
+        end_y = y + vy * lookahead_seconds
+
+        aircraft_rows, keys = self._cover(
+            np.minimum(x, end_x), np.minimum(y, end_y),
+            np.maximum(x, end_x), np.maximum(y, end_y),
+        )
+        position = np.searchsorted(self._cell_keys, keys)
+        position = np.minimum(position, len(self._cell_keys) - 1)
+        hit = self._cell_keys[position] == keys
+        aircraft_rows = aircraft_rows[hit]
+        position = position[hit]
+
+        starts = self._cell_offsets[position]
+        counts = self._cell_offsets[position + 1] - starts
+        pair_aircraft = np.repeat(aircraft_rows, counts)
+        local = np.arange(int(counts.sum())) - np.repeat(np.cumsum(counts) - counts, counts)
+        pair_area = self._cell_members[np.repeat(starts, counts) + local]
+        if not len(pair_area):
+            return []
+
+        # An area spanning several cells the aircraft also crosses shows up more than once
+        pairs = np.unique(pair_aircraft * len(self._ids) + pair_area)
+        pair_aircraft = pairs // len(self._ids)
+        pair_area = pairs % len(self._ids)
+
+        altitude_ft = snapshot.altitude[pair_aircraft] * METERS_TO_FEET
+        with np.errstate(invalid="ignore"):
+            # Unknown altitude is treated as inside the band
+            in_band = np.isnan(altitude_ft) | (
+                (altitude_ft >= self._floor_ft[pair_area]) & (altitude_ft <= self._ceiling_ft[pair_area])
+            )
+
+        rel_x = self._x[pair_area] - x[pair_aircraft]
+        rel_y = self._y[pair_area] - y[pair_aircraft]
+        pvx = vx[pair_aircraft]
+        pvy = vy[pair_aircraft]
+        speed_sq = pvx * pvx + pvy * pvy
+        with np.errstate(invalid="ignore", divide="ignore"):
+            t_closest = np.where(speed_sq > 0, (rel_x * pvx + rel_y * pvy) / speed_sq, 0.0)
+        t_closest = np.clip(t_closest, 0.0, lookahead_seconds)
+        miss_x = rel_x - pvx * t_closest
+        miss_y = rel_y - pvy * t_closest
+
+        radius = self._radius_m[pair_area]
+        distance = np.hypot(rel_x, rel_y)
+        inside = in_band & (distance <= radius)
+        approaching = in_band & ~inside & (np.hypot(miss_x, miss_y) <= radius)
+
+        # Entry time: first root of |rel - v t| = radius along the path
+        b = rel_x * pvx + rel_y * pvy
+        disc = b * b - speed_sq * (distance * distance - radius * radius)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            t_entry = (b - np.sqrt(np.maximum(disc, 0.0))) / speed_sq
+
+        matches: List[Dict[str, Any]] = []
+        for pair in np.flatnonzero(inside | approaching):
+            row = int(pair_aircraft[pair])
+            area = int(pair_area[pair])
+            is_inside = bool(inside[pair])
+            altitude = snapshot.altitude[row]
+            matches.append({
+                "icao24": snapshot.icao24[row],
+                "callsign": snapshot.callsign[row] or None,
+                "notam_id": self._ids[area],
+                "status": "inside" if is_inside else "approaching",
+                "distance_nm": round(float(distance[pair] / METERS_PER_NM), 2),
+                "radius_nm": round(float(radius[pair] / METERS_PER_NM), 2),
+                "time_to_entry_seconds": None if is_inside else round(float(t_entry[pair]), 1),
+                "altitude_ft": None if np.isnan(altitude) else int(altitude * METERS_TO_FEET),
+            })
+        return matches
+
+
+class ProximityMonitor:
+    """Keeps the latest NOTAM proximity matches for the air picture."""
+
+    def __init__(
+        self,
+        index: Callable[[], NotamAreaIndex],
+        notams: Callable[[str], Optional[Dict[str, Any]]],
+        is_active: Optional[Callable[[str, float], bool]] = None,
+    ):
+        # A resolver rather than the index itself: hot reloads swap in a new one
+        self._index = index
+        self._notams = notams
+        self._is_active = is_active
+        self._matches: List[Dict[str, Any]] = []
+        self._timestamp: Optional[int] = None
+
+    @property
+    def timestamp(self) -> Optional[int]:
+        return self._timestamp
+
+    def update(self, snapshot: AirSnapshot) -> List[Dict[str, Any]]:
+        """Join the snapshot against in-effect NOTAM areas."""
+        matches = []
+        for match in self._index().join(snapshot):
+            notam_id = match["notam_id"]
+            notam = self._notams(notam_id)
+            if notam is None:
+                # Cancelled since the index was read
+                continue
+            if self._is_active is not None and not self._is_active(notam_id, snapshot.timestamp):
+                continue
+            match.update({
+                "number": notam.get("number"),
+                "location": notam.get("location"),
+                "classification": notam.get("classification"),
+                "subject": notam.get("subject"),
+            })
+            matches.append(match)
+
+        # Aircraft already inside an area first, then by how soon they enter
+        matches.sort(key=lambda m: (m["status"] != "inside", m["time_to_entry_seconds"] or 0.0))
+        self._matches = matches
+        self._timestamp = snapshot.timestamp
+        return matches
+
+    def get_matches(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        if status is None:
+            return list(self._matches)
+        return [match for match in self._matches if match["status"] == status]
+
+
+# Singleton instance
+_proximity_monitor_instance: Optional[ProximityMonitor] = None
+
+
+def get_proximity_monitor() -> ProximityMonitor:
+    """Get or create NOTAM proximity monitor singleton instance"""
+    global _proximity_monitor_instance
+
+    if _proximity_monitor_instance is None:
+        # Deferred: the NOTAM engine itself imports this module for NotamAreaIndex
+        from notam_engine import get_notam_engine
+
+        engine = get_notam_engine()
+        _proximity_monitor_instance = ProximityMonitor(lambda: engine.area_index, engine.get_notam, engine.is_active)
+
+    return _proximity_monitor_instance
@@ -1,9 +1,10 @@
-from fastapi import FastAPI, APIRouter, HTTPException
+from fastapi import FastAPI, APIRouter, HTTPException, Request, Response
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
 import os
 import logging
+import math
 from pathlib import Path
 from pydantic import BaseModel, Field, ConfigDict
 from typing import List, Optional, Dict, Any, Tuple
@@ -11,13 +12,28 @@ import uuid
 from datetime import datetime, timezone
 import httpx
 import asyncio
+import base64
 from aircraft_simulator import get_simulator, reset_simulator
 from notam_engine import get_notam_engine
-from services.openrouter_client import OpenRouterClient, OpenRouterError
-from fastapi.responses import StreamingResponse
+from notam_ingest import get_notam_ingestor
+from services.openrouter_client import OpenRouterClient, OpenRouterError, get_openrouter_client
+from services.weather_service import get_weather_service
+from metar_store import get_metar_store
+from services.tile_cache import TileError, get_tile_cache
+from services.tts_service import TTSError, get_tts_service
+from fastapi.responses import JSONResponse, StreamingResponse
 import json
 from airspace_data import BAY_AREA_AIRSPACE
 from atc_facilities import generate_coverage_geojson, generate_facilities_points_geojson
+from air_snapshot import build_air_snapshot
+from dead_reckoning import get_dead_reckoner
+from track_filter import get_track_filter
+from traffic_density import get_density_accumulator, DEFAULT_WINDOW_SECONDS
+from arrival_manager import get_arrival_manager
+from alert_rules import get_alert_engine
+from notam_proximity import get_proximity_monitor
+from copilot_context import get_context_builder
+from intent_router import get_intent_router
 
 
 ROOT_DIR = Path(__file__).parent
@@ -65,6 +81,23 @@ class Notam(BaseModel):
     start: str
     end: str
     condition: str
+    subject: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    radius_nm: Optional[float] = None
+    offset_nm: Optional[float] = None
+    offset_bearing: Optional[float] = None
+    offset_reference: Optional[str] = None
+    height_msl_ft: Optional[float] = None
+    height_agl_ft: Optional[float] = None
+    lower_ft: Optional[float] = None
+    upper_ft: Optional[float] = None
+    upper_is_agl: bool = False
+    valid_from: Optional[datetime] = None
+    valid_to: Optional[datetime] = None
+    valid_to_estimated: bool = False
+    permanent: bool = False
+    runways: List[str] = []
     emission: int
     received_at: datetime
     is_new: bool
@@ -73,6 +106,7 @@ class Notam(BaseModel):
 class NotamFeedResponse(BaseModel):
     notams: List[Notam]
     sequence: int
+    is_delta: bool = False
     last_updated: datetime
     cadence_seconds: float
     total_catalog: int
@@ -109,30 +143,79 @@ async def get_status_checks():
 
 
 @api_router.get("/notams", response_model=NotamFeedResponse)
-async def get_notam_feed():
+async def get_notam_feed(since: Optional[int] = None, wait: float = 0.0, active_only: bool = False):
+    """
+    Rolling NOTAM feed. Pass `since=<sequence>` to receive only emissions newer
+    than the client's cursor, `wait=<seconds>` to long-poll until one arrives,
+    and `active_only=true` to drop expired NOTAMs.
+    """
     engine = get_notam_engine()
-    feed_snapshot = await engine.get_feed()
-
-    last_updated_raw = feed_snapshot.get("last_updated")
-    last_updated = (
-        datetime.fromisoformat(last_updated_raw)
-        if isinstance(last_updated_raw, str)
-        else last_updated_raw
+    feed_snapshot = await engine.get_feed(
+        since=since, wait_seconds=max(0.0, wait), active_only=active_only
     )
+    # Emissions are serialized once by the engine; returning the response
+    # directly skips re-validating every NOTAM against the response model
+    return JSONResponse(content=feed_snapshot)
+
+
+@api_router.get("/notams/active")
+async def get_active_notams(at: Optional[float] = None, until: Optional[float] = None):
+    """
+    NOTAMs in effect at `at` (epoch seconds, defaults to now), or at any point
+    between `at` and `until` when a window is given.
+    """
+    engine = get_notam_engine()
+    await engine.wait_ready()
+    if at is None:
+        at = datetime.now(timezone.utc).timestamp()
+    notams = engine.active(at=at, until=until)
+    return {
+        "at": at,
+        "until": until,
+        "notams": notams,
+        "total": len(notams),
+    }
 
-    notam_items = [
-        Notam(**item) if not isinstance(item, Notam) else item
-        for item in feed_snapshot.get("notams", [])
-    ]
-
-    return NotamFeedResponse(
-        notams=notam_items,
-        sequence=feed_snapshot.get("sequence", 0),
-        last_updated=last_updated or datetime.now(timezone.utc),
-        cadence_seconds=float(feed_snapshot.get("cadence_seconds", 0)),
-        total_catalog=int(feed_snapshot.get("total_catalog", len(notam_items))),
-        window_size=int(feed_snapshot.get("window_size", len(notam_items))),
+
+@api_router.get("/notams/proximity")
+async def get_notam_proximity(status: Optional[str] = None):
+    """
+    Aircraft inside (`status=inside`) or projected to enter (`status=approaching`)
+    an in-effect NOTAM area, from the latest air-picture snapshot.
+    """
+    monitor = get_proximity_monitor()
+    matches = monitor.get_matches(status)
+    return {
+        "timestamp": monitor.timestamp,
+        "matches": matches,
+        "total": len(matches),
+    }
+
+
+@api_router.get("/notams/search")
+async def search_notams(
+    q: str = "",
+    location: Optional[str] = None,
+    classification: Optional[str] = None,
+    category: Optional[str] = None,
+    limit: int = 20,
+):
+    """
+    Ranked full-text NOTAM search (e.g. "crane near SFO", "RWY 28L closures")
+    with optional location / classification / category facet filters.
+    """
+    engine = get_notam_engine()
+    await engine.wait_ready()
+    started = datetime.now(timezone.utc)
+    result = engine.search(
+        q,
+        location=location,
+        classification=classification,
+        category=category,
+        limit=max(1, min(limit, 200)),
     )
+    result["took_ms"] = round((datetime.now(timezone.utc) - started).total_seconds() * 1000, 2)
+    return result
 
 
 # ===== ODIN ATC Console - OpenSky Network Integration =====
@@ -211,6 +294,25 @@ class AirPictureResponse(BaseModel):
     is_simulated: bool = False
 
 
+class ExtrapolatedAircraft(BaseModel):
+    """Dead-reckoned aircraft position at a requested timestamp"""
+    icao24: str
+    latitude: float
+    longitude: float
+    altitude: Optional[float] = None
+    true_track: Optional[float] = None
+    extrapolated_seconds: float
+    uncertainty_nm: float
+
+
+class ExtrapolatedPictureResponse(BaseModel):
+    """Response model for extrapolated air picture data"""
+    aircraft: List[ExtrapolatedAircraft]
+    at: float
+    snapshot_timestamp: int
+    aircraft_count: int
+
+
 def normalize_opensky_state(state: List[Any]) -> Optional[Aircraft]:
     """
     Convert OpenSky state vector to normalized Aircraft model.
@@ -439,24 +541,28 @@ async def get_opensky_aircraft():
         opensky_cache["timestamp"] = raw_data.get("time", current_timestamp)
         opensky_cache["is_stale"] = False
 
-        # Update aircraft trails
-        global aircraft_trails
-        for aircraft in aircraft_list:
-            if aircraft.latitude is None or aircraft.longitude is None:
-                continue
+        # Ingest pipeline: columnar snapshot -> Kalman smoothing -> trails/extrapolation
+        snapshot = get_track_filter().update(
+            build_air_snapshot(aircraft_list, opensky_cache["timestamp"])
+        )
 
-            if aircraft.icao24 not in aircraft_trails:
-                aircraft_trails[aircraft.icao24] = {
+        # Update aircraft trails from smoothed positions
+        global aircraft_trails
+        for icao, latitude, longitude, altitude in zip(
+            snapshot.icao24, snapshot.latitude, snapshot.longitude, snapshot.altitude
+        ):
+            if icao not in aircraft_trails:
+                aircraft_trails[icao] = {
                     "positions": [],
                     "last_seen": current_timestamp
                 }
 
-            trail = aircraft_trails[aircraft.icao24]
+            trail = aircraft_trails[icao]
             trail["positions"].append((
                 current_timestamp,
-                aircraft.latitude,
-                aircraft.longitude,
-                aircraft.baro_altitude
+                float(latitude),
+                float(longitude),
+                None if math.isnan(altitude) else float(altitude)
             ))
             trail["last_seen"] = current_timestamp
 
@@ -470,6 +576,31 @@ async def get_opensky_aircraft():
             if current_timestamp - data["last_seen"] < TRAIL_CLEANUP_THRESHOLD
         }
 
+        # Refresh dead-reckoning state for sub-poll extrapolation
+        get_dead_reckoner().update(snapshot)
+
+        # Accumulate traffic density for heatmap layers
+        get_density_accumulator().add(snapshot)
+
+        # Refresh runway arrival sequences
+        get_arrival_manager().update(snapshot)
+
+        # Evaluate emergency squawk / anomaly rules and stream alert events
+        get_alert_engine().evaluate(snapshot)
+
+        # Flag aircraft inside or heading into NOTAM areas
+        get_proximity_monitor().update(snapshot)
+
+        # Re-rank the live context lines used in copilot prompts; best effort,
+        # a failure here must not take down the air picture
+        try:
+            get_context_builder().update(snapshot)
+        except Exception as e:
+            logger.error(f"Copilot context update failed: {e}")
+
+        # Index callsigns for locally answered copilot questions
+        get_intent_router().update(snapshot)
+
         # Determine status based on global simulation flag
         global simulation_mode_active
         status_msg = "simulated" if simulation_mode_active else "ok"
@@ -507,6 +638,28 @@ async def get_opensky_aircraft():
     raise HTTPException(status_code=503, detail="Aircraft data temporarily unavailable")
 
 
+@api_router.get("/air/extrapolated", response_model=ExtrapolatedPictureResponse)
+async def get_extrapolated_aircraft(at: Optional[float] = None):
+    """
+    Get aircraft positions dead-reckoned from the last snapshot to `at`
+    (epoch seconds, defaults to now). Lets clients animate smoothly between
+    10s upstream polls without extra OpenSky requests.
+    """
+    reckoner = get_dead_reckoner()
+    if reckoner.snapshot_time is None:
+        raise HTTPException(status_code=404, detail="No aircraft data available")
+
+    target = at if at is not None else datetime.now(timezone.utc).timestamp()
+    aircraft = reckoner.extrapolate(target)
+
+    return ExtrapolatedPictureResponse(
+        aircraft=aircraft,
+        at=target,
+        snapshot_timestamp=reckoner.snapshot_time,
+        aircraft_count=len(aircraft)
+    )
+
+
 @api_router.get("/aircraft/{icao24}")
 async def get_aircraft_details(icao24: str):
     """Get details for a specific aircraft by ICAO24 hex code"""
@@ -581,6 +734,71 @@ async def get_aircraft_trails(icao24: Optional[str] = None):
     }
 
 
+@api_router.get("/air/heatmap")
+async def get_traffic_heatmap(zoom: int = 10, window: int = DEFAULT_WINDOW_SECONDS):
+    """
+    Get traffic density as GeoJSON tile polygons for the given map zoom.
+    Only non-empty cells within the last `window` seconds are returned.
+    """
+    return get_density_accumulator().query(zoom, window)
+
+
+@api_router.get("/air/arrivals")
+async def get_arrival_sequence(airport: Optional[str] = None):
+    """
+    Get arrival sequences per runway with distance-to-threshold and ETA.
+    Sequences are maintained on ingest, so this only reads current state.
+    """
+    manager = get_arrival_manager()
+    return {
+        "airports": manager.get_sequences(airport),
+        "timestamp": manager.timestamp
+    }
+
+
+@api_router.get("/alerts")
+async def get_alerts():
+    """Get currently active alerts and the most recent raised/cleared events."""
+    engine = get_alert_engine()
+    return {
+        "alerts": engine.active_alerts(),
+        "events": engine.recent_events()
+    }
+
+
+ALERT_STREAM_HEARTBEAT_SECONDS = 15.0
+
+
+@api_router.get("/alerts/stream")
+async def stream_alerts(request: Request):
+    """
+    Server-Sent Events stream of alert events as they are produced by ingest.
+    Sends a heartbeat comment periodically so proxies keep the connection open.
+    """
+    engine = get_alert_engine()
+    queue = engine.subscribe()
+
+    async def event_source():
+        try:
+            for alert in engine.active_alerts():
+                yield f"event: raised\ndata: {json.dumps({'type': 'raised', 'alert': alert})}\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=ALERT_STREAM_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": heartbeat\n\n"
+                    continue
+                yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+        finally:
+            engine.unsubscribe(queue)
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers=headers
+    )
+
+
 @api_router.get("/airspace/boundaries")
 async def get_airspace_boundaries():
     """Return Bay Area airspace boundaries as GeoJSON"""
@@ -604,55 +822,110 @@ async def get_atc_facilities():
 @api_router.get("/weather/current")
 async def get_current_weather():
     """
-    Fetch current weather for KSFO, KOAK, KSJC airports.
-    Updates every 10 minutes to minimize API usage.
+    Current weather for the configured airports (WEATHER_AIRPORTS, default
+    KSFO, KOAK, KSJC). Served from a TTL cache refreshed every 10 minutes by
+    default; polls never wait on WeatherAPI once the cache is warm.
+
+    Each airport with a locally decoded METAR also carries a `metar` summary
+    (flight category, ceiling, trends); when WeatherAPI has no data for an
+    airport, its basic fields are filled from that METAR instead.
+    """
+    weather = await get_weather_service().get_current()
+    store = get_metar_store()
+    airports = weather.setdefault("airports", {})
+
+    for station in store.stations():
+        metar = store.summary(station)
+        if metar is None:
+            # Stale observation; not reported as current weather
+            continue
+        entry = airports.setdefault(station, {})
+        if "temp_c" not in entry:
+            entry.update({
+                "temp_c": metar["temp_c"],
+                "condition": metar["condition"],
+                "wind_kph": round(metar["wind_speed_kt"] * 1.852, 1) if metar["wind_speed_kt"] is not None else None,
+                "wind_dir": compass_point(metar["wind_dir_deg"]) if metar["wind_speed_kt"] else "CALM",
+                "visibility_km": round(metar["visibility_sm"] * 1.609344, 1) if metar["visibility_sm"] is not None else None,
+            })
+        entry["metar"] = metar
+
+    if weather.get("status") == "unavailable" and airports:
+        weather["status"] = "metar"
+    return weather
+
+
+def compass_point(degrees: Optional[int]) -> str:
+    """16-point compass name for a wind direction (VRB when unknown)."""
+    if degrees is None:
+        return "VRB"
+    points = ["N", "NNE", "NE", "ENE", "E", "ESE", "SE", "SSE",
+              "S", "SSW", "SW", "WSW", "W", "WNW", "NW", "NNW"]
+    return points[int((degrees % 360) / 22.5 + 0.5) % 16]
+
+
+@api_router.get("/weather/metar")
+async def get_metar(station: Optional[str] = None, hours: float = 3.0):
     """
-    airports = [
-        {"code": "KSFO", "q": "37.6213,-122.3790"},  # SFO
-        {"code": "KOAK", "q": "37.7214,-122.2208"},  # Oakland
-        {"code": "KSJC", "q": "37.3639,-121.9289"}   # San Jose
-    ]
+    Decoded METAR/TAF data from the local feed (METAR_SOURCES).
 
-    weather_data = {}
-    api_key = os.environ.get('WEATHERAPI_KEY')
+    Without `station`, returns the current summary of every station. With it,
+    returns the latest METAR, the trend over the last `hours` of observations,
+    the latest TAF and the worst forecast category in the next six hours.
+    """
+    store = get_metar_store()
+    if station is None:
+        summaries = {code: store.summary(code) for code in store.stations()}
+        return {"stations": {code: summary for code, summary in summaries.items() if summary is not None}}
+
+    current = store.current(station)
+    if current is None:
+        raise HTTPException(status_code=404, detail=f"No METAR for station {station}")
+    return {
+        "station": current["station"],
+        "current": current,
+        "trend": store.trend(station, max(0.5, min(hours, 72.0))),
+        "forecast": store.forecast(station),
+        "outlook": store.outlook(station),
+    }
 
-    if not api_key:
-        logger.error("WEATHERAPI_KEY not configured")
-        return {"airports": {}, "status": "unavailable"}
 
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        for airport in airports:
-            try:
-                url = "https://api.weatherapi.com/v1/current.json"
-                params = {"key": api_key, "q": airport["q"], "aqi": "no"}
-                response = await client.get(url, params=params)
-
-                if response.status_code == 200:
-                    data = response.json()
-                    weather_data[airport["code"]] = {
-                        "temp_c": data["current"]["temp_c"],
-                        "condition": data["current"]["condition"]["text"],
-                        "wind_kph": data["current"]["wind_kph"],
-                        "wind_dir": data["current"]["wind_dir"],
-                        "visibility_km": data["current"]["vis_km"]
-                    }
-                else:
-                    logger.error(f"Weather API returned {response.status_code} for {airport['code']}")
-                    weather_data[airport["code"]] = {"condition": "—"}
-            except Exception as e:
-                logger.error(f"Failed to fetch weather for {airport['code']}: {e}")
-                weather_data[airport["code"]] = {"condition": "—"}
+# ===== Map / Weather Tile Proxy =====
 
-    return {
-        "airports": weather_data,
-        "timestamp": int(datetime.now(timezone.utc).timestamp()),
-        "status": "ok" if weather_data else "unavailable"
+@api_router.get("/tiles/stats")
+async def get_tile_cache_stats():
+    """Tile proxy cache counters (hits per tier, upstream misses, coalesced requests)."""
+    return get_tile_cache().metrics()
+
+
+@api_router.get("/tiles/{source}/{path:path}")
+async def get_tile(source: str, path: str, request: Request, key: Optional[str] = None):
+    """
+    Proxy a map or weather overlay tile through the shared two-tier cache so
+    all consoles share one upstream fetch per tile. `key` is only used for
+    keyed sources when the server has no key of its own configured.
+    """
+    cache = get_tile_cache()
+    try:
+        tile, served = await cache.get(source, path, client_key=key)
+    except TileError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+    etag = f'"{tile.meta.digest[:32]}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={int(cache.ttl_remaining(source, tile))}",
+        "X-Tile-Cache": served,
     }
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=tile.body, media_type=tile.meta.content_type, headers=headers)
 
 
 # ===== SIMPLE CHAT WITH OPENROUTER =====
 
-from simple_chat import chat_with_openrouter
+from simple_chat import build_messages, chat_with_openrouter
+from chat_sessions import get_session_store
 
 OPENROUTER_API_KEY = os.environ.get('OPENROUTER_API_KEY', '')
 if not OPENROUTER_API_KEY:
@@ -660,31 +933,141 @@ if not OPENROUTER_API_KEY:
 
 class SimpleChatRequest(BaseModel):
     message: str
+    session_id: Optional[str] = None
+    # Only used to seed a new session; later turns come from the server-side session
     history: List[Dict[str, str]] = []
 
 class SimpleChatResponse(BaseModel):
     response: str
+    session_id: str
 
 @api_router.post("/chat", response_model=SimpleChatResponse)
 async def simple_chat(request: SimpleChatRequest):
     """Simple chat endpoint with OpenRouter."""
-    response = await chat_with_openrouter(request.message, request.history)
-    return SimpleChatResponse(response=response)
+    session = await get_session_store().open(request.session_id, request.history)
+    response = await chat_with_openrouter(request.message, session)
+    return SimpleChatResponse(response=response, session_id=session.id)
 
 
-# ===== ODIN ATC HANDOFF - ElevenLabs Voice Integration =====
+@api_router.post("/chat/stream")
+async def simple_chat_stream(request: SimpleChatRequest):
+    """
+    Streaming variant of /chat as Server-Sent Events: a leading `session`
+    event carries the session id, `token` events carry text as it arrives,
+    then a final `done` (with time-to-first-token and the session id) or
+    `error` event. A client disconnect cancels the generator, which closes
+    the upstream OpenRouter stream.
+    """
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    store = get_session_store()
+    session = await store.open(request.session_id, request.history)
+    # Sent first so the client keeps the session even if this turn errors or is aborted
+    session_event = f"event: session\ndata: {json.dumps({'session_id': session.id})}\n\n"
+    routed = get_intent_router().route(request.message)
+    if routed is not None:
+        await store.record(session, request.message, routed)
+
+        async def routed_source():
+            done = {"ttft_ms": 0.0, "total_ms": 0.0, "chunks": 1, "routed": True, "session_id": session.id}
+            yield session_event
+            yield f"event: token\ndata: {json.dumps({'text': routed})}\n\n"
+            yield f"event: done\ndata: {json.dumps(done)}\n\n"
+
+        return StreamingResponse(routed_source(), media_type="text/event-stream", headers=headers)
+
+    client = get_openrouter_client()
+    if client is None:
+        raise HTTPException(status_code=503, detail="Chat unavailable: OpenRouter API key not configured.")
+
+    summary, history = store.prompt(session)
+    messages = build_messages(request.message, history, summary)
+
+    async def event_source():
+        started = datetime.now(timezone.utc)
+        first_token_ms = None
+        chunks = 0
+        parts = []
+        stream = client.chat_completion_stream(messages, max_tokens=300)
+        try:
+            yield session_event
+            async for token in stream:
+                if first_token_ms is None:
+                    first_token_ms = (datetime.now(timezone.utc) - started).total_seconds() * 1000
+                chunks += 1
+                parts.append(token)
+                yield f"event: token\ndata: {json.dumps({'text': token})}\n\n"
+            total_ms = (datetime.now(timezone.utc) - started).total_seconds() * 1000
+            # Only completed replies join the session history
+            await store.record(session, request.message, "".join(parts))
+            done = {
+                "ttft_ms": round(first_token_ms, 1) if first_token_ms is not None else None,
+                "total_ms": round(total_ms, 1),
+                "chunks": chunks,
+                "session_id": session.id
+            }
+            yield f"event: done\ndata: {json.dumps(done)}\n\n"
+        except OpenRouterError as e:
+            logger.error(f"Chat stream failed: {e}")
+            yield f"event: error\ndata: {json.dumps({'detail': str(e)})}\n\n"
+        except asyncio.CancelledError:
+            logger.info(f"Chat stream client disconnected after {chunks} chunks")
+            raise
+        finally:
+            await stream.aclose()
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers=headers
+    )
 
-ELEVENLABS_API_KEY = os.environ.get('ELEVENLABS_API_KEY', '')
 
-# Initialize ElevenLabs client
-elevenlabs_client = None
-if ELEVENLABS_API_KEY:
-    try:
-        from elevenlabs import ElevenLabs
-        elevenlabs_client = ElevenLabs(api_key=ELEVENLABS_API_KEY)
-        logger.info("ElevenLabs client initialized successfully")
-    except Exception as e:
-        logger.error(f"Failed to initialize ElevenLabs client: {e}")
+@api_router.get("/chat/metrics")
+async def chat_metrics():
+    """Copilot latency metrics (streaming time-to-first-token, cache and local routing hit rates, admission queue)."""
+    client = get_openrouter_client()
+    return {
+        "router": get_intent_router().metrics(),
+        "stream": client.stream_metrics() if client else None,
+        "completion": client.completion_metrics() if client else None,
+        "cache": client.response_cache.metrics() if client and client.response_cache else None,
+        "admission": client.admission.metrics() if client else None,
+        "sessions": get_session_store().metrics()
+    }
+
+
+@api_router.get("/chat/context")
+async def chat_context(budget: Optional[int] = None):
+    """Live air-picture context as injected into copilot prompts, fitted to `budget` tokens."""
+    builder = get_context_builder()
+    return {
+        "timestamp": builder.timestamp,
+        "token_budget": budget or builder.token_budget,
+        "context": builder.render(budget)
+    }
+
+
+@api_router.get("/chat/sessions/{session_id}")
+async def get_chat_session(session_id: str):
+    """A copilot session's rolling summary and recent messages."""
+    session = await get_session_store().get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail=f"Unknown chat session {session_id}")
+    return {**session.to_dict(), "tokens": session.tokens()}
+
+
+@api_router.delete("/chat/sessions/{session_id}")
+async def delete_chat_session(session_id: str):
+    """Forget a copilot session (new conversation)."""
+    if not await get_session_store().delete(session_id):
+        raise HTTPException(status_code=404, detail=f"Unknown chat session {session_id}")
+    return {"deleted": session_id}
+
+
+# ===== ODIN ATC HANDOFF - ElevenLabs Voice Integration =====
+
+# Synthesis runs on the TTS service's thread pool, never on the event loop
+tts_service = get_tts_service()
 
 
 class HandoffRequest(BaseModel):
@@ -791,8 +1174,9 @@ def generate_shift_briefing(request: ShiftHandoffRequest) -> str:
     # Brief ATC-style shift handoff
     script = f"{request.facility_name}, shift briefing. "
     
-    # Weather - assume clear/good conditions as requested
-    script += "Weather is VFR, winds light and variable, altimeter three zero one two. "
+    # Weather - latest decoded METAR for the facility, else assume good conditions
+    script += get_metar_store().briefing_sentence(request.facility_id) or \
+        "Weather is VFR, winds light and variable, altimeter three zero one two. "
     
     # Equipment - assume all operational
     script += "All equipment operational. "
@@ -837,31 +1221,13 @@ async def generate_handoff(request: HandoffRequest):
         
         # Generate audio with ElevenLabs (if available)
         audio_base64 = None
-        if elevenlabs_client:
+        if tts_service.available:
             try:
-                # Use a professional female voice suitable for ATC (Rachel voice ID)
-                # Rachel is known for clear, authoritative delivery
-                voice_id = "21m00Tcm4TlvDq8ikWAM"  # Rachel voice
-                
-                # Generate audio
-                audio_generator = elevenlabs_client.text_to_speech.convert(
-                    text=handoff_script,
-                    voice_id=voice_id,
-                    model_id="eleven_monolingual_v1",  # Fast, clear English
-                    output_format="mp3_44100_128"
-                )
-                
-                # Collect audio data
-                audio_data = b""
-                for chunk in audio_generator:
-                    audio_data += chunk
-                
-                # Convert to base64
-                import base64
+                audio_data = await tts_service.synthesize(handoff_script)
                 audio_base64 = base64.b64encode(audio_data).decode('utf-8')
                 logger.info(f"Generated {len(audio_data)} bytes of audio for handoff")
                 
-            except Exception as e:
+            except TTSError as e:
                 logger.error(f"Failed to generate audio with ElevenLabs: {e}")
                 # Continue without audio
         
@@ -892,30 +1258,13 @@ async def generate_shift_handoff(request: ShiftHandoffRequest):
         
         # Generate audio with ElevenLabs (if available)
         audio_base64 = None
-        if elevenlabs_client:
+        if tts_service.available:
             try:
-                # Use a professional female voice suitable for ATC (Rachel voice ID)
-                voice_id = "21m00Tcm4TlvDq8ikWAM"  # Rachel voice - clear, authoritative
-                
-                # Generate audio
-                audio_generator = elevenlabs_client.text_to_speech.convert(
-                    text=briefing_script,
-                    voice_id=voice_id,
-                    model_id="eleven_monolingual_v1",  # Fast, clear English
-                    output_format="mp3_44100_128"
-                )
-                
-                # Collect audio data
-                audio_data = b""
-                for chunk in audio_generator:
-                    audio_data += chunk
-                
-                # Convert to base64
-                import base64
+                audio_data = await tts_service.synthesize(briefing_script)
                 audio_base64 = base64.b64encode(audio_data).decode('utf-8')
                 logger.info(f"Generated {len(audio_data)} bytes of audio for shift briefing")
                 
-            except Exception as e:
+            except TTSError as e:
                 logger.error(f"Failed to generate audio with ElevenLabs: {e}")
                 # Continue without audio
         
@@ -931,6 +1280,12 @@ async def generate_shift_handoff(request: ShiftHandoffRequest):
         raise HTTPException(status_code=500, detail=f"Shift handoff generation failed: {str(e)}")
 
 
+@api_router.get("/handoff/metrics")
+async def handoff_metrics():
+    """Speech synthesis counters (completed, timeouts, cancellations, mean synthesis time)."""
+    return {"tts": get_tts_service().metrics()}
+
+
 # Include the router in the main app
 app.include_router(api_router)
 
@@ -942,6 +1297,41 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+async def prefetch_weather():
+    get_weather_service().prefetch()
+
+@app.on_event("startup")
+async def start_metar_ingest():
+    get_metar_store().start()
+
+@app.on_event("startup")
+async def warm_notam_indexes():
+    get_notam_engine().warm()
+
+@app.on_event("startup")
+async def start_notam_ingest():
+    ingestor = get_notam_ingestor()
+    if ingestor is not None:
+        logger.info(f"Starting NOTAM ingest from {', '.join(source.name for source in ingestor.sources)}")
+        ingestor.start()
+
+@app.on_event("startup")
+async def persist_chat_sessions():
+    if os.environ.get("CHAT_SESSION_STORE", "memory") == "mongo":
+        get_session_store().persist_to(db.chat_sessions)
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    ingestor = get_notam_ingestor()
+    if ingestor is not None:
+        await ingestor.stop()
+    await get_metar_store().stop()
+    await get_weather_service().aclose()
+    await get_tile_cache().aclose()
+    await get_session_store().aclose()
+    get_tts_service().shutdown()
+    openrouter_client = get_openrouter_client()
+    if openrouter_client is not None:
+        await openrouter_client.aclose()
     client.close()
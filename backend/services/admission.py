@@ -0,0 +1,183 @@
+"""
+Admission control for outbound LLM requests.
+
+Bounds how many OpenRouter requests are in flight at once. Callers beyond the
+limit wait in a priority queue (copilot chat ahead of background work such
+as session summaries and health checks), and are rejected immediately once
+the queue is full or after waiting longer than the queue timeout, instead of
+piling onto a rate-limited upstream.
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, List, Tuple
+
+
+# Lower value is admitted first. Alert and handoff levels are reserved; nothing
+# that calls OpenRouter uses them yet
+PRIORITY_ALERT = 0
+PRIORITY_HANDOFF = 1
+PRIORITY_CHAT = 2
+PRIORITY_BACKGROUND = 3
+PRIORITY_NAMES = {
+    PRIORITY_ALERT: "alert",
+    PRIORITY_HANDOFF: "handoff",
+    PRIORITY_CHAT: "chat",
+    PRIORITY_BACKGROUND: "background",
+}
+
+DEFAULT_MAX_CONCURRENT = 4
+DEFAULT_MAX_QUEUE = 32
+DEFAULT_QUEUE_TIMEOUT_SECONDS = 10.0
+WAIT_SAMPLE_SIZE = 500
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request cannot be admitted (queue full or wait timed out)."""
+    def __init__(self, reason: str, priority: int):
+        self.reason = reason
+        self.priority = priority
+        super().__init__(f"Request rejected ({reason}) at priority {PRIORITY_NAMES.get(priority, priority)}")
+
+
+class AdmissionController:
+    """Bounded concurrency with a priority wait queue and queue-time metrics."""
+
+    def __init__(
+        self,
+        max_concurrent: int = DEFAULT_MAX_CONCURRENT,
+        max_queue: int = DEFAULT_MAX_QUEUE,
+        queue_timeout_seconds: float = DEFAULT_QUEUE_TIMEOUT_SECONDS
+    ):
+        """
+        Initialize admission controller.
+
+        Args:
+            max_concurrent: Requests allowed in flight at once
+            max_queue: Waiting requests beyond which new ones are rejected
+            queue_timeout_seconds: Longest a request may wait for a slot
+        """
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout_seconds = queue_timeout_seconds
+        self._active = 0
+        self._queued = 0
+        # (priority, arrival order, future); abandoned futures are skipped lazily
+        self._heap: List[Tuple[int, int, asyncio.Future]] = []
+        self._order = itertools.count()
+        # Queue waits in milliseconds (admitted requests only)
+        self._waits: Deque[float] = deque(maxlen=WAIT_SAMPLE_SIZE)
+        self.stats: Dict[str, int] = {"admitted": 0, "queued": 0, "rejected_full": 0, "rejected_timeout": 0}
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    @property
+    def queued(self) -> int:
+        return self._queued
+
+    async def acquire(self, priority: int = PRIORITY_CHAT) -> float:
+        """
+        Wait for a slot.
+
+        Args:
+            priority: Queue priority (PRIORITY_* constant, lower first)
+
+        Returns:
+            Time spent queued, in milliseconds
+
+        Raises:
+            AdmissionRejected: If the queue is full or the wait times out
+        """
+        if self._active < self.max_concurrent and self._queued == 0:
+            self._active += 1
+            self._admitted(0.0)
+            return 0.0
+
+        if self._queued >= self.max_queue:
+            self.stats["rejected_full"] += 1
+            raise AdmissionRejected("queue full", priority)
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._heap, (priority, next(self._order), future))
+        self._queued += 1
+        self.stats["queued"] += 1
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(asyncio.shield(future), self.queue_timeout_seconds)
+        except asyncio.TimeoutError:
+            if not self._abandon(future):
+                return self._admitted((time.perf_counter() - started) * 1000)
+            self.stats["rejected_timeout"] += 1
+            raise AdmissionRejected("queue timeout", priority)
+        except asyncio.CancelledError:
+            if not self._abandon(future):
+                # The slot was handed over just as the caller went away
+                self.release()
+            raise
+        return self._admitted((time.perf_counter() - started) * 1000)
+
+    def _abandon(self, future: asyncio.Future) -> bool:
+        """Withdraw a queued waiter; False if it had already been given a slot."""
+        if future.done():
+            return False
+        future.cancel()
+        self._queued -= 1
+        return True
+
+    def _admitted(self, wait_ms: float) -> float:
+        self.stats["admitted"] += 1
+        self._waits.append(wait_ms)
+        return wait_ms
+
+    def release(self) -> None:
+        """Free a slot, handing it straight to the highest-priority waiter."""
+        while self._heap:
+            _, _, future = heapq.heappop(self._heap)
+            if future.done():
+                continue
+            self._queued -= 1
+            future.set_result(None)
+            return
+        self._active -= 1
+
+    @asynccontextmanager
+    async def slot(self, priority: int = PRIORITY_CHAT) -> AsyncIterator[float]:
+        """Hold a slot for the duration of the block; yields the queue wait in ms."""
+        wait_ms = await self.acquire(priority)
+        try:
+            yield wait_ms
+        finally:
+            self.release()
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Current load and queue-time summary.
+
+        Returns:
+            Dict with active/queued counts, counters and p50/p95/max queue wait
+        """
+        samples = sorted(self._waits)
+
+        def percentile(fraction: float) -> Any:
+            if not samples:
+                return None
+            return round(samples[min(len(samples) - 1, int(fraction * len(samples)))], 1)
+
+        return {
+            **self.stats,
+            "active": self._active,
+            "waiting": self._queued,
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "wait_p50_ms": percentile(0.5),
+            "wait_p95_ms": percentile(0.95),
+            "wait_max_ms": round(samples[-1], 1) if samples else None
+        }
@@ -0,0 +1,210 @@
+"""
+Content-addressed cache of synthesized speech for Odin ATC handoffs.
+
+Handoff and shift-briefing scripts often repeat word for word, so audio is
+cached under a hash of the script, voice, model and output format: a memory
+LRU in front of a disk tier pruned to a size budget (least recently used
+first). Concurrent requests for the same audio share a single synthesis.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[1] / "data" / ".cache" / "tts"
+DEFAULT_MEMORY_MB = 32
+DEFAULT_DISK_MB = 256
+# Disk usage is checked after this many writes rather than on every write
+PRUNE_EVERY_WRITES = 50
+
+
+def audio_key(text: str, voice_id: str, model_id: str, output_format: str) -> str:
+    material = json.dumps([text, voice_id, model_id, output_format], separators=(",", ":"))
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class AudioCache:
+    """Two-tier (memory LRU + disk) cache of synthesized audio with single-flight misses."""
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = DEFAULT_CACHE_DIR,
+        memory_bytes: int = DEFAULT_MEMORY_MB * 1024 * 1024,
+        disk_bytes: int = DEFAULT_DISK_MB * 1024 * 1024
+    ):
+        """
+        Initialize audio cache.
+
+        Args:
+            cache_dir: Root of the on-disk tier (memory only when None)
+            memory_bytes: Memory tier budget
+            disk_bytes: Disk tier budget, enforced by periodic pruning
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.memory_bytes = memory_bytes
+        self.disk_bytes = disk_bytes
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_used = 0
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._writes_since_prune = 0
+        self._prune_lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "coalesced": 0}
+
+    # ----- memory tier -----
+
+    def _remember(self, key: str, audio: bytes) -> None:
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_used -= len(previous)
+        self._memory[key] = audio
+        self._memory_used += len(audio)
+        while self._memory_used > self.memory_bytes and len(self._memory) > 1:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_used -= len(evicted)
+
+    # ----- disk tier -----
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / key
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            audio = path.read_bytes()
+            # Touch so pruning evicts least recently used audio first; a file
+            # pruned in between is a miss
+            os.utime(path)
+        except OSError:
+            return None
+        return audio
+
+    def _write_disk(self, key: str, audio: bytes) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        temp_path.write_bytes(audio)
+        os.replace(temp_path, path)
+
+        self._writes_since_prune += 1
+        if self._writes_since_prune >= PRUNE_EVERY_WRITES and self._prune_lock.acquire(blocking=False):
+            try:
+                self._writes_since_prune = 0
+                self.prune_disk()
+            finally:
+                self._prune_lock.release()
+
+    def prune_disk(self) -> int:
+        """Delete least recently used audio until the disk tier fits its budget. Returns bytes freed."""
+        if self.cache_dir is None:
+            return 0
+        entries = []
+        for path in self.cache_dir.glob("*/*"):
+            if "." in path.name:
+                # Temp file of a write in progress
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        used = sum(size for _, size, _ in entries)
+        freed = 0
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if used - freed <= self.disk_bytes:
+                break
+            path.unlink(missing_ok=True)
+            freed += size
+        if freed:
+            logger.info(f"Pruned {freed / 1e6:.1f} MB from TTS audio cache")
+        return freed
+
+    # ----- public -----
+
+    async def _synthesize_and_store(self, key: str, synthesize: Callable[[], Awaitable[bytes]]) -> bytes:
+        audio = await synthesize()
+        self._remember(key, audio)
+        if self.cache_dir is not None:
+            try:
+                await asyncio.to_thread(self._write_disk, key, audio)
+            except OSError as exc:
+                logger.warning(f"Could not write TTS audio to disk cache: {exc}")
+        return audio
+
+    def _settle(self, key: str, task: asyncio.Task) -> None:
+        self._inflight.pop(key, None)
+        if not task.cancelled():
+            # Retrieve the exception so one nobody awaited is not logged by asyncio
+            task.exception()
+
+    async def get_or_synthesize(self, key: str, synthesize: Callable[[], Awaitable[bytes]]) -> Tuple[bytes, str]:
+        """
+        Return audio for `key` and how it was served (HIT, DISK, MISS).
+
+        Args:
+            key: audio_key() of the script, voice, model and format
+            synthesize: Produces the audio on a miss; shared by concurrent callers
+        """
+        audio = self._memory.get(key)
+        if audio is not None:
+            self._memory.move_to_end(key)
+            self.stats["memory_hits"] += 1
+            return audio, "HIT"
+
+        if self.cache_dir is not None:
+            audio = await asyncio.to_thread(self._read_disk, key)
+            if audio is not None:
+                self._remember(key, audio)
+                self.stats["disk_hits"] += 1
+                return audio, "DISK"
+
+        # Single-flight: concurrent misses await one synthesis, run as its own
+        # task so a caller disconnecting does not throw the audio away
+        task = self._inflight.get(key)
+        if task is None:
+            self.stats["misses"] += 1
+            task = asyncio.create_task(self._synthesize_and_store(key, synthesize))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._settle(key, done))
+        else:
+            self.stats["coalesced"] += 1
+        return await asyncio.shield(task), "MISS"
+
+    def metrics(self) -> Dict[str, object]:
+        hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+        lookups = hits + self.stats["misses"] + self.stats["coalesced"]
+        return {
+            **self.stats,
+            "hit_rate": round(hits / lookups, 3) if lookups else None,
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_used,
+            "inflight": len(self._inflight),
+        }
+
+
+# Singleton instance
+_audio_cache_instance: Optional[AudioCache] = None
+
+
+def get_audio_cache() -> AudioCache:
+    """Get or create audio cache singleton instance"""
+    global _audio_cache_instance
+
+    if _audio_cache_instance is None:
+        cache_dir = os.environ.get("TTS_CACHE_DIR")
+        _audio_cache_instance = AudioCache(
+            cache_dir=Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR,
+            memory_bytes=int(float(os.environ.get("TTS_CACHE_MEMORY_MB", DEFAULT_MEMORY_MB)) * 1024 * 1024),
+            disk_bytes=int(float(os.environ.get("TTS_CACHE_DISK_MB", DEFAULT_DISK_MB)) * 1024 * 1024)
+        )
+
+    return _audio_cache_instance
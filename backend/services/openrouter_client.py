@@ -4,11 +4,28 @@ OpenRouter API Client with streaming support for Odin Copilot.
 
 import asyncio
 import httpx
+import importlib.util
 import json
 import logging
-from typing import AsyncIterator, Dict, Any, Optional, List
+import os
+import random
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, Any, Optional, List
 from datetime import datetime, timezone
 
+from services.admission import (
+    DEFAULT_MAX_CONCURRENT,
+    DEFAULT_MAX_QUEUE,
+    DEFAULT_QUEUE_TIMEOUT_SECONDS,
+    PRIORITY_BACKGROUND,
+    PRIORITY_CHAT,
+    AdmissionController,
+    AdmissionRejected,
+)
+from services.response_cache import ResponseCache, get_response_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -30,6 +47,28 @@ class OpenRouterAPIError(OpenRouterError):
         super().__init__(f"OpenRouter API error {status_code}: {message}")
 
 
+class OpenRouterOverloadedError(OpenRouterError):
+    """Raised when the admission controller rejects a request (queue full or wait timed out)."""
+    def __init__(self, reason: str):
+        self.reason = reason
+        super().__init__(f"OpenRouter request rejected: {reason}")
+
+
+TTFT_SAMPLE_SIZE = 200
+LATENCY_SAMPLE_SIZE = 200
+# Hedging waits for this many completion samples before trusting the percentile
+HEDGE_MIN_SAMPLES = 20
+HEDGE_MIN_DELAY_MS = 250.0
+RETRY_BASE_SECONDS = 0.5
+RETRY_CAP_SECONDS = 8.0
+CONNECT_TIMEOUT_SECONDS = 5.0
+MAX_CONNECTIONS = 20
+MAX_KEEPALIVE_CONNECTIONS = 10
+KEEPALIVE_EXPIRY_SECONDS = 120.0
+# HTTP/2 multiplexes concurrent chat requests over one connection; it needs h2
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
 class OpenRouterClient:
     """
     Async client for OpenRouter API with streaming support, retries, and backoff.
@@ -42,7 +81,14 @@ class OpenRouterClient:
         model: str = "anthropic/claude-3.5-sonnet",
         timeout_seconds: float = 15.0,
         max_retries: int = 3,
-        backoff_factor: float = 2.0
+        backoff_factor: float = 3.0,
+        response_cache: Optional[ResponseCache] = None,
+        admission: Optional[AdmissionController] = None,
+        hedge_percentile: Optional[float] = None,
+        fallback_model: Optional[str] = None,
+        retry_base_seconds: float = RETRY_BASE_SECONDS,
+        retry_cap_seconds: float = RETRY_CAP_SECONDS,
+        transport: Optional[httpx.AsyncBaseTransport] = None
     ):
         """
         Initialize OpenRouter client.
@@ -53,7 +99,14 @@ class OpenRouterClient:
             model: Default model to use
             timeout_seconds: Request timeout
             max_retries: Maximum retry attempts
-            backoff_factor: Exponential backoff multiplier
+            backoff_factor: Growth bound of the jittered backoff (sleep <= factor x previous sleep)
+            response_cache: Cache consulted before non-live requests (optional)
+            admission: Concurrency limiter shared by all requests (default limits when None)
+            hedge_percentile: Latency percentile (0-1) after which a hedge request is sent (off when None)
+            fallback_model: Model for hedge requests (defaults to the request's own model)
+            retry_base_seconds: Shortest retry sleep
+            retry_cap_seconds: Longest retry sleep
+            transport: Custom httpx transport (tests and benchmarks)
         """
         self.api_key = api_key
         self.base_url = base_url.rstrip('/')
@@ -61,17 +114,78 @@ class OpenRouterClient:
         self.timeout_seconds = timeout_seconds
         self.max_retries = max_retries
         self.backoff_factor = backoff_factor
+        self.response_cache = response_cache
+        self.admission = admission or AdmissionController()
+        self.hedge_percentile = hedge_percentile
+        self.fallback_model = fallback_model
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_cap_seconds = retry_cap_seconds
+        self.transport = transport
+        # Recent non-streaming completion latencies, in milliseconds
+        self.latency_ms: Deque[float] = deque(maxlen=LATENCY_SAMPLE_SIZE)
+        self.hedge_stats = {"fired": 0, "won": 0}
+        self._client: Optional[httpx.AsyncClient] = None
+        # Recent streaming time-to-first-token samples, in milliseconds
+        self.ttft_ms: Deque[float] = deque(maxlen=TTFT_SAMPLE_SIZE)
         
         if not self.api_key:
             raise ValueError("OpenRouter API key is required")
     
+    def _http(self) -> httpx.AsyncClient:
+        """
+        Shared pooled client, created on first use and closed by aclose().
+        Keeping connections alive (over HTTP/2 when h2 is installed) saves a
+        TLS handshake on every chat turn and retry.
+        """
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout_seconds, connect=CONNECT_TIMEOUT_SECONDS),
+                limits=httpx.Limits(
+                    max_connections=MAX_CONNECTIONS,
+                    max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=KEEPALIVE_EXPIRY_SECONDS
+                ),
+                http2=HTTP2_AVAILABLE,
+                transport=self.transport,
+                headers={
+                    "Authorization": f"Bearer {self.api_key}",
+                    "Content-Type": "application/json",
+                    "HTTP-Referer": "https://odin-atc.emergent.app",
+                    "X-Title": "Odin ATC Console"
+                }
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the pooled connections (app shutdown)."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    @asynccontextmanager
+    async def _admitted(self, priority: int) -> AsyncIterator[None]:
+        """Hold an admission slot, surfacing rejection as OpenRouterOverloadedError."""
+        try:
+            wait_ms = await self.admission.acquire(priority)
+        except AdmissionRejected as e:
+            logger.warning(f"OpenRouter request not admitted: {e}")
+            raise OpenRouterOverloadedError(e.reason) from e
+        if wait_ms >= 1:
+            logger.info(f"OpenRouter request admitted after {wait_ms:.0f}ms in queue")
+        try:
+            yield
+        finally:
+            self.admission.release()
+    
     async def chat_completion(
         self,
         messages: List[Dict[str, str]],
         model: Optional[str] = None,
         temperature: float = 0.7,
         max_tokens: int = 1000,
-        stream: bool = False
+        stream: bool = False,
+        use_cache: bool = True,
+        priority: int = PRIORITY_CHAT
     ) -> Dict[str, Any]:
         """
         Send chat completion request to OpenRouter.
@@ -82,6 +196,8 @@ class OpenRouterClient:
             temperature: Sampling temperature
             max_tokens: Maximum tokens to generate
             stream: Whether to stream response
+            use_cache: Serve from / store to the response cache when configured
+            priority: Admission priority (services.admission PRIORITY_* constant)
             
         Returns:
             Dict with completion response
@@ -89,6 +205,7 @@ class OpenRouterClient:
         Raises:
             OpenRouterTimeoutError: If request times out
             OpenRouterAPIError: If API returns error
+            OpenRouterOverloadedError: If the request is not admitted
         """
         if stream:
             raise ValueError("Use chat_completion_stream for streaming responses")
@@ -96,6 +213,13 @@ class OpenRouterClient:
         use_model = model or self.model
         endpoint = f"{self.base_url}/chat/completions"
         
+        cache_key = self._cache_key(use_cache, use_model, messages, temperature, max_tokens)
+        if cache_key is not None:
+            cached = await self.response_cache.get(cache_key)
+            if cached is not None:
+                logger.info("Chat completion served from response cache")
+                return {**cached, "latency_ms": 0, "cached": True}
+        
         payload = {
             "model": use_model,
             "messages": messages,
@@ -104,76 +228,134 @@ class OpenRouterClient:
             "stream": False
         }
         
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-            "HTTP-Referer": "https://odin-atc.emergent.app",
-            "X-Title": "Odin ATC Console"
-        }
-        
+        last_error: OpenRouterError = OpenRouterError("Max retries exceeded")
+        backoff = self.retry_base_seconds
         for attempt in range(self.max_retries):
             try:
-                async with httpx.AsyncClient(timeout=self.timeout_seconds) as client:
-                    logger.info(f"Sending chat completion to OpenRouter (attempt {attempt + 1}/{self.max_retries})")
-                    start_time = datetime.now(timezone.utc)
-                    
-                    response = await client.post(
-                        endpoint,
-                        json=payload,
-                        headers=headers
-                    )
-                    
-                    latency_ms = (datetime.now(timezone.utc) - start_time).total_seconds() * 1000
-                    logger.info(f"OpenRouter response received in {latency_ms:.0f}ms (status: {response.status_code})")
-                    
-                    if response.status_code == 200:
-                        result = response.json()
-                        result['_latency_ms'] = latency_ms
-                        return self._normalize_response(result)
-                    
-                    # Handle errors
-                    error_text = response.text
-                    logger.error(f"OpenRouter error {response.status_code}: {error_text}")
-                    
-                    # Don't retry on client errors (4xx)
-                    if 400 <= response.status_code < 500:
-                        raise OpenRouterAPIError(response.status_code, error_text)
-                    
-                    # Retry on server errors (5xx)
-                    if attempt < self.max_retries - 1:
-                        wait_time = self.backoff_factor ** attempt
-                        logger.warning(f"Retrying in {wait_time}s...")
-                        await asyncio.sleep(wait_time)
-                        continue
-                    
-                    raise OpenRouterAPIError(response.status_code, error_text)
-                    
+                logger.info(f"Sending chat completion to OpenRouter (attempt {attempt + 1}/{self.max_retries})")
+                normalized = await self._hedged(endpoint, payload, priority)
+                if cache_key is not None and normalized["content"]:
+                    await self.response_cache.put(cache_key, normalized)
+                return normalized
+                
+            except OpenRouterAPIError as e:
+                # Don't retry on client errors (4xx)
+                if 400 <= e.status_code < 500:
+                    raise
+                last_error = e
+            
             except httpx.TimeoutException as e:
                 logger.error(f"OpenRouter request timeout: {e}")
-                if attempt < self.max_retries - 1:
-                    wait_time = self.backoff_factor ** attempt
-                    logger.warning(f"Retrying in {wait_time}s...")
-                    await asyncio.sleep(wait_time)
-                    continue
-                raise OpenRouterTimeoutError("OpenRouter request timed out after retries")
+                last_error = OpenRouterTimeoutError("OpenRouter request timed out after retries")
             
             except httpx.RequestError as e:
                 logger.error(f"OpenRouter request error: {e}")
-                if attempt < self.max_retries - 1:
-                    wait_time = self.backoff_factor ** attempt
-                    logger.warning(f"Retrying in {wait_time}s...")
-                    await asyncio.sleep(wait_time)
-                    continue
-                raise OpenRouterError(f"Request failed: {e}")
+                last_error = OpenRouterError(f"Request failed: {e}")
+            
+            if attempt < self.max_retries - 1:
+                backoff = self._next_backoff(backoff)
+                logger.warning(f"Retrying in {backoff:.2f}s...")
+                await asyncio.sleep(backoff)
+        
+        raise last_error
+    
+    async def _attempt(self, endpoint: str, payload: Dict[str, Any], priority: int) -> Dict[str, Any]:
+        """
+        One admitted POST to OpenRouter.
+        
+        Returns:
+            Normalized response dict
+            
+        Raises:
+            OpenRouterAPIError: On a non-200 response
+            httpx.TimeoutException, httpx.RequestError: On transport failures
+        """
+        client = self._http()
+        # A slot is held per attempt, so backoff sleeps don't block other requests
+        async with self._admitted(priority):
+            start_time = datetime.now(timezone.utc)
+            response = await client.post(endpoint, json=payload)
+            latency_ms = (datetime.now(timezone.utc) - start_time).total_seconds() * 1000
+        logger.info(f"OpenRouter response received in {latency_ms:.0f}ms (status: {response.status_code})")
         
-        raise OpenRouterError("Max retries exceeded")
+        if response.status_code != 200:
+            logger.error(f"OpenRouter error {response.status_code}: {response.text}")
+            raise OpenRouterAPIError(response.status_code, response.text)
+        
+        self.latency_ms.append(latency_ms)
+        result = response.json()
+        result['_latency_ms'] = latency_ms
+        return self._normalize_response(result)
+    
+    async def _hedged(self, endpoint: str, payload: Dict[str, Any], priority: int) -> Dict[str, Any]:
+        """
+        Run one attempt, firing a second (hedge) request, to the fallback model
+        when configured, if the first has not answered within the hedge delay.
+        The first successful response wins and the other request is cancelled.
+        """
+        delay = self._hedge_delay()
+        if delay is None:
+            return await self._attempt(endpoint, payload, priority)
+        
+        primary = asyncio.create_task(self._attempt(endpoint, payload, priority))
+        hedge: Optional[asyncio.Task] = None
+        pending = {primary}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=delay)
+            # Hedging adds load, so skip it while requests are already queueing for admission
+            if not done and self.admission.queued == 0:
+                hedge_payload = {**payload, "model": self.fallback_model} if self.fallback_model else payload
+                hedge = asyncio.create_task(self._attempt(endpoint, hedge_payload, priority))
+                pending.add(hedge)
+                self.hedge_stats["fired"] += 1
+                logger.info(f"Hedging OpenRouter request after {delay * 1000:.0f}ms ({hedge_payload['model']})")
+            
+            while True:
+                for task in done:
+                    if task.exception() is None:
+                        result = task.result()
+                        if task is hedge:
+                            self.hedge_stats["won"] += 1
+                            result["hedged"] = True
+                        return result
+                if not pending:
+                    break
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            
+            # Both failed: report the primary's error
+            raise primary.exception()
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+    
+    def _hedge_delay(self) -> Optional[float]:
+        """
+        Seconds to wait before hedging, from the configured percentile of
+        recent completion latencies (half the timeout until there are enough
+        samples), or None when hedging is off.
+        """
+        if self.hedge_percentile is None:
+            return None
+        if len(self.latency_ms) < HEDGE_MIN_SAMPLES:
+            return self.timeout_seconds / 2
+        samples = sorted(self.latency_ms)
+        index = min(len(samples) - 1, int(self.hedge_percentile * len(samples)))
+        return max(HEDGE_MIN_DELAY_MS, samples[index]) / 1000
+    
+    def _next_backoff(self, previous: float) -> float:
+        """Decorrelated jitter: uniform between the base and backoff_factor x the previous sleep, capped."""
+        return min(self.retry_cap_seconds, random.uniform(self.retry_base_seconds, previous * self.backoff_factor))
     
     async def chat_completion_stream(
         self,
         messages: List[Dict[str, str]],
         model: Optional[str] = None,
         temperature: float = 0.7,
-        max_tokens: int = 1000
+        max_tokens: int = 1000,
+        use_cache: bool = True,
+        priority: int = PRIORITY_CHAT
     ) -> AsyncIterator[str]:
         """
         Stream chat completion from OpenRouter.
@@ -183,17 +365,28 @@ class OpenRouterClient:
             model: Model to use
             temperature: Sampling temperature
             max_tokens: Maximum tokens to generate
+            use_cache: Serve from / store to the response cache when configured
+            priority: Admission priority (services.admission PRIORITY_* constant)
             
         Yields:
-            Token strings as they arrive
+            Token strings as they arrive (a cached reply arrives as one chunk)
             
         Raises:
             OpenRouterTimeoutError: If request times out
             OpenRouterAPIError: If API returns error
+            OpenRouterOverloadedError: If the request is not admitted
         """
         use_model = model or self.model
         endpoint = f"{self.base_url}/chat/completions"
         
+        cache_key = self._cache_key(use_cache, use_model, messages, temperature, max_tokens)
+        if cache_key is not None:
+            cached = await self.response_cache.get(cache_key)
+            if cached is not None and isinstance(cached["content"], str):
+                logger.info("Streaming chat completion served from response cache")
+                yield cached["content"]
+                return
+        
         payload = {
             "model": use_model,
             "messages": messages,
@@ -201,50 +394,58 @@ class OpenRouterClient:
             "max_tokens": max_tokens,
             "stream": True
         }
-        
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-            "HTTP-Referer": "https://odin-atc.emergent.app",
-            "X-Title": "Odin ATC Console"
-        }
+        parts: List[str] = []
         
         try:
-            async with httpx.AsyncClient(timeout=self.timeout_seconds) as client:
-                logger.info("Starting streaming chat completion from OpenRouter")
-                start_time = datetime.now(timezone.utc)
-                
-                async with client.stream("POST", endpoint, json=payload, headers=headers) as response:
-                    if response.status_code != 200:
-                        error_text = await response.aread()
-                        logger.error(f"OpenRouter streaming error {response.status_code}: {error_text}")
-                        raise OpenRouterAPIError(response.status_code, error_text.decode())
+            client = self._http()
+            logger.info("Starting streaming chat completion from OpenRouter")
+            start_time = datetime.now(timezone.utc)
+            started = time.perf_counter()
+            
+            async with self._admitted(priority), client.stream("POST", endpoint, json=payload) as response:
+                if response.status_code != 200:
+                    error_text = await response.aread()
+                    logger.error(f"OpenRouter streaming error {response.status_code}: {error_text}")
+                    raise OpenRouterAPIError(response.status_code, error_text.decode())
                     
-                    token_count = 0
-                    async for line in response.aiter_lines():
-                        if not line.strip():
-                            continue
+                token_count = 0
+                async for line in response.aiter_lines():
+                    if not line.strip():
+                        continue
                         
-                        if line.startswith("data: "):
-                            data = line[6:]  # Remove "data: " prefix
+                    if line.startswith("data: "):
+                        data = line[6:]  # Remove "data: " prefix
+                        
+                        if data == "[DONE]":
+                            latency_ms = (datetime.now(timezone.utc) - start_time).total_seconds() * 1000
+                            logger.info(f"Stream completed: {token_count} tokens in {latency_ms:.0f}ms")
+                            if cache_key is not None and parts:
+                                await self.response_cache.put(cache_key, {
+                                    "content": "".join(parts),
+                                    "role": "assistant",
+                                    "finish_reason": "stop",
+                                    "usage": {},
+                                    "latency_ms": latency_ms
+                                })
+                            break
                             
-                            if data == "[DONE]":
-                                latency_ms = (datetime.now(timezone.utc) - start_time).total_seconds() * 1000
-                                logger.info(f"Stream completed: {token_count} tokens in {latency_ms:.0f}ms")
-                                break
+                        try:
+                            chunk = json.loads(data)
+                            if "choices" in chunk and len(chunk["choices"]) > 0:
+                                delta = chunk["choices"][0].get("delta", {})
+                                content = delta.get("content", "")
+                                if content:
+                                    if token_count == 0:
+                                        ttft_ms = (time.perf_counter() - started) * 1000
+                                        self.ttft_ms.append(ttft_ms)
+                                        logger.info(f"Stream first token after {ttft_ms:.0f}ms")
+                                    token_count += 1
+                                    parts.append(content)
+                                    yield content
+                        except json.JSONDecodeError:
+                            logger.warning(f"Failed to parse streaming chunk: {data[:100]}")
+                            continue
                             
-                            try:
-                                chunk = json.loads(data)
-                                if "choices" in chunk and len(chunk["choices"]) > 0:
-                                    delta = chunk["choices"][0].get("delta", {})
-                                    content = delta.get("content", "")
-                                    if content:
-                                        token_count += 1
-                                        yield content
-                            except json.JSONDecodeError:
-                                logger.warning(f"Failed to parse streaming chunk: {data[:100]}")
-                                continue
-                                
         except httpx.TimeoutException as e:
             logger.error(f"OpenRouter streaming timeout: {e}")
             raise OpenRouterTimeoutError("Streaming request timed out")
@@ -253,6 +454,19 @@ class OpenRouterClient:
             logger.error(f"OpenRouter streaming request error: {e}")
             raise OpenRouterError(f"Streaming request failed: {e}")
     
+    def _cache_key(
+        self,
+        use_cache: bool,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int
+    ) -> Optional[str]:
+        """Response cache key, or None when caching is off or the prompt is live."""
+        if not use_cache or self.response_cache is None:
+            return None
+        return self.response_cache.key_for(model, messages, temperature, max_tokens)
+    
     def _normalize_response(self, response: Dict[str, Any]) -> Dict[str, Any]:
         """
         Normalize OpenRouter response to standard format.
@@ -287,6 +501,51 @@ class OpenRouterClient:
             "latency_ms": response.get("_latency_ms", 0)
         }
     
+    def stream_metrics(self) -> Dict[str, Any]:
+        """
+        Time-to-first-token summary over recent streaming completions.
+
+        Returns:
+            Dict with sample count and p50/p95/max TTFT in milliseconds
+        """
+        samples = sorted(self.ttft_ms)
+        if not samples:
+            return {"samples": 0, "ttft_p50_ms": None, "ttft_p95_ms": None, "ttft_max_ms": None}
+
+        def percentile(fraction: float) -> float:
+            return round(samples[min(len(samples) - 1, int(fraction * len(samples)))], 1)
+
+        return {
+            "samples": len(samples),
+            "ttft_p50_ms": percentile(0.5),
+            "ttft_p95_ms": percentile(0.95),
+            "ttft_max_ms": round(samples[-1], 1)
+        }
+
+    def completion_metrics(self) -> Dict[str, Any]:
+        """
+        Latency summary over recent non-streaming completions, with hedging counters.
+
+        Returns:
+            Dict with sample count, p50/p95/p99 latency in milliseconds and hedges fired/won
+        """
+        samples = sorted(self.latency_ms)
+
+        def percentile(fraction: float) -> Optional[float]:
+            if not samples:
+                return None
+            return round(samples[min(len(samples) - 1, int(fraction * len(samples)))], 1)
+
+        return {
+            "samples": len(samples),
+            "latency_p50_ms": percentile(0.5),
+            "latency_p95_ms": percentile(0.95),
+            "latency_p99_ms": percentile(0.99),
+            "hedge_percentile": self.hedge_percentile,
+            "hedges_fired": self.hedge_stats["fired"],
+            "hedges_won": self.hedge_stats["won"]
+        }
+
     async def health_check(self) -> Dict[str, Any]:
         """
         Check if OpenRouter API is reachable.
@@ -298,7 +557,9 @@ class OpenRouterClient:
             # Send minimal test request
             result = await self.chat_completion(
                 messages=[{"role": "user", "content": "Hi"}],
-                max_tokens=5
+                max_tokens=5,
+                use_cache=False,
+                priority=PRIORITY_BACKGROUND
             )
             return {
                 "healthy": True,
@@ -312,3 +573,44 @@ class OpenRouterClient:
                 "error": str(e),
                 "model": self.model
             }
+
+
+# Singleton instance
+_openrouter_client_instance: Optional[OpenRouterClient] = None
+
+
+def get_openrouter_client() -> Optional[OpenRouterClient]:
+    """
+    Get or create OpenRouter client singleton instance from OPENROUTER_API_KEY
+    (plus optional OPENROUTER_BASE_URL, OPENROUTER_MODEL and
+    OPENROUTER_TIMEOUT_SECONDS, OPENROUTER_MAX_CONCURRENCY,
+    OPENROUTER_MAX_QUEUE and OPENROUTER_QUEUE_TIMEOUT_SECONDS for admission
+    control, and OPENROUTER_HEDGE_PERCENTILE and OPENROUTER_FALLBACK_MODEL
+    for hedging). Returns None when no key is configured.
+    """
+    global _openrouter_client_instance
+
+    if _openrouter_client_instance is None:
+        api_key = os.environ.get("OPENROUTER_API_KEY", "")
+        if not api_key:
+            return None
+
+        hedge_percentile = os.environ.get("OPENROUTER_HEDGE_PERCENTILE")
+        _openrouter_client_instance = OpenRouterClient(
+            api_key=api_key,
+            base_url=os.environ.get("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1"),
+            model=os.environ.get("OPENROUTER_MODEL", "anthropic/claude-3.5-sonnet"),
+            timeout_seconds=float(os.environ.get("OPENROUTER_TIMEOUT_SECONDS", 15.0)),
+            response_cache=get_response_cache() if os.environ.get("COPILOT_CACHE", "on") != "off" else None,
+            hedge_percentile=float(hedge_percentile) if hedge_percentile else None,
+            fallback_model=os.environ.get("OPENROUTER_FALLBACK_MODEL") or None,
+            admission=AdmissionController(
+                max_concurrent=int(os.environ.get("OPENROUTER_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENT)),
+                max_queue=int(os.environ.get("OPENROUTER_MAX_QUEUE", DEFAULT_MAX_QUEUE)),
+                queue_timeout_seconds=float(
+                    os.environ.get("OPENROUTER_QUEUE_TIMEOUT_SECONDS", DEFAULT_QUEUE_TIMEOUT_SECONDS)
+                )
+            )
+        )
+
+    return _openrouter_client_instance
@@ -0,0 +1,235 @@
+"""
+Prompt-response cache for Odin Copilot.
+
+Completed OpenRouter responses are cached under a hash of the model,
+sampling parameters and normalized message content, so repeated procedural
+questions ("phraseology for go-around") are answered without a round trip.
+
+Prompts that carry live state bypass the cache: anything tagged with
+LIVE_CONTEXT_MARKER, and console context that focuses a specific aircraft
+or facility. A console context with no focus is stripped from the key, since
+it does not change a procedural answer.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_TTL_SECONDS = 6 * 3600.0
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_MAX_MB = 16
+DEFAULT_DISK_MAX_ENTRIES = 5000
+# Disk entries are pruned after this many writes rather than on every write
+PRUNE_EVERY_WRITES = 100
+
+LIVE_CONTEXT_MARKER = "[[Live Context]]"
+CONSOLE_CONTEXT_MARKER = "[[Console Context]]"
+_CONSOLE_CONTEXT_RE = re.compile(r"\[\[Console Context\]\]\n(?P<body>.*?)(?:\n\n|$)", re.DOTALL)
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_content(content: str) -> Optional[str]:
+    """
+    Normalize message text for the cache key, or None if it depends on live
+    state. Case, whitespace and trailing punctuation are ignored.
+    """
+    if LIVE_CONTEXT_MARKER in content:
+        return None
+
+    match = _CONSOLE_CONTEXT_RE.search(content)
+    if match is not None:
+        if "Focus: none" not in match.group("body"):
+            return None
+        content = content[:match.start()] + content[match.end():]
+        content = content.strip()
+        if content.startswith("User:"):
+            content = content[len("User:"):]
+
+    return _WHITESPACE_RE.sub(" ", content).strip().rstrip("?.!").casefold()
+
+
+class ResponseCache:
+    """LRU + TTL cache of normalized chat completions with an optional disk tier."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024,
+        disk_dir: Optional[Path] = None,
+        disk_max_entries: int = DEFAULT_DISK_MAX_ENTRIES
+    ):
+        """
+        Initialize response cache.
+
+        Args:
+            ttl_seconds: Age after which a cached response is no longer served
+            max_entries: Memory tier entry limit
+            max_bytes: Memory tier size limit (serialized responses)
+            disk_dir: Directory for the disk tier (memory only when None)
+            disk_max_entries: Disk tier entry limit, oldest pruned first
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self.disk_max_entries = disk_max_entries
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._bytes = 0
+        self._writes_since_prune = 0
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0, "bypassed": 0, "stored": 0}
+
+    def key_for(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int
+    ) -> Optional[str]:
+        """
+        Cache key for a request, or None (counted as a bypass) when any
+        message depends on live context.
+        """
+        normalized = []
+        for message in messages:
+            content = normalize_content(str(message.get("content", "")))
+            if content is None:
+                self.stats["bypassed"] += 1
+                return None
+            normalized.append([message.get("role", "user"), content])
+
+        material = json.dumps(
+            {"model": model, "temperature": temperature, "max_tokens": max_tokens, "messages": normalized},
+            separators=(",", ":")
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    # ----- memory tier -----
+
+    def _remember(self, key: str, entry: Dict[str, Any]) -> None:
+        size = len(json.dumps(entry["response"], default=str))
+        self._forget(key)
+        self._entries[key] = entry
+        self._sizes[key] = size
+        self._bytes += size
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            self._forget(next(iter(self._entries)))
+
+    def _forget(self, key: str) -> None:
+        if self._entries.pop(key, None) is not None:
+            self._bytes -= self._sizes.pop(key)
+
+    # ----- disk tier -----
+
+    def _disk_path(self, key: str) -> Path:
+        return self.disk_dir / key[:2] / f"{key}.json"
+
+    def _read_disk(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            return json.loads(self._disk_path(key).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def _write_disk(self, key: str, entry: Dict[str, Any]) -> None:
+        path = self._disk_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        temp_path.write_text(json.dumps(entry, default=str), encoding="utf-8")
+        os.replace(temp_path, path)
+
+        self._writes_since_prune += 1
+        if self._writes_since_prune >= PRUNE_EVERY_WRITES:
+            self._writes_since_prune = 0
+            self._prune_disk()
+
+    def _prune_disk(self) -> None:
+        """Delete expired entries, then the oldest beyond disk_max_entries."""
+        entries = []
+        cutoff = time.time() - self.ttl_seconds
+        for path in self.disk_dir.glob("*/*.json"):
+            try:
+                modified = path.stat().st_mtime
+            except OSError:
+                continue
+            if modified < cutoff:
+                path.unlink(missing_ok=True)
+            else:
+                entries.append((modified, path))
+        entries.sort()
+        for _, path in entries[:max(0, len(entries) - self.disk_max_entries)]:
+            path.unlink(missing_ok=True)
+
+    # ----- public -----
+
+    def _fresh(self, entry: Optional[Dict[str, Any]]) -> bool:
+        return entry is not None and time.time() - entry["created_at"] < self.ttl_seconds
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached response for `key`, or None on a miss or expired entry."""
+        entry = self._entries.get(key)
+        if self._fresh(entry):
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return entry["response"]
+        self._forget(key)
+
+        if self.disk_dir is not None:
+            entry = await asyncio.to_thread(self._read_disk, key)
+            if self._fresh(entry):
+                self._remember(key, entry)
+                self.stats["disk_hits"] += 1
+                return entry["response"]
+
+        self.stats["misses"] += 1
+        return None
+
+    async def put(self, key: str, response: Dict[str, Any]) -> None:
+        entry = {"created_at": time.time(), "response": response}
+        self._remember(key, entry)
+        self.stats["stored"] += 1
+        if self.disk_dir is not None:
+            try:
+                await asyncio.to_thread(self._write_disk, key, entry)
+            except OSError as e:
+                logger.warning(f"Could not write copilot cache entry to disk: {e}")
+
+    def metrics(self) -> Dict[str, Any]:
+        hits = self.stats["hits"] + self.stats["disk_hits"]
+        lookups = hits + self.stats["misses"]
+        return {
+            **self.stats,
+            "hit_rate": round(hits / lookups, 3) if lookups else None,
+            "entries": len(self._entries),
+            "bytes": self._bytes
+        }
+
+
+# Singleton instance
+_response_cache_instance: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Get or create response cache singleton instance"""
+    global _response_cache_instance
+
+    if _response_cache_instance is None:
+        disk_dir = os.environ.get("COPILOT_CACHE_DIR")
+        _response_cache_instance = ResponseCache(
+            ttl_seconds=float(os.environ.get("COPILOT_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS)),
+            max_entries=int(os.environ.get("COPILOT_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)),
+            max_bytes=int(float(os.environ.get("COPILOT_CACHE_MAX_MB", DEFAULT_MAX_MB)) * 1024 * 1024),
+            disk_dir=Path(disk_dir) if disk_dir else None
+        )
+
+    return _response_cache_instance
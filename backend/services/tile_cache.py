@@ -0,0 +1,388 @@
+"""
+Caching tile proxy for Odin ATC Console.
+
+Map and weather overlay tiles are fetched once from the upstream provider and
+shared by every console. Two cache tiers sit in front of the upstream:
+
+    memory  byte-bounded LRU of recently served tiles
+    disk    content-addressed blobs (sha256 of the body) plus a small JSON
+            metadata file per tile, so identical tiles such as empty radar
+            or open ocean are stored once
+
+Each source has its own TTL. Expired tiles are revalidated with
+If-None-Match / If-Modified-Since, and concurrent misses for the same tile
+share a single upstream request.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[1] / "data" / ".cache" / "tiles"
+DEFAULT_MEMORY_MB = 64
+DEFAULT_DISK_MB = 512
+DEFAULT_CONCURRENCY = 16
+REQUEST_TIMEOUT_SECONDS = 15.0
+# Disk usage is checked after this many new blobs rather than on every write
+PRUNE_EVERY_WRITES = 200
+
+
+@dataclass(frozen=True)
+class TileSource:
+    """An upstream tile provider and the paths the proxy may request from it."""
+
+    url: str
+    path_pattern: str
+    ttl_seconds: float
+    key_env: Optional[str] = None
+
+
+TILE_SOURCES: Dict[str, TileSource] = {
+    "maptiler-dark": TileSource(
+        url="https://api.maptiler.com/maps/darkmatter/{path}",
+        path_pattern=r"\d{1,2}/\d{1,7}/\d{1,7}\.png",
+        ttl_seconds=7 * 24 * 3600.0,
+        key_env="MAPTILER_KEY",
+    ),
+    "rainviewer": TileSource(
+        url="https://tilecache.rainviewer.com/{path}",
+        path_pattern=r"v2/(radar|satellite)/[0-9a-z]+/\d{3}/\d{1,2}/\d{1,7}/\d{1,7}/\d+/\d_\d\.png",
+        ttl_seconds=600.0,
+    ),
+    "rainviewer-api": TileSource(
+        url="https://api.rainviewer.com/public/{path}",
+        path_pattern=r"weather-maps\.json",
+        ttl_seconds=60.0,
+    ),
+}
+
+
+class TileError(Exception):
+    """Upstream tile fetch failed; `status_code` is what the proxy should return."""
+
+    def __init__(self, message: str, status_code: int = 502):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+@dataclass
+class TileMeta:
+    digest: str
+    content_type: str
+    fetched_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+@dataclass
+class Tile:
+    meta: TileMeta
+    body: bytes
+
+
+class TileCache:
+    """Two-tier (memory LRU + content-addressed disk) cache in front of tile upstreams."""
+
+    def __init__(
+        self,
+        sources: Dict[str, TileSource],
+        cache_dir: Path = DEFAULT_CACHE_DIR,
+        memory_bytes: int = DEFAULT_MEMORY_MB * 1024 * 1024,
+        disk_bytes: int = DEFAULT_DISK_MB * 1024 * 1024,
+        concurrency: int = DEFAULT_CONCURRENCY
+    ):
+        """
+        Initialize tile cache.
+
+        Args:
+            sources: Source name -> upstream definition
+            cache_dir: Root of the on-disk tier
+            memory_bytes: Memory tier budget (tile bodies)
+            disk_bytes: Disk tier budget (blobs), enforced by periodic pruning
+            concurrency: Maximum simultaneous upstream requests
+        """
+        self.sources = sources
+        self.cache_dir = Path(cache_dir)
+        self.memory_bytes = memory_bytes
+        self.disk_bytes = disk_bytes
+        self._patterns = {name: re.compile(source.path_pattern) for name, source in sources.items()}
+        self._memory: "OrderedDict[str, Tile]" = OrderedDict()
+        self._memory_used = 0
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._semaphore = asyncio.Semaphore(max(1, concurrency))
+        self._client: Optional[httpx.AsyncClient] = None
+        self._writes_since_prune = 0
+        self._prune_lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "revalidated": 0, "coalesced": 0, "stale_served": 0}
+
+    def _http(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=REQUEST_TIMEOUT_SECONDS, follow_redirects=True)
+        return self._client
+
+    # ----- memory tier -----
+
+    def _remember(self, key: str, tile: Tile) -> None:
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_used -= len(previous.body)
+        self._memory[key] = tile
+        self._memory_used += len(tile.body)
+        while self._memory_used > self.memory_bytes and len(self._memory) > 1:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_used -= len(evicted.body)
+
+    # ----- disk tier -----
+
+    def _meta_path(self, key: str) -> Path:
+        name = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return self.cache_dir / "meta" / name[:2] / f"{name}.json"
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.cache_dir / "blobs" / digest[:2] / digest
+
+    def _read_disk(self, key: str) -> Optional[Tile]:
+        meta_path = self._meta_path(key)
+        try:
+            meta = TileMeta(**json.loads(meta_path.read_text(encoding="utf-8")))
+            body = self._blob_path(meta.digest).read_bytes()
+            # Touch so disk pruning evicts least recently used tiles first; an
+            # entry pruned in between is a miss
+            os.utime(meta_path)
+        except (OSError, ValueError, TypeError):
+            return None
+        return Tile(meta, body)
+
+    def _write_disk(self, key: str, tile: Tile) -> None:
+        blob_path = self._blob_path(tile.meta.digest)
+        if not blob_path.exists():
+            blob_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = blob_path.with_name(f"{blob_path.name}.{os.getpid()}.tmp")
+            temp_path.write_bytes(tile.body)
+            os.replace(temp_path, blob_path)
+            self._writes_since_prune += 1
+
+        meta_path = self._meta_path(key)
+        meta_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = meta_path.with_name(f"{meta_path.name}.{os.getpid()}.tmp")
+        temp_path.write_text(json.dumps(asdict(tile.meta)), encoding="utf-8")
+        os.replace(temp_path, meta_path)
+
+        if self._writes_since_prune >= PRUNE_EVERY_WRITES and self._prune_lock.acquire(blocking=False):
+            try:
+                self._writes_since_prune = 0
+                self.prune_disk()
+            finally:
+                self._prune_lock.release()
+
+    def prune_disk(self) -> int:
+        """
+        Drop least recently used tiles until the blob store fits the disk
+        budget, then delete blobs no tile refers to. Returns bytes freed.
+        """
+        metas = []
+        for meta_path in self.cache_dir.glob("meta/*/*.json"):
+            try:
+                digest = json.loads(meta_path.read_text(encoding="utf-8"))["digest"]
+                metas.append((meta_path.stat().st_mtime, meta_path, digest))
+            except (OSError, ValueError, KeyError):
+                meta_path.unlink(missing_ok=True)
+
+        blob_sizes: Dict[str, int] = {}
+        for blob_path in self.cache_dir.glob("blobs/*/*"):
+            if "." in blob_path.name:
+                # Temp file of a write in progress
+                continue
+            try:
+                blob_sizes[blob_path.name] = blob_path.stat().st_size
+            except OSError:
+                continue
+        used = sum(blob_sizes.values())
+
+        references: Dict[str, int] = {}
+        for _, _, digest in metas:
+            references[digest] = references.get(digest, 0) + 1
+
+        metas.sort()
+        evicted = 0
+        for _, meta_path, digest in metas:
+            if used - evicted <= self.disk_bytes:
+                break
+            meta_path.unlink(missing_ok=True)
+            references[digest] -= 1
+            if references[digest] == 0:
+                evicted += blob_sizes.get(digest, 0)
+
+        freed = 0
+        for digest, size in blob_sizes.items():
+            if references.get(digest, 0) == 0:
+                self._blob_path(digest).unlink(missing_ok=True)
+                freed += size
+        if freed:
+            logger.info(f"Pruned {freed / 1e6:.1f} MB from tile cache")
+        return freed
+
+    # ----- upstream -----
+
+    def _upstream_url(self, name: str, path: str, client_key: Optional[str]) -> str:
+        source = self.sources[name]
+        url = source.url.format(path=path)
+        if source.key_env:
+            key = os.environ.get(source.key_env) or client_key
+            if not key:
+                raise TileError(f"{source.key_env} is not configured", status_code=503)
+            url += f"?key={key}"
+        return url
+
+    async def _fetch(
+        self, name: str, path: str, key: str, cached: Optional[Tile], client_key: Optional[str]
+    ) -> Tuple[Tile, str]:
+        headers = {}
+        if cached is not None:
+            if cached.meta.etag:
+                headers["If-None-Match"] = cached.meta.etag
+            if cached.meta.last_modified:
+                headers["If-Modified-Since"] = cached.meta.last_modified
+
+        async with self._semaphore:
+            try:
+                response = await self._http().get(self._upstream_url(name, path, client_key), headers=headers)
+            except httpx.HTTPError as exc:
+                raise TileError(f"{name} upstream request failed: {exc}") from exc
+
+        now = time.time()
+        if response.status_code == 304 and cached is not None:
+            self.stats["revalidated"] += 1
+            tile = Tile(TileMeta(**{**asdict(cached.meta), "fetched_at": now}), cached.body)
+            status = "REVALIDATED"
+        elif response.status_code == 200:
+            self.stats["misses"] += 1
+            body = response.content
+            tile = Tile(TileMeta(
+                digest=hashlib.sha256(body).hexdigest(),
+                content_type=response.headers.get("content-type", "application/octet-stream"),
+                fetched_at=now,
+                etag=response.headers.get("etag"),
+                last_modified=response.headers.get("last-modified"),
+            ), body)
+            status = "MISS"
+        else:
+            code = 404 if response.status_code == 404 else 502
+            raise TileError(f"{name} upstream returned {response.status_code}", status_code=code)
+
+        self._remember(key, tile)
+        try:
+            await asyncio.to_thread(self._write_disk, key, tile)
+        except OSError as exc:
+            logger.warning(f"Could not write tile {key} to disk cache: {exc}")
+        return tile, status
+
+    def _settle(self, key: str, task: asyncio.Task) -> None:
+        self._inflight.pop(key, None)
+        if not task.cancelled():
+            # Retrieve the exception so one nobody awaited is not logged by asyncio
+            task.exception()
+
+    # ----- public -----
+
+    def validate(self, name: str, path: str) -> None:
+        pattern = self._patterns.get(name)
+        if pattern is None:
+            raise TileError(f"Unknown tile source {name}", status_code=404)
+        if not pattern.fullmatch(path):
+            raise TileError(f"Invalid tile path for {name}", status_code=400)
+
+    def ttl_remaining(self, name: str, tile: Tile) -> float:
+        return max(0.0, tile.meta.fetched_at + self.sources[name].ttl_seconds - time.time())
+
+    async def get(self, name: str, path: str, client_key: Optional[str] = None) -> Tuple[Tile, str]:
+        """
+        Return a tile and how it was served (HIT, DISK, MISS, REVALIDATED, STALE).
+
+        Args:
+            name: Source name from TILE_SOURCES
+            path: Source-relative tile path, validated against the source pattern
+            client_key: API key supplied by the browser, used when the server has none
+        """
+        self.validate(name, path)
+        key = f"{name}/{path}"
+
+        tile = self._memory.get(key)
+        status = "HIT"
+        if tile is not None:
+            self._memory.move_to_end(key)
+        else:
+            tile = await asyncio.to_thread(self._read_disk, key)
+            status = "DISK"
+            if tile is not None:
+                self._remember(key, tile)
+
+        if tile is not None and self.ttl_remaining(name, tile) > 0:
+            self.stats["memory_hits" if status == "HIT" else "disk_hits"] += 1
+            return tile, status
+
+        # Coalesce: every concurrent miss for this tile awaits the same fetch,
+        # which runs as its own task so one client disconnecting cannot cancel it
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch(name, path, key, tile, client_key))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._settle(key, done))
+        else:
+            self.stats["coalesced"] += 1
+
+        try:
+            return await asyncio.shield(task)
+        except TileError as exc:
+            if tile is not None and exc.status_code != 404:
+                self.stats["stale_served"] += 1
+                return tile, "STALE"
+            raise
+
+    def metrics(self) -> Dict[str, object]:
+        return {
+            **self.stats,
+            "memory_tiles": len(self._memory),
+            "memory_bytes": self._memory_used,
+            "inflight": len(self._inflight),
+        }
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+# Singleton instance
+_tile_cache_instance: Optional[TileCache] = None
+
+
+def get_tile_cache() -> TileCache:
+    """Get or create tile cache singleton instance"""
+    global _tile_cache_instance
+
+    if _tile_cache_instance is None:
+        cache_dir = os.environ.get("TILE_CACHE_DIR")
+        _tile_cache_instance = TileCache(
+            TILE_SOURCES,
+            cache_dir=Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR,
+            memory_bytes=int(float(os.environ.get("TILE_CACHE_MEMORY_MB", DEFAULT_MEMORY_MB)) * 1024 * 1024),
+            disk_bytes=int(float(os.environ.get("TILE_CACHE_DISK_MB", DEFAULT_DISK_MB)) * 1024 * 1024),
+            concurrency=int(os.environ.get("TILE_UPSTREAM_CONCURRENCY", DEFAULT_CONCURRENCY))
+        )
+
+    return _tile_cache_instance
@@ -0,0 +1,220 @@
+"""
+ElevenLabs speech synthesis for Odin ATC handoffs.
+
+The ElevenLabs SDK client is synchronous and streams audio as an iterator of
+chunks, so synthesis runs on a small bounded thread pool instead of the event
+loop. Chunks are accumulated in a BytesIO buffer, each synthesis has a
+timeout, and a cancelled or timed-out request signals its worker thread to
+stop reading the upstream stream at the next chunk. Repeated scripts are
+served from the content-addressed audio cache when one is configured.
+"""
+
+import asyncio
+import io
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+from services.audio_cache import AudioCache, audio_key, get_audio_cache
+
+logger = logging.getLogger(__name__)
+
+
+# Rachel: clear, authoritative delivery suited to ATC phraseology
+DEFAULT_VOICE_ID = "21m00Tcm4TlvDq8ikWAM"
+DEFAULT_MODEL_ID = "eleven_monolingual_v1"
+DEFAULT_OUTPUT_FORMAT = "mp3_44100_128"
+DEFAULT_MAX_WORKERS = 2
+DEFAULT_TIMEOUT_SECONDS = 20.0
+
+
+class TTSError(Exception):
+    """Base exception for speech synthesis errors."""
+    pass
+
+
+class TTSTimeoutError(TTSError):
+    """Raised when synthesis does not finish within the timeout."""
+    pass
+
+
+class TTSCancelledError(TTSError):
+    """Raised in the worker thread when its request was cancelled."""
+    pass
+
+
+class TTSService:
+    """Runs ElevenLabs text-to-speech off the event loop on a bounded thread pool."""
+
+    def __init__(
+        self,
+        client: Any = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        timeout_seconds: float = DEFAULT_TIMEOUT_SECONDS,
+        cache: Optional[AudioCache] = None
+    ):
+        """
+        Initialize TTS service.
+
+        Args:
+            client: ElevenLabs client (synthesis unavailable when None)
+            max_workers: Syntheses that may run at once; others wait for a thread
+            timeout_seconds: Longest a synthesis may take, including time waiting for a thread
+            cache: Audio cache consulted before synthesizing (optional)
+        """
+        self.client = client
+        self.timeout_seconds = timeout_seconds
+        self.cache = cache
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tts")
+        self.stats = {"completed": 0, "timeouts": 0, "cancelled": 0, "errors": 0, "bytes": 0}
+        self._synthesis_ms = 0.0
+
+    @property
+    def available(self) -> bool:
+        return self.client is not None
+
+    def _synthesize_blocking(
+        self,
+        text: str,
+        voice_id: str,
+        model_id: str,
+        output_format: str,
+        cancel: threading.Event
+    ) -> bytes:
+        """Worker-thread body: stream audio chunks into a buffer until done or cancelled."""
+        if cancel.is_set():
+            raise TTSCancelledError("Synthesis cancelled before it started")
+        audio = self.client.text_to_speech.convert(
+            text=text,
+            voice_id=voice_id,
+            model_id=model_id,
+            output_format=output_format
+        )
+        buffer = io.BytesIO()
+        try:
+            for chunk in audio:
+                if cancel.is_set():
+                    raise TTSCancelledError("Synthesis cancelled")
+                buffer.write(chunk)
+        finally:
+            # Closes the upstream HTTP stream when we stop early
+            close = getattr(audio, "close", None)
+            if close is not None:
+                close()
+        return buffer.getvalue()
+
+    async def synthesize(
+        self,
+        text: str,
+        voice_id: str = DEFAULT_VOICE_ID,
+        model_id: str = DEFAULT_MODEL_ID,
+        output_format: str = DEFAULT_OUTPUT_FORMAT
+    ) -> bytes:
+        """
+        Synthesize speech without blocking the event loop, or return cached
+        audio for an identical script, voice, model and format.
+
+        Args:
+            text: Script to speak
+            voice_id: ElevenLabs voice
+            model_id: ElevenLabs model
+            output_format: ElevenLabs output format
+
+        Returns:
+            Encoded audio bytes
+
+        Raises:
+            TTSError: If synthesis is unavailable or fails
+            TTSTimeoutError: If synthesis exceeds the timeout
+        """
+        if self.client is None:
+            raise TTSError("ElevenLabs is not configured")
+        if self.cache is None:
+            return await self._synthesize(text, voice_id, model_id, output_format)
+
+        key = audio_key(text, voice_id, model_id, output_format)
+        audio, status = await self.cache.get_or_synthesize(
+            key, lambda: self._synthesize(text, voice_id, model_id, output_format)
+        )
+        if status != "MISS":
+            logger.info(f"Served {len(audio)} bytes of cached audio ({status})")
+        return audio
+
+    async def _synthesize(self, text: str, voice_id: str, model_id: str, output_format: str) -> bytes:
+        cancel = threading.Event()
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        future = loop.run_in_executor(
+            self._executor, self._synthesize_blocking, text, voice_id, model_id, output_format, cancel
+        )
+        try:
+            audio = await asyncio.wait_for(future, self.timeout_seconds)
+        except asyncio.TimeoutError:
+            cancel.set()
+            self.stats["timeouts"] += 1
+            raise TTSTimeoutError(f"Speech synthesis timed out after {self.timeout_seconds:g}s")
+        except asyncio.CancelledError:
+            cancel.set()
+            self.stats["cancelled"] += 1
+            raise
+        except TTSError:
+            raise
+        except Exception as e:
+            self.stats["errors"] += 1
+            raise TTSError(f"Speech synthesis failed: {e}") from e
+
+        self.stats["completed"] += 1
+        self.stats["bytes"] += len(audio)
+        self._synthesis_ms += (time.perf_counter() - started) * 1000
+        return audio
+
+    def metrics(self) -> Dict[str, Any]:
+        completed = self.stats["completed"]
+        return {
+            **self.stats,
+            "available": self.available,
+            "mean_synthesis_ms": round(self._synthesis_ms / completed, 1) if completed else None,
+            "cache": self.cache.metrics() if self.cache is not None else None
+        }
+
+    def shutdown(self) -> None:
+        """Stop accepting work; queued syntheses are dropped (app shutdown)."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Singleton instance
+_tts_service_instance: Optional[TTSService] = None
+
+
+def get_tts_service() -> TTSService:
+    """
+    Get or create TTS service singleton instance from ELEVENLABS_API_KEY (plus
+    optional TTS_MAX_WORKERS and TTS_TIMEOUT_SECONDS; TTS_CACHE=off disables
+    the audio cache). Synthesis is unavailable when no key is configured or
+    the SDK cannot be loaded.
+    """
+    global _tts_service_instance
+
+    if _tts_service_instance is None:
+        timeout_seconds = float(os.environ.get("TTS_TIMEOUT_SECONDS", DEFAULT_TIMEOUT_SECONDS))
+        client = None
+        api_key = os.environ.get("ELEVENLABS_API_KEY", "")
+        if api_key:
+            try:
+                from elevenlabs import ElevenLabs
+                client = ElevenLabs(api_key=api_key, timeout=timeout_seconds)
+                logger.info("ElevenLabs client initialized successfully")
+            except Exception as e:
+                logger.error(f"Failed to initialize ElevenLabs client: {e}")
+
+        _tts_service_instance = TTSService(
+            client=client,
+            max_workers=int(os.environ.get("TTS_MAX_WORKERS", DEFAULT_MAX_WORKERS)),
+            timeout_seconds=timeout_seconds,
+            cache=get_audio_cache() if os.environ.get("TTS_CACHE", "on") != "off" else None
+        )
+
+    return _tts_service_instance
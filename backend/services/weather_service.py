@@ -0,0 +1,201 @@
+"""
+Cached airport weather service for Odin ATC Console.
+
+Current conditions are fetched from WeatherAPI for every configured airport
+concurrently and kept in a TTL store. Reads are served from the store; once an
+entry is older than the TTL the stale value is still returned while a single
+shared refresh revalidates it in the background.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+WEATHERAPI_URL = "https://api.weatherapi.com/v1/current.json"
+DEFAULT_AIRPORTS = "KSFO=37.6213,-122.3790,KOAK=37.7214,-122.2208,KSJC=37.3639,-121.9289"
+DEFAULT_TTL_SECONDS = 600.0
+DEFAULT_CONCURRENCY = 8
+REQUEST_TIMEOUT_SECONDS = 10.0
+# After a refresh where every airport failed, retry sooner than the full TTL
+FAILED_RETRY_SECONDS = 60.0
+UNAVAILABLE = {"condition": "—"}
+
+
+def _is_number(text: str) -> bool:
+    try:
+        float(text)
+        return True
+    except ValueError:
+        return False
+
+
+def parse_airports(spec: str) -> Dict[str, str]:
+    """
+    Parse an airport list such as "KSFO=37.6213,-122.3790,KLAX,KDEN".
+
+    Each entry is an ICAO code, optionally followed by `=lat,lon`; codes without
+    coordinates are looked up by WeatherAPI through its `metar:` query prefix.
+
+    Returns:
+        Dict mapping airport code to WeatherAPI query string
+    """
+    airports: Dict[str, str] = {}
+    tokens = [token.strip() for token in spec.split(",") if token.strip()]
+    index = 0
+    while index < len(tokens):
+        code, _, latitude = tokens[index].partition("=")
+        code = code.strip().upper()
+        if latitude and index + 1 < len(tokens) and _is_number(tokens[index + 1]):
+            airports[code] = f"{latitude.strip()},{tokens[index + 1]}"
+            index += 2
+        else:
+            airports[code] = f"metar:{code}"
+            index += 1
+    return airports
+
+
+class WeatherService:
+    """TTL-cached, stale-while-revalidate weather store for a set of airports."""
+
+    def __init__(
+        self,
+        api_key: Optional[str],
+        airports: Dict[str, str],
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        concurrency: int = DEFAULT_CONCURRENCY
+    ):
+        """
+        Initialize weather service.
+
+        Args:
+            api_key: WeatherAPI key (service reports unavailable without one)
+            airports: Airport code -> WeatherAPI query string
+            ttl_seconds: Age after which entries are revalidated
+            concurrency: Maximum simultaneous upstream requests
+        """
+        self.api_key = api_key
+        self.airports = airports
+        self.ttl_seconds = ttl_seconds
+        self._semaphore = asyncio.Semaphore(max(1, concurrency))
+        self._client: Optional[httpx.AsyncClient] = None
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._fetched_at: Optional[float] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    def _http(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=REQUEST_TIMEOUT_SECONDS)
+        return self._client
+
+    async def _fetch_airport(self, code: str, query: str) -> Optional[Dict[str, Any]]:
+        async with self._semaphore:
+            try:
+                params = {"key": self.api_key, "q": query, "aqi": "no"}
+                response = await self._http().get(WEATHERAPI_URL, params=params)
+
+                if response.status_code != 200:
+                    logger.error(f"Weather API returned {response.status_code} for {code}")
+                    return None
+
+                current = response.json()["current"]
+                return {
+                    "temp_c": current["temp_c"],
+                    "condition": current["condition"]["text"],
+                    "wind_kph": current["wind_kph"],
+                    "wind_dir": current["wind_dir"],
+                    "visibility_km": current["vis_km"]
+                }
+            except Exception as e:
+                logger.error(f"Failed to fetch weather for {code}: {e}")
+                return None
+
+    async def _refresh(self) -> None:
+        codes = list(self.airports)
+        results = await asyncio.gather(
+            *(self._fetch_airport(code, self.airports[code]) for code in codes)
+        )
+        now = time.time()
+        for code, result in zip(codes, results):
+            if result is not None:
+                self._entries[code] = {**result, "fetched_at": int(now)}
+            elif code not in self._entries:
+                # Keep the last good observation on failure; placeholder only if none
+                self._entries[code] = dict(UNAVAILABLE)
+
+        if any(result is not None for result in results):
+            self._fetched_at = now
+        else:
+            self._fetched_at = now - max(0.0, self.ttl_seconds - FAILED_RETRY_SECONDS)
+
+    def _start_refresh(self) -> asyncio.Task:
+        """Single-flight: every caller shares the one in-progress refresh."""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh())
+        return self._refresh_task
+
+    def is_stale(self) -> bool:
+        return self._fetched_at is None or time.time() - self._fetched_at >= self.ttl_seconds
+
+    async def get_current(self) -> Dict[str, Any]:
+        """
+        Current weather for all airports.
+
+        Only the very first call waits on the upstream; afterwards the cached
+        snapshot is returned immediately and refreshed in the background once
+        it is older than the TTL.
+        """
+        if not self.api_key:
+            return {"airports": {}, "status": "unavailable"}
+
+        if self._fetched_at is None:
+            # shield: a client disconnect must not cancel the shared refresh
+            await asyncio.shield(self._start_refresh())
+        elif self.is_stale():
+            self._start_refresh()
+
+        stale = self.is_stale()
+        return {
+            "airports": {code: dict(entry) for code, entry in self._entries.items()},
+            "timestamp": int(time.time()),
+            "fetched_at": int(self._fetched_at) if self._fetched_at else None,
+            "stale": stale,
+            "status": "ok" if self._entries else "unavailable"
+        }
+
+    def prefetch(self) -> None:
+        """Start a background refresh (e.g. at startup) so the first poll is warm."""
+        if self.api_key:
+            self._start_refresh()
+
+    async def aclose(self) -> None:
+        if self._refresh_task is not None and not self._refresh_task.done():
+            self._refresh_task.cancel()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+# Singleton instance
+_weather_service_instance: Optional[WeatherService] = None
+
+
+def get_weather_service() -> WeatherService:
+    """Get or create weather service singleton instance"""
+    global _weather_service_instance
+
+    if _weather_service_instance is None:
+        _weather_service_instance = WeatherService(
+            api_key=os.environ.get("WEATHERAPI_KEY"),
+            airports=parse_airports(os.environ.get("WEATHER_AIRPORTS", DEFAULT_AIRPORTS)),
+            ttl_seconds=float(os.environ.get("WEATHER_TTL_SECONDS", DEFAULT_TTL_SECONDS)),
+            concurrency=int(os.environ.get("WEATHER_CONCURRENCY", DEFAULT_CONCURRENCY))
+        )
+
+    return _weather_service_instance
@@ -1,53 +1,71 @@
-"""Simple chat with OpenRouter - no sessions, no complexity"""
-import os
-import httpx
-from typing import List, Dict
+"""Simple chat with OpenRouter over server-side sessions"""
+import json
+from typing import List, Dict, Optional
 
-OPENROUTER_API_KEY = os.environ.get('OPENROUTER_API_KEY', '')
-OPENROUTER_MODEL = 'anthropic/claude-3.5-sonnet'
+from chat_sessions import ChatSession, get_session_store, user_text
+from copilot_context import get_context_builder
+from intent_router import get_intent_router
+from services.openrouter_client import OpenRouterAPIError, OpenRouterOverloadedError, get_openrouter_client
 
 SYSTEM_PROMPT = """You are ODIN Copilot, an ATC assistant for Bay Area air traffic. 
 Provide concise, helpful responses about aircraft, airspace, and ATC procedures. 
 Keep responses brief (2-3 sentences max)."""
 
 
-async def chat_with_openrouter(user_message: str, conversation_history: List[Dict] = None) -> str:
-    """Send message to OpenRouter and get response."""
+def build_messages(
+    user_message: str,
+    conversation_history: List[Dict] = None,
+    summary: Optional[str] = None
+) -> List[Dict]:
+    """
+    System prompt (with the session summary, and live context for live
+    questions), recent history and the new user message.
+    """
+    system_prompt = SYSTEM_PROMPT
+    if summary:
+        system_prompt = f"{system_prompt}\n\nEarlier in this conversation: {summary}"
+    # Decided on the operator's words: the console preface names the active panel on every turn
+    live_context = get_context_builder().context_for(user_text(user_message))
+    if live_context:
+        system_prompt = f"{system_prompt}\n\n{live_context}"
+    messages = [{"role": "system", "content": system_prompt}]
     
-    if not OPENROUTER_API_KEY:
-        return "Chat unavailable: OpenRouter API key not configured."
-    
-    # Build messages
-    messages = [{"role": "system", "content": SYSTEM_PROMPT}]
-    
-    # Add conversation history (last 5 messages only)
+    # Add conversation history (already bounded by session compaction)
     if conversation_history:
-        messages.extend(conversation_history[-5:])
+        messages.extend(conversation_history)
     
     # Add current message
     messages.append({"role": "user", "content": user_message})
+    return messages
+
+
+async def chat_with_openrouter(user_message: str, session: ChatSession) -> str:
+    """Send message to OpenRouter and get response, recording the exchange in the session."""
+    store = get_session_store()
+    
+    # Structured questions (inbound counts, aircraft positions, NOTAMs, weather) are answered locally
+    routed = get_intent_router().route(user_message)
+    if routed is not None:
+        await store.record(session, user_message, routed)
+        return routed
+    
+    client = get_openrouter_client()
+    if client is None:
+        return "Chat unavailable: OpenRouter API key not configured."
+    
+    summary, history = store.prompt(session)
+    messages = build_messages(user_message, history, summary)
     
-    # Call OpenRouter
+    # Call OpenRouter over the client's shared connection pool
     try:
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            response = await client.post(
-                'https://openrouter.ai/api/v1/chat/completions',
-                headers={
-                    'Authorization': f'Bearer {OPENROUTER_API_KEY}',
-                    'Content-Type': 'application/json'
-                },
-                json={
-                    'model': OPENROUTER_MODEL,
-                    'messages': messages,
-                    'max_tokens': 300
-                }
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                return data['choices'][0]['message']['content']
-            else:
-                return f"Error: OpenRouter returned status {response.status_code}"
-                
+        result = await client.chat_completion(messages, max_tokens=300)
+        content = result["content"]
+        reply = content if isinstance(content, str) else json.dumps(content)
+        await store.record(session, user_message, reply)
+        return reply
+    except OpenRouterAPIError as e:
+        return f"Error: OpenRouter returned status {e.status_code}"
+    except OpenRouterOverloadedError:
+        return "Copilot is busy right now. Please try again in a moment."
     except Exception as e:
         return f"Chat error: {str(e)}"
@@ -0,0 +1,37 @@
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from metar_parser import split_reports  # noqa: E402
+from metar_store import SAMPLE_BULLETIN, MetarStore  # noqa: E402
+
+
+def main(copies: int = 500):
+    bulletin = SAMPLE_BULLETIN.read_text(encoding="utf-8")
+    text = "\n".join([bulletin] * copies)
+    reports = split_reports(text)
+
+    started = time.perf_counter()
+    decoded = MetarStore.decode(text)
+    decode_seconds = time.perf_counter() - started
+
+    store = MetarStore()
+    started = time.perf_counter()
+    store.apply(decoded)
+    apply_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for station in store.stations():
+        store.trend(station)
+    trend_seconds = time.perf_counter() - started
+
+    print(f"reports={len(reports)} decoded={len(decoded)} stations={len(store.stations())}")
+    print(f"decode: {decode_seconds * 1000:.1f} ms ({len(decoded) / decode_seconds:,.0f} reports/s)")
+    print(f"apply: {apply_seconds * 1000:.1f} ms ({len(decoded) / apply_seconds:,.0f} reports/s)")
+    print(f"trend: {trend_seconds * 1000:.2f} ms for {len(store.stations())} stations")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
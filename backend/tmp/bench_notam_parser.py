@@ -0,0 +1,33 @@
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from notam_parser import iter_raw_records, parse_condition  # noqa: E402
+
+RAW_PATH = Path(__file__).parent / "notams_raw.txt"
+
+
+def main(copies: int = 200):
+    raw_lines = RAW_PATH.read_text(encoding="utf-8").splitlines()
+    lines = raw_lines * copies
+
+    started = time.perf_counter()
+    records = list(iter_raw_records(lines))
+    split_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    located = 0
+    for record in records:
+        if parse_condition(record["condition"]).latitude is not None:
+            located += 1
+    parse_seconds = time.perf_counter() - started
+
+    print(f"lines={len(lines)} records={len(records)} with_coordinates={located}")
+    print(f"split: {split_seconds * 1000:.1f} ms ({len(records) / split_seconds:,.0f} records/s)")
+    print(f"parse: {parse_seconds * 1000:.1f} ms ({len(records) / parse_seconds:,.0f} records/s)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,49 @@
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from notam_catalog import load_catalog  # noqa: E402
+from notam_engine import DATA_PATH  # noqa: E402
+from notam_index import NotamSearchIndex  # noqa: E402
+
+QUERIES = [
+    {"query": "crane near SFO"},
+    {"query": "obstacle lights unlit"},
+    {"query": "RWY 28L closures"},
+    {"query": "taxiway closed", "location": "OAK"},
+    {"query": ""},
+    {"query": "", "classification": "Aerodrome"},
+]
+
+
+def main(copies: int = 500, repeats: int = 20):
+    seed = list(load_catalog(DATA_PATH))
+    notams = [
+        {**notam, "id": f"{notam['id']}-{copy}"}
+        for copy in range(copies)
+        for notam in seed
+    ]
+
+    started = time.perf_counter()
+    index = NotamSearchIndex()
+    index.add_many(notams)
+    build_seconds = time.perf_counter() - started
+    print(f"docs={len(index)} build: {build_seconds * 1000:.0f} ms")
+
+    for params in QUERIES:
+        # The first query after a change also packs the term postings
+        started = time.perf_counter()
+        result = index.search(**params)
+        first_ms = (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        for _ in range(repeats):
+            index.search(**params)
+        warm_ms = (time.perf_counter() - started) * 1000 / repeats
+        print(f"{str(params):<55} total={result['total']:>6} first {first_ms:6.1f} ms, warm {warm_ms:6.2f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
@@ -0,0 +1,100 @@
+import asyncio
+import json
+import logging
+import random
+import sys
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from services.admission import AdmissionController  # noqa: E402
+from services.openrouter_client import HEDGE_MIN_SAMPLES, OpenRouterClient  # noqa: E402
+
+PRIMARY_MODEL = "primary/model"
+FALLBACK_MODEL = "fallback/model"
+
+
+def fake_openrouter(seed: int, slow_fraction: float, failure_fraction: float) -> httpx.MockTransport:
+    """
+    In-process OpenRouter stand-in: most replies take 80-150 ms, `slow_fraction`
+    stall for 1.5-3 s (the tail hedging targets), `failure_fraction` return 503.
+    The fallback model is a little slower but never stalls.
+    """
+    rng = random.Random(seed)
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content)
+        roll = rng.random()
+        if payload["model"] == FALLBACK_MODEL:
+            await asyncio.sleep(rng.uniform(0.12, 0.2))
+        elif roll < failure_fraction:
+            await asyncio.sleep(0.05)
+            return httpx.Response(503, text="upstream overloaded")
+        elif roll < failure_fraction + slow_fraction:
+            await asyncio.sleep(rng.uniform(1.5, 3.0))
+        else:
+            await asyncio.sleep(rng.uniform(0.08, 0.15))
+        return httpx.Response(200, json={
+            "choices": [{"message": {"role": "assistant", "content": payload["model"]}, "finish_reason": "stop"}]
+        })
+
+    return httpx.MockTransport(handler)
+
+
+async def run(label: str, requests: int, concurrency: int, **client_options) -> None:
+    client = OpenRouterClient(
+        api_key="bench",
+        base_url="http://openrouter.invalid/api/v1",
+        model=PRIMARY_MODEL,
+        timeout_seconds=5.0,
+        retry_base_seconds=0.05,
+        retry_cap_seconds=0.5,
+        admission=AdmissionController(max_concurrent=concurrency * 2, max_queue=requests),
+        transport=fake_openrouter(seed=7, slow_fraction=0.05, failure_fraction=0.02),
+        **client_options
+    )
+    loop = asyncio.get_running_loop()
+    latencies = []
+    winners = {}
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            started = loop.time()
+            result = await client.chat_completion([{"role": "user", "content": f"q{i}"}], use_cache=False)
+            latencies.append((loop.time() - started) * 1000)
+            winners[result["content"]] = winners.get(result["content"], 0) + 1
+
+    # Warm up the latency window that the hedge percentile is taken from
+    await asyncio.gather(*(one(i) for i in range(HEDGE_MIN_SAMPLES * 2)))
+    latencies.clear()
+    winners.clear()
+
+    started = loop.time()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    elapsed = loop.time() - started
+    await client.aclose()
+
+    latencies.sort()
+
+    def percentile(fraction: float) -> float:
+        return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))]
+
+    print(
+        f"{label:<28} p50={percentile(0.5):7.1f}ms p95={percentile(0.95):7.1f}ms "
+        f"p99={percentile(0.99):7.1f}ms max={latencies[-1]:7.1f}ms wall={elapsed:5.1f}s "
+        f"hedges={client.hedge_stats['fired']}/{client.hedge_stats['won']} winners={winners}"
+    )
+
+
+async def main(requests: int = 400, concurrency: int = 8) -> None:
+    logging.disable(logging.ERROR)
+    await run("no hedging", requests, concurrency)
+    await run("hedge at p90", requests, concurrency, hedge_percentile=0.9)
+    await run("hedge at p90 -> fallback", requests, concurrency, hedge_percentile=0.9, fallback_model=FALLBACK_MODEL)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,91 @@
+import asyncio
+import io
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from services.tts_service import TTSService  # noqa: E402
+
+CHUNK_BYTES = 4096
+CHUNKS = 60
+CHUNK_DELAY_SECONDS = 0.02
+TICK_SECONDS = 0.005
+
+
+class FakeTextToSpeech:
+    """Blocking stand-in for the ElevenLabs SDK: yields chunks as a slow HTTP stream would."""
+
+    def convert(self, text, voice_id, model_id, output_format):
+        for _ in range(CHUNKS):
+            time.sleep(CHUNK_DELAY_SECONDS)
+            yield b"\x00" * CHUNK_BYTES
+
+
+class FakeElevenLabs:
+    text_to_speech = FakeTextToSpeech()
+
+
+async def watch_loop(stop: asyncio.Event, lags: list) -> None:
+    """Record how late each short sleep wakes up: the event loop stall."""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        started = loop.time()
+        await asyncio.sleep(TICK_SECONDS)
+        lags.append((loop.time() - started - TICK_SECONDS) * 1000)
+
+
+async def inline_synthesis(client, text: str) -> bytes:
+    """The previous handler code: the SDK iterator consumed directly in the coroutine."""
+    audio_data = b""
+    for chunk in client.text_to_speech.convert(text=text, voice_id="", model_id="", output_format=""):
+        audio_data += chunk
+    return audio_data
+
+
+async def measure(label: str, synthesize, requests: int) -> None:
+    stop = asyncio.Event()
+    lags: list = []
+    watcher = asyncio.create_task(watch_loop(stop, lags))
+    await asyncio.sleep(0.05)
+    started = time.perf_counter()
+    audio = await asyncio.gather(*(synthesize(f"briefing {i}") for i in range(requests)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await watcher
+    lags.sort()
+    print(
+        f"{label:<22} requests={requests} wall={elapsed:5.2f}s bytes={sum(map(len, audio))} "
+        f"loop_lag_p50={lags[len(lags) // 2]:7.1f}ms loop_lag_max={lags[-1]:7.1f}ms"
+    )
+
+
+def measure_accumulation(chunks: int = 2000, chunk_bytes: int = 1024) -> None:
+    chunk = b"\x00" * chunk_bytes
+    started = time.perf_counter()
+    audio = b""
+    for _ in range(chunks):
+        audio += chunk
+    concat_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    buffer = io.BytesIO()
+    for _ in range(chunks):
+        buffer.write(chunk)
+    buffer.getvalue()
+    bytesio_ms = (time.perf_counter() - started) * 1000
+    print(f"accumulate {chunks * chunk_bytes // 1024} KB: bytes += {concat_ms:.1f}ms, BytesIO {bytesio_ms:.1f}ms")
+
+
+async def main(requests: int = 4) -> None:
+    client = FakeElevenLabs()
+    await measure("inline (before)", lambda text: inline_synthesis(client, text), requests)
+    service = TTSService(client=client, max_workers=2)
+    await measure("thread pool (after)", service.synthesize, requests)
+    service.shutdown()
+    measure_accumulation()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
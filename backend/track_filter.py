@@ -0,0 +1,229 @@
+"""
+Constant-velocity Kalman track filter for ODIN ATC Console.
+Smooths noisy surveillance positions (live OpenSky or simulated) and estimates
+per-aircraft velocity. State for every track lives in preallocated numpy
+arrays, so each snapshot is filtered in a handful of vectorized operations and
+memory per aircraft is fixed.
+"""
+
+from dataclasses import replace
+from typing import Dict, Optional
+
+import numpy as np
+
+from air_snapshot import AirSnapshot, METERS_PER_DEG_LAT, TrackSlots, grow_rows
+
+
+# Local tangent plane origin (Bay Area center)
+ORIGIN_LAT = 37.65
+ORIGIN_LON = -122.1
+
+# Process noise: white acceleration spectral density per axis (m^2/s^3)
+HORIZONTAL_ACCEL_NOISE = 1.0
+VERTICAL_ACCEL_NOISE = 0.5
+
+# Measurement noise standard deviations
+POSITION_NOISE_M = 30.0
+ALTITUDE_NOISE_M = 30.0
+VELOCITY_NOISE_MPS = 3.0
+VERTICAL_RATE_NOISE_MPS = 1.5
+
+# Variance used to neutralize a missing measurement component
+UNOBSERVED_VARIANCE = 1e12
+
+# Tracks silent longer than this are re-initialized on their next report
+MAX_COAST_SECONDS = 120.0
+# Tracks silent longer than this release their slot
+TRACK_EXPIRY_SECONDS = 1800.0
+
+INITIAL_CAPACITY = 64
+
+
+class TrackFilter:
+    """Vectorized constant-velocity Kalman filter over all tracked aircraft."""
+
+    def __init__(self, origin_lat: float = ORIGIN_LAT, origin_lon: float = ORIGIN_LON):
+        self.origin_lat = origin_lat
+        self.origin_lon = origin_lon
+        self._meters_per_deg_lon = METERS_PER_DEG_LAT * np.cos(np.radians(origin_lat))
+
+        self._slots = TrackSlots(INITIAL_CAPACITY)
+        self._allocate(INITIAL_CAPACITY)
+
+        axis_noise = np.array([HORIZONTAL_ACCEL_NOISE, HORIZONTAL_ACCEL_NOISE, VERTICAL_ACCEL_NOISE])
+        self._accel_noise = axis_noise[np.newaxis, :]
+
+    def _allocate(self, capacity: int) -> None:
+        """Create empty state arrays for `capacity` tracks."""
+        # Per-axis (east, north, up) state and 2x2 position/velocity covariance
+        self._pos = np.zeros((capacity, 3))
+        self._vel = np.zeros((capacity, 3))
+        self._p_pp = np.zeros((capacity, 3))
+        self._p_pv = np.zeros((capacity, 3))
+        self._p_vv = np.zeros((capacity, 3))
+        self._last_t = np.zeros(capacity)
+
+    def _ensure_capacity(self) -> None:
+        """Grow state arrays after the slot registry has grown."""
+        capacity = self._slots.capacity
+        for name in ("_pos", "_vel", "_p_pp", "_p_pv", "_p_vv", "_last_t"):
+            setattr(self, name, grow_rows(getattr(self, name), capacity))
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def _expire(self, now: float) -> None:
+        """Release slots of tracks that have not reported recently."""
+        self._slots.release([
+            icao for icao, slot in self._slots.items()
+            if now - self._last_t[slot] > TRACK_EXPIRY_SECONDS
+        ])
+
+    def update(self, snapshot: AirSnapshot) -> AirSnapshot:
+        """
+        Run one predict/update cycle for every aircraft in the snapshot.
+
+        Args:
+            snapshot: Raw air picture
+
+        Returns:
+            Copy of the snapshot with smoothed position, altitude, velocity,
+            true track and vertical rate
+        """
+        if len(snapshot) == 0:
+            self._expire(snapshot.timestamp)
+            return snapshot
+
+        slots, fresh = self._slots.assign(snapshot.icao24)
+        self._ensure_capacity()
+        t = snapshot.time_position
+
+        # Measurements in local east/north/up meters
+        z_pos = np.column_stack((
+            (snapshot.longitude - self.origin_lon) * self._meters_per_deg_lon,
+            (snapshot.latitude - self.origin_lat) * METERS_PER_DEG_LAT,
+            snapshot.altitude,
+        ))
+        track_rad = np.radians(snapshot.true_track)
+        z_vel = np.column_stack((
+            snapshot.velocity * np.sin(track_rad),
+            snapshot.velocity * np.cos(track_rad),
+            snapshot.vertical_rate,
+        ))
+
+        r_pos = np.broadcast_to(
+            np.array([POSITION_NOISE_M, POSITION_NOISE_M, ALTITUDE_NOISE_M]) ** 2, z_pos.shape
+        ).copy()
+        r_vel = np.broadcast_to(
+            np.array([VELOCITY_NOISE_MPS, VELOCITY_NOISE_MPS, VERTICAL_RATE_NOISE_MPS]) ** 2, z_vel.shape
+        ).copy()
+        missing_pos = np.isnan(z_pos)
+        missing_vel = np.isnan(z_vel)
+        r_pos[missing_pos] = UNOBSERVED_VARIANCE
+        r_vel[missing_vel] = UNOBSERVED_VARIANCE
+
+        dt = t - self._last_t[slots]
+        restart = fresh | (dt > MAX_COAST_SECONDS)
+        # Only rows carrying a newer report than the filter has seen are updated
+        active = ~restart & (dt > 0)
+
+        if restart.any():
+            rows = np.flatnonzero(restart)
+            s = slots[rows]
+            self._pos[s] = np.where(missing_pos[rows], 0.0, z_pos[rows])
+            self._vel[s] = np.where(missing_vel[rows], 0.0, z_vel[rows])
+            self._p_pp[s] = r_pos[rows]
+            self._p_pv[s] = 0.0
+            self._p_vv[s] = r_vel[rows]
+            self._last_t[s] = t[rows]
+
+        if active.any():
+            rows = np.flatnonzero(active)
+            s = slots[rows]
+            step = dt[rows][:, np.newaxis]
+            q = self._accel_noise
+
+            # Predict
+            pos = self._pos[s] + self._vel[s] * step
+            vel = self._vel[s]
+            p_pp = self._p_pp[s] + 2 * step * self._p_pv[s] + step ** 2 * self._p_vv[s] + q * step ** 3 / 3
+            p_pv = self._p_pv[s] + step * self._p_vv[s] + q * step ** 2 / 2
+            p_vv = self._p_vv[s] + q * step
+
+            # Update with the [position, velocity] measurement per axis
+            s00 = p_pp + r_pos[rows]
+            s01 = p_pv
+            s11 = p_vv + r_vel[rows]
+            det = s00 * s11 - s01 * s01
+            k00 = (p_pp * s11 - p_pv * s01) / det
+            k01 = (p_pv * s00 - p_pp * s01) / det
+            k10 = (p_pv * s11 - p_vv * s01) / det
+            k11 = (p_vv * s00 - p_pv * s01) / det
+
+            y_pos = np.where(missing_pos[rows], 0.0, z_pos[rows] - pos)
+            y_vel = np.where(missing_vel[rows], 0.0, z_vel[rows] - vel)
+
+            self._pos[s] = pos + k00 * y_pos + k01 * y_vel
+            self._vel[s] = vel + k10 * y_pos + k11 * y_vel
+            self._p_pp[s] = (1 - k00) * p_pp - k01 * p_pv
+            self._p_pv[s] = (1 - k00) * p_pv - k01 * p_vv
+            self._p_vv[s] = (1 - k11) * p_vv - k10 * p_pv
+            self._last_t[s] = t[rows]
+
+        self._expire(snapshot.timestamp)
+        return self._smoothed(snapshot, slots, missing_pos[:, 2])
+
+    def _smoothed(self, snapshot: AirSnapshot, slots: np.ndarray, missing_alt: np.ndarray) -> AirSnapshot:
+        """Build a snapshot from the filtered state of the given slots."""
+        pos = self._pos[slots]
+        vel = self._vel[slots]
+        ground_speed = np.hypot(vel[:, 0], vel[:, 1])
+        track = np.degrees(np.arctan2(vel[:, 0], vel[:, 1])) % 360
+
+        return replace(
+            snapshot,
+            longitude=self.origin_lon + pos[:, 0] / self._meters_per_deg_lon,
+            latitude=self.origin_lat + pos[:, 1] / METERS_PER_DEG_LAT,
+            altitude=np.where(missing_alt, np.nan, pos[:, 2]),
+            velocity=np.where(np.isnan(snapshot.velocity), np.nan, ground_speed),
+            true_track=np.where(np.isnan(snapshot.true_track), np.nan, track),
+            vertical_rate=np.where(np.isnan(snapshot.vertical_rate), np.nan, vel[:, 2]),
+        )
+
+    def get_state(self, icao24: str) -> Optional[Dict[str, float]]:
+        """Return the filtered state of one aircraft, if tracked."""
+        slot = self._slots.get(icao24.lower())
+        if slot is None:
+            return None
+
+        east, north, up = self._pos[slot]
+        v_east, v_north, v_up = self._vel[slot]
+        return {
+            "latitude": float(self.origin_lat + north / METERS_PER_DEG_LAT),
+            "longitude": float(self.origin_lon + east / self._meters_per_deg_lon),
+            "altitude": float(up),
+            "velocity": float(np.hypot(v_east, v_north)),
+            "true_track": float(np.degrees(np.arctan2(v_east, v_north)) % 360),
+            "vertical_rate": float(v_up),
+            "position_sigma_m": float(np.sqrt(self._p_pp[slot, :2].max())),
+            "updated_at": float(self._last_t[slot]),
+        }
+
+    def reset(self) -> None:
+        """Drop all tracks."""
+        self._slots = TrackSlots(INITIAL_CAPACITY)
+        self._allocate(INITIAL_CAPACITY)
+
+
+# Singleton instance
+_track_filter_instance: Optional[TrackFilter] = None
+
+
+def get_track_filter() -> TrackFilter:
+    """Get or create track filter singleton instance"""
+    global _track_filter_instance
+
+    if _track_filter_instance is None:
+        _track_filter_instance = TrackFilter()
+
+    return _track_filter_instance
@@ -0,0 +1,185 @@
+"""
+Traffic density aggregation for ODIN ATC Console.
+Bins every air-picture snapshot into web-mercator tiles at a fine zoom level and
+keeps sliding time windows as a ring buffer of per-bucket tile counts. Coarser
+zoom levels are derived on query by shifting tile coordinates, so one
+accumulator serves every map zoom.
+"""
+
+import math
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from air_snapshot import AirSnapshot
+
+
+MAX_ZOOM = 14
+MIN_ZOOM = 4
+BUCKET_SECONDS = 60
+NUM_BUCKETS = 60  # One hour of history
+DEFAULT_WINDOW_SECONDS = 900
+
+
+def _tile_keys(latitude: np.ndarray, longitude: np.ndarray, zoom: int) -> np.ndarray:
+    """Pack web-mercator tile x/y at `zoom` into a single int64 key per point."""
+    scale = 1 << zoom
+    lat_rad = np.radians(np.clip(latitude, -85.0511, 85.0511))
+    x = np.floor((longitude + 180.0) / 360.0 * scale).astype(np.int64)
+    y = np.floor((1.0 - np.arcsinh(np.tan(lat_rad)) / math.pi) / 2.0 * scale).astype(np.int64)
+    x = np.clip(x, 0, scale - 1)
+    y = np.clip(y, 0, scale - 1)
+    return (x << zoom) | y
+
+
+def _tile_bounds(x: int, y: int, zoom: int) -> Tuple[float, float, float, float]:
+    """Return (west, south, east, north) of a web-mercator tile."""
+    scale = 1 << zoom
+
+    def lat_at(tile_y: int) -> float:
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * tile_y / scale))))
+
+    west = x / scale * 360.0 - 180.0
+    east = (x + 1) / scale * 360.0 - 180.0
+    return west, lat_at(y + 1), east, lat_at(y)
+
+
+class DensityAccumulator:
+    """Ring-buffered, multi-resolution traffic density grid."""
+
+    def __init__(
+        self,
+        max_zoom: int = MAX_ZOOM,
+        bucket_seconds: int = BUCKET_SECONDS,
+        num_buckets: int = NUM_BUCKETS,
+    ):
+        self.max_zoom = max_zoom
+        self.bucket_seconds = bucket_seconds
+        self.num_buckets = num_buckets
+        self._bucket_epoch = np.full(num_buckets, -1, dtype=np.int64)
+        self._bucket_keys: List[np.ndarray] = [np.empty(0, dtype=np.int64) for _ in range(num_buckets)]
+        self._bucket_counts: List[np.ndarray] = [np.empty(0, dtype=np.int64) for _ in range(num_buckets)]
+        self._version = 0
+        # (zoom, window) -> (version, bucket epoch the window ended at, result)
+        self._query_cache: Dict[Tuple[int, int], Tuple[int, int, Dict[str, Any]]] = {}
+
+    @property
+    def max_window_seconds(self) -> int:
+        return self.bucket_seconds * self.num_buckets
+
+    def add(self, snapshot: AirSnapshot) -> None:
+        """Merge one snapshot's positions into the current time bucket."""
+        epoch = snapshot.timestamp // self.bucket_seconds
+        slot = epoch % self.num_buckets
+
+        if epoch < self._bucket_epoch[slot]:
+            # Late snapshot from a cycle this slot has already moved past
+            return
+        if self._bucket_epoch[slot] != epoch:
+            # Bucket rolled over: drop whatever it held from a previous cycle
+            self._bucket_epoch[slot] = epoch
+            self._bucket_keys[slot] = np.empty(0, dtype=np.int64)
+            self._bucket_counts[slot] = np.empty(0, dtype=np.int64)
+
+        if len(snapshot) == 0:
+            return
+
+        keys = _tile_keys(snapshot.latitude, snapshot.longitude, self.max_zoom)
+        merged_keys, inverse = np.unique(
+            np.concatenate((self._bucket_keys[slot], keys)), return_inverse=True
+        )
+        weights = np.concatenate((self._bucket_counts[slot], np.ones(len(keys), dtype=np.int64)))
+        self._bucket_keys[slot] = merged_keys
+        self._bucket_counts[slot] = np.bincount(inverse, weights=weights).astype(np.int64)
+
+        self._version += 1
+        self._query_cache.clear()
+
+    def query(
+        self,
+        zoom: int,
+        window_seconds: int = DEFAULT_WINDOW_SECONDS,
+        now: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Aggregate density for the `window_seconds` before now at `zoom`.
+
+        Args:
+            zoom: Map zoom level (clamped to MIN_ZOOM..max_zoom)
+            window_seconds: Sliding window length (clamped to the ring buffer span)
+            now: End of the window in epoch seconds (defaults to the current time,
+                so a stalled ingest ages out instead of being served as current)
+
+        Returns:
+            GeoJSON FeatureCollection with one polygon per non-empty cell
+        """
+        zoom = max(MIN_ZOOM, min(int(zoom), self.max_zoom))
+        window_seconds = max(self.bucket_seconds, min(int(window_seconds), self.max_window_seconds))
+
+        current_epoch = int(time.time() if now is None else now) // self.bucket_seconds
+        cache_key = (zoom, window_seconds)
+        cached = self._query_cache.get(cache_key)
+        if cached is not None and cached[0] == self._version and cached[1] == current_epoch:
+            return cached[2]
+
+        num_windows = math.ceil(window_seconds / self.bucket_seconds)
+        oldest_epoch = current_epoch - num_windows + 1
+        in_window = (self._bucket_epoch >= oldest_epoch) & (self._bucket_epoch <= current_epoch)
+        slots = np.flatnonzero(in_window)
+
+        features: List[Dict[str, Any]] = []
+        if len(slots):
+            keys = np.concatenate([self._bucket_keys[s] for s in slots])
+            counts = np.concatenate([self._bucket_counts[s] for s in slots])
+
+            shift = self.max_zoom - zoom
+            mask = (1 << self.max_zoom) - 1
+            x = (keys >> self.max_zoom) >> shift
+            y = (keys & mask) >> shift
+            cells, inverse = np.unique((x << zoom) | y, return_inverse=True)
+            cell_counts = np.bincount(inverse, weights=counts).astype(np.int64)
+            peak = int(cell_counts.max()) if len(cell_counts) else 0
+
+            zoom_mask = (1 << zoom) - 1
+            for cell, count in zip(cells.tolist(), cell_counts.tolist()):
+                cell_x, cell_y = cell >> zoom, cell & zoom_mask
+                west, south, east, north = _tile_bounds(cell_x, cell_y, zoom)
+                features.append({
+                    "type": "Feature",
+                    "geometry": {
+                        "type": "Polygon",
+                        "coordinates": [[
+                            [west, south], [east, south], [east, north], [west, north], [west, south]
+                        ]]
+                    },
+                    "properties": {
+                        "cell": f"{zoom}/{cell_x}/{cell_y}",
+                        "count": count,
+                        "intensity": count / peak if peak else 0.0
+                    }
+                })
+
+        result = {
+            "type": "FeatureCollection",
+            "features": features,
+            "zoom": zoom,
+            "window_seconds": window_seconds,
+            "cell_count": len(features)
+        }
+        self._query_cache[cache_key] = (self._version, current_epoch, result)
+        return result
+
+
+# Singleton instance
+_density_instance: Optional[DensityAccumulator] = None
+
+
+def get_density_accumulator() -> DensityAccumulator:
+    """Get or create density accumulator singleton instance"""
+    global _density_instance
+
+    if _density_instance is None:
+        _density_instance = DensityAccumulator()
+
+    return _density_instance
@@ -758,7 +758,8 @@ export default function Console() {
         sources: {
           'raster-tiles': {
             type: 'raster',
-            tiles: [`https://api.maptiler.com/maps/darkmatter/{z}/{x}/{y}.png?key=${MAPTILER_KEY}`],
+            // Served through the backend tile cache so consoles share one upstream fetch per tile
+            tiles: [`${API}/tiles/maptiler-dark/{z}/{x}/{y}.png?key=${MAPTILER_KEY}`],
             tileSize: 256,
             attribution: '&copy; <a href="https://www.maptiler.com/">MapTiler</a>'
           }
@@ -888,9 +889,8 @@ export default function Console() {
     if (!map.current) return;
 
     try {
-      const response = await fetch('https://api.rainviewer.com/public/weather-maps.json');
+      const response = await fetch(`${API}/tiles/rainviewer-api/weather-maps.json`);
       const data = await response.json();
-      const host = data.host || 'https://tilecache.rainviewer.com';
       const frames = data?.radar?.past || [];
       const latestFrame = frames[frames.length - 1];
 
@@ -899,7 +899,7 @@ export default function Console() {
         return;
       }
 
-      const tileUrl = `${host}${latestFrame.path}/256/{z}/{x}/{y}/2/1_1.png`;
+      const tileUrl = `${API}/tiles/rainviewer${latestFrame.path}/256/{z}/{x}/{y}/2/1_1.png`;
       applyRainViewerTiles(tileUrl);
     } catch (error) {
       console.error('Failed to fetch RainViewer metadata:', error);
@@ -21,6 +21,9 @@ const SimpleChatView = ({
   const [handoffLoading, setHandoffLoading] = useState(false);
   const scrollRef = useRef(null);
   const audioRef = useRef(null);
+  const streamRef = useRef(null);
+  // Server-side session; history and its summary live on the backend
+  const sessionIdRef = useRef(null);
 
   const consoleContext = useMemo(() => {
     const context = {
@@ -72,6 +75,9 @@ const SimpleChatView = ({
     return `[[Console Context]]\n${lines.join('\n')}`;
   }, [consoleContext]);
 
+  // Cancel an in-flight stream (and the upstream completion) on unmount
+  useEffect(() => () => streamRef.current?.abort(), []);
+
   // Auto-scroll to bottom
   useEffect(() => {
     if (scrollRef.current) {
@@ -90,24 +96,66 @@ const SimpleChatView = ({
     setMessages(newMessages);
     setLoading(true);
 
+    const controller = new AbortController();
+    streamRef.current = controller;
+
     try {
       // Send to backend
       const enrichedMessage = contextPreface
         ? `${contextPreface}\n\nUser: ${userMessage}`
         : userMessage;
 
-      const response = await axios.post(`${API}/api/chat`, {
-        message: enrichedMessage,
-        history: newMessages.slice(-10), // Send last 10 messages for context
-        console_context: consoleContext,
+      const response = await fetch(`${API}/api/chat/stream`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({
+          message: enrichedMessage,
+          session_id: sessionIdRef.current,
+          console_context: consoleContext,
+        }),
+        signal: controller.signal,
       });
 
-      // Add assistant response
-      setMessages([...newMessages, { role: 'assistant', content: response.data.response }]);
+      if (!response.ok || !response.body) {
+        const data = await response.json().catch(() => ({}));
+        throw new Error(data.detail || `Chat request failed (${response.status})`);
+      }
+
+      // Render tokens as they arrive from the SSE stream
+      let content = '';
+      let buffer = '';
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+
+      while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) >= 0) {
+          const block = buffer.slice(0, boundary);
+          buffer = buffer.slice(boundary + 2);
+          const eventLine = block.split('\n').find((line) => line.startsWith('event: '));
+          const dataLine = block.split('\n').find((line) => line.startsWith('data: '));
+          if (!eventLine || !dataLine) continue;
+
+          const event = eventLine.slice(7);
+          const data = JSON.parse(dataLine.slice(6));
+          if (event === 'session') {
+            sessionIdRef.current = data.session_id;
+          } else if (event === 'token') {
+            content += data.text;
+            setMessages([...newMessages, { role: 'assistant', content }]);
+          } else if (event === 'error') {
+            throw new Error(data.detail);
+          }
+        }
+      }
     } catch (error) {
+      if (error.name === 'AbortError') return;
       console.error('Chat error:', error);
-      console.error('Error details:', error.response?.data || error.message);
-      const errorMsg = error.response?.data?.detail || error.message || 'Sorry, I encountered an error. Please try again.';
+      const errorMsg = error.message || 'Sorry, I encountered an error. Please try again.';
       setMessages([...newMessages, { role: 'assistant', content: errorMsg }]);
     } finally {
       setLoading(false);
@@ -186,7 +234,7 @@ const SimpleChatView = ({
               </div>
             </div>
           ))}
-          {loading && (
+          {loading && messages[messages.length - 1]?.role === 'user' && (
             <div className="flex justify-start">
               <div className="bg-[#3A3E43] p-3 rounded flex items-center gap-2">
                 <Loader2 className="h-4 w-4 animate-spin" />